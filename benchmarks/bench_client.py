@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/benchmarks/bench_client.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 19:04:40
+#
+# @DESCRIPTION: 用回放数据测试登录、库存合并、市场挂单解析、交易报价合并和交易确认选择的耗时，不访问网络
+#               用法：python bench_client.py [--latency 秒] [--number 次数]
+#                     python bench_client.py --cassette 录制文件 --username 账号 --steam-guard 令牌文件
+#                     python bench_client.py --record 录制文件 --api-key KEY --username 账号
+#                                            --password 密码 --steam-guard 令牌文件
+
+
+import argparse
+import json
+import sys
+import time
+sys.path.append("..")
+from steampy.client import SteamClient
+from steampy.confirmation import ConfirmationExecutor
+from steampy.exceptions import FixtureNotFound
+from steampy.models import GameOptions
+from steampy.transport import Cassette, RecordingAdapter, ReplayAdapter
+from benchmarks import fixtures
+
+
+def login(client: SteamClient, username: str, steam_guard: str) -> None:
+    client.login(username, 'password', steam_guard)
+
+
+def inventory_merge(client: SteamClient) -> None:
+    client.get_my_inventory(GameOptions.CS)
+
+
+def listings_parsing(client: SteamClient) -> None:
+    client.market.get_my_market_listings()
+
+
+def offer_merge(client: SteamClient) -> None:
+    client.get_trade_offers()
+
+
+"""
+@description: 确认所有收到的交易报价，每次使用新的确认索引，详细页面都需要重新请求和解析
+-------
+@param:
+-------
+@return:
+"""
+def confirmation_selection(client: SteamClient) -> None:
+    offers = client.get_trade_offers(merge=False)['response']['trade_offers_received']
+    executor = ConfirmationExecutor(client.steam_guard['identity_secret'], client.steam_guard['steamid'],
+                                    client._session, signer=client._guard_signer)
+    executor.confirm_trade_offers([offer['tradeofferid'] for offer in offers])
+
+
+SCENARIOS = (inventory_merge, listings_parsing, offer_merge, confirmation_selection)
+# 录制时不执行 confirmation_selection，避免确认真实的交易
+READ_ONLY_SCENARIOS = (inventory_merge, listings_parsing, offer_merge)
+
+
+"""
+@description: 执行 number 次，返回每次的平均毫秒数
+-------
+@param:
+-------
+@return:
+"""
+def bench(func, number: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - started_at) / number * 1000
+
+
+def run(cassette: Cassette, username: str, steam_guard: str, latency: float, number: int) -> dict:
+    adapter = ReplayAdapter(cassette, latency=latency)
+    results = {'login': bench(lambda: login(SteamClient('key', http_adapter=adapter), username, steam_guard),
+                              number)}
+    client = SteamClient('key', http_adapter=adapter)
+    login(client, username, steam_guard)
+    for scenario in SCENARIOS:
+        try:
+            results[scenario.__name__] = bench(lambda: scenario(client), number)
+        except FixtureNotFound:
+            # 真实的录制文件中没有交易确认的响应
+            results[scenario.__name__] = None
+    return results
+
+
+def record(path: str, api_key: str, username: str, password: str, steam_guard: str) -> None:
+    client = SteamClient(api_key, http_adapter=RecordingAdapter(path))
+    client.login(username, password, steam_guard)
+    for scenario in READ_ONLY_SCENARIOS:
+        scenario(client)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cassette', help='回放这个录制文件，不指定时使用生成的数据')
+    parser.add_argument('--record', help='登录真实账号并把响应录制到这个文件')
+    parser.add_argument('--api-key')
+    parser.add_argument('--username', default=fixtures.USERNAME)
+    parser.add_argument('--password')
+    parser.add_argument('--steam-guard', default=json.dumps(fixtures.STEAM_GUARD))
+    parser.add_argument('--latency', type=float, default=0.0, help='每次响应模拟的网络延迟秒数')
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+    if args.record:
+        record(args.record, args.api_key, args.username, args.password, args.steam_guard)
+        sys.exit(0)
+    cassette = Cassette(args.cassette) if args.cassette else fixtures.steam_cassette()
+    for name, milliseconds in run(cassette, args.username, args.steam_guard, args.latency, args.number).items():
+        if milliseconds is None:
+            print('%-24s %11s' % (name, 'not recorded'))
+        else:
+            print('%-24s %8.2f ms' % (name, milliseconds))
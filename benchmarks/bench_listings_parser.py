@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/benchmarks/bench_listings_parser.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 14:10:05
+#
+# @DESCRIPTION: 比较各个市场挂单解析器的速度，并检查它们的解析结果是否相同
+#               用法：python bench_listings_parser.py [保存下来的 /market 页面 ...]
+
+
+import sys
+import timeit
+sys.path.append("..")
+from steampy import utils
+from benchmarks.pages import market_page
+
+
+"""
+@description: 测试一个页面，返回各解析器每次解析的平均毫秒数
+-------
+@param:
+-------
+@return:
+"""
+def bench_page(html: str, number: int = 20) -> dict:
+    parsers = [parser for parser in utils.LISTINGS_PARSERS
+               if parser != 'lxml' or utils.lxml_html is not None]
+    results = {}
+    expected = None
+    try:
+        for parser in parsers:
+            utils.set_listings_parser(parser)
+            listings = utils.get_market_listings_from_html(html)
+            if expected is None:
+                expected = listings
+            elif listings != expected:
+                raise AssertionError('%s parser returned different listings' % parser)
+            seconds = timeit.timeit(lambda: utils.get_market_listings_from_html(html), number=number)
+            results[parser] = seconds / number * 1000
+    finally:
+        utils.set_listings_parser('bs4')
+    return results
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        pages = {}
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages[path] = f.read()
+    else:
+        pages = {'%s sell listings' % count: market_page(count, count // 10, count // 5)
+                 for count in (10, 100, 1000)}
+    for name, html in pages.items():
+        print(name)
+        for parser, milliseconds in bench_page(html).items():
+            print('    %-6s %8.2f ms' % (parser, milliseconds))
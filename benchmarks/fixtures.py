@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/benchmarks/fixtures.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 18:51:27
+#
+# @DESCRIPTION: 生成与 Steam 响应结构相同的回放数据（登录、库存、市场挂单、交易报价和交易确认），
+#               没有真实录制文件时用于性能测试
+
+
+import base64
+import json
+import rsa
+from steampy import guard
+from steampy.models import SteamUrl
+from steampy.transport import Cassette
+from benchmarks.pages import market_page
+
+
+STEAM_ID = '76561198000000001'
+USERNAME = 'benchmark'
+STEAM_GUARD = {'steamid': STEAM_ID,
+               'shared_secret': base64.b64encode(b'1234567890abcdefghij').decode('ascii'),
+               'identity_secret': base64.b64encode(b'abcdefghijklmnoprstu').decode('ascii')}
+
+# 交易报价 ID 和交易确认 ID 的起始值
+FIRST_TRADE_OFFER_ID = 5000000000
+FIRST_CONFIRMATION_ID = 9000000000
+
+
+"""
+@description: 生成回放数据
+-------
+@param: path: 保存路径，为 None 时只保存在内存中
+        inventory_items: 库存物品数
+        sell_listings: 市场卖单数
+        trade_offers: 收到的交易报价数，每个报价都有一个待确认的交易确认
+        items_per_offer: 每个交易报价双方各自的物品数
+-------
+@return: <Cassette>
+"""
+def steam_cassette(path: str = None,
+                   inventory_items: int = 1000,
+                   sell_listings: int = 100,
+                   trade_offers: int = 50,
+                   items_per_offer: int = 5) -> Cassette:
+    cassette = Cassette(path)
+    _add_login(cassette)
+    _add_inventory(cassette, inventory_items)
+    cassette.add('GET', SteamUrl.COMMUNITY_URL + '/market',
+                 market_page(sell_listings, sell_listings // 10, sell_listings // 5, assets=True),
+                 headers=[('Content-Type', 'text/html; charset=UTF-8')])
+    _add_trade_offers(cassette, trade_offers, items_per_offer)
+    _add_confirmations(cassette, trade_offers)
+    return cassette
+
+
+def _json_headers() -> list:
+    return [('Content-Type', 'application/json; charset=utf-8')]
+
+
+def _add_login(cassette: Cassette) -> None:
+    public_key, _ = rsa.newkeys(1024)
+    cassette.add('POST', SteamUrl.STORE_URL + '/login/getrsakey/',
+                 json.dumps({'success': True,
+                             'publickey_mod': '%x' % public_key.n,
+                             'publickey_exp': '%x' % public_key.e,
+                             'timestamp': '1234500000',
+                             'token_gid': '1a2b3c'}),
+                 headers=_json_headers(),
+                 data={'username': USERNAME})
+    transfer_parameters = {'steamid': STEAM_ID,
+                           'token_secure': 'token',
+                           'auth': 'auth',
+                           'remember_login': True,
+                           'webcookie': 'webcookie'}
+    transfer_urls = [SteamUrl.COMMUNITY_URL + '/login/transfer', 'https://help.steampowered.com/login/transfer']
+    cassette.add('POST', SteamUrl.STORE_URL + '/login/dologin',
+                 json.dumps({'success': True,
+                             'requires_twofactor': False,
+                             'login_complete': True,
+                             'transfer_urls': transfer_urls,
+                             'transfer_parameters': transfer_parameters}),
+                 headers=_json_headers(),
+                 data={'username': USERNAME,
+                       'emailauth': '',
+                       'loginfriendlyname': '',
+                       'captchagid': '-1',
+                       'captcha_text': '',
+                       'emailsteamid': '',
+                       'remember_login': 'true'})
+    for url in transfer_urls:
+        cassette.add('POST', url, '',
+                     headers=[('Set-Cookie', 'sessionid=0123456789abcdef01234567; Path=/; Secure'),
+                              ('Set-Cookie', 'steamLoginSecure=%s%%7C%%7Ctoken; Path=/; Secure; HttpOnly' % STEAM_ID)],
+                     data={name: str(value) for name, value in transfer_parameters.items()})
+
+
+def _description(class_id: int, name: str) -> dict:
+    return {'appid': 730, 'classid': str(class_id), 'instanceid': '0', 'currency': 0,
+            'icon_url': 'icon%d' % class_id, 'tradable': 1, 'marketable': 1,
+            'name': name, 'market_hash_name': name, 'market_name': name,
+            'type': 'Base Grade Container',
+            'tags': [{'category': 'Type', 'internal_name': 'CSGO_Type_WeaponCase',
+                      'localized_category_name': 'Type', 'localized_tag_name': 'Container'}]}
+
+
+def _add_inventory(cassette: Cassette, count: int) -> None:
+    assets = [{'appid': 730, 'contextid': '2', 'assetid': str(10000000000 + i),
+               'classid': str(1000000 + i % max(1, count // 5)), 'instanceid': '0', 'amount': '1'}
+              for i in range(count)]
+    descriptions = [_description(1000000 + i, 'Case %d' % i) for i in range(max(1, count // 5))]
+    cassette.add('GET', '/'.join([SteamUrl.COMMUNITY_URL, 'inventory', STEAM_ID, '730', '2']),
+                 json.dumps({'assets': assets, 'descriptions': descriptions,
+                             'total_inventory_count': count, 'success': 1, 'rwgrsn': -2}),
+                 headers=_json_headers(),
+                 params={'l': 'english', 'count': 5000})
+
+
+def _add_trade_offers(cassette: Cassette, count: int, items_per_offer: int) -> None:
+    offers = []
+    for i in range(count):
+        items = [{'appid': 730, 'contextid': '2', 'assetid': str(20000000000 + i * 100 + j),
+                  'classid': str(2000000 + (i + j) % 100), 'instanceid': '0', 'amount': '1',
+                  'missing': False}
+                 for j in range(2 * items_per_offer)]
+        offers.append({'tradeofferid': str(FIRST_TRADE_OFFER_ID + i), 'accountid_other': 40000000 + i,
+                       'message': '', 'expiration_time': 1700000000, 'trade_offer_state': 2,
+                       'items_to_give': items[:items_per_offer], 'items_to_receive': items[items_per_offer:],
+                       'is_our_offer': False, 'time_created': 1690000000, 'time_updated': 1690000000,
+                       'from_real_time_trade': False, 'escrow_end_date': 0, 'confirmation_method': 2})
+    descriptions = [_description(2000000 + i, 'Sticker %d' % i) for i in range(min(100, 2 * items_per_offer + count))]
+    cassette.add('GET', SteamUrl.API_URL + '/IEconService/GetTradeOffers/v1',
+                 json.dumps({'response': {'trade_offers_received': offers,
+                                          'descriptions': descriptions,
+                                          'next_cursor': 0}}),
+                 headers=_json_headers(),
+                 params={'get_sent_offers': 1, 'get_received_offers': 1, 'get_descriptions': 1,
+                         'language': 'english', 'active_only': 1, 'historical_only': 0,
+                         'time_historical_cutoff': ''})
+
+
+def _confirmation_params(tag: str) -> dict:
+    return {'p': guard.generate_device_id(STEAM_ID), 'a': STEAM_ID, 'm': 'android', 'tag': tag}
+
+
+def _add_confirmations(cassette: Cassette, count: int) -> None:
+    entries = ''.join('<div class="mobileconf_list_entry" id="conf%d" data-confid="%d" data-key="%d" data-type="2">'
+                      '<div class="mobileconf_list_entry_description"><div>Trade with Partner %d</div></div></div>'
+                      % (FIRST_CONFIRMATION_ID + i, FIRST_CONFIRMATION_ID + i, 700000 + i, i)
+                      for i in range(count))
+    cassette.add('GET', SteamUrl.COMMUNITY_URL + '/mobileconf/conf',
+                 '<html><body><div id="mobileconf_list">%s</div></body></html>' % entries,
+                 headers=[('Content-Type', 'text/html; charset=UTF-8')],
+                 params=_confirmation_params('conf'))
+    for i in range(count):
+        confirmation_id = FIRST_CONFIRMATION_ID + i
+        html = ('<div class="mobileconf_trade_area"><div class="tradeoffer" id="tradeofferid_%d">'
+                '<div class="tradeoffer_items_ctn"></div></div></div>' % (FIRST_TRADE_OFFER_ID + i))
+        cassette.add('GET', '%s/mobileconf/details/%d' % (SteamUrl.COMMUNITY_URL, confirmation_id),
+                     json.dumps({'success': True, 'html': html}),
+                     headers=_json_headers(),
+                     params=_confirmation_params('details%d' % confirmation_id))
+    data = _confirmation_params('allow')
+    data.update({'op': 'allow',
+                 'cid[]': [str(FIRST_CONFIRMATION_ID + i) for i in range(count)],
+                 'ck[]': [str(700000 + i) for i in range(count)]})
+    cassette.add('POST', SteamUrl.COMMUNITY_URL + '/mobileconf/multiajaxop',
+                 json.dumps({'success': True}), headers=_json_headers(), data=data)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/benchmarks/load_test.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 20:02:35
+#
+# @DESCRIPTION: 多账号压力测试，用 SteamClientPool 驱动大量账号访问本地的模拟服务器，
+#               统计每种操作的吞吐量和延迟分位数
+#               用法：python load_test.py --accounts 200 --duration 60 --latency 0.05 --rate-limit-rate 0.01
+
+
+import argparse
+import base64
+import json
+import math
+import sys
+import threading
+import time
+from concurrent.futures import wait
+from typing import Dict, List
+sys.path.append("..")
+from steampy.models import GameOptions
+from steampy.pool import SteamClientPool
+from steampy.rate_limit import RateLimiter
+from benchmarks.mock_server import MockSteamServer, steam_id_for
+
+
+"""
+@description: 线程安全的耗时记录，按操作名称分别统计
+-------
+@param:
+-------
+@return:
+"""
+class LoadRecorder:
+
+    def __init__(self) -> None:
+        self._durations = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, func, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                errors = self._errors.setdefault(operation, {})
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            return None
+        finally:
+            duration = time.perf_counter() - started_at
+            with self._lock:
+                self._durations.setdefault(operation, []).append(duration)
+
+    """
+    @description: 统计结果
+    -------
+    @param: elapsed: 测试总秒数，用于计算吞吐量
+    -------
+    @return: <dict> 操作名称 -> {count, errors, per_second, p50, p90, p99, max}，延迟单位为毫秒
+    """
+    def report(self, elapsed: float) -> Dict[str, dict]:
+        with self._lock:
+            durations = {operation: sorted(values) for operation, values in self._durations.items()}
+            errors = {operation: dict(values) for operation, values in self._errors.items()}
+        return {operation: {'count': len(values),
+                            'errors': errors.get(operation, {}),
+                            'per_second': len(values) / elapsed if elapsed else 0.0,
+                            'p50': percentile(values, 50) * 1000,
+                            'p90': percentile(values, 90) * 1000,
+                            'p99': percentile(values, 99) * 1000,
+                            'max': values[-1] * 1000}
+                for operation, values in durations.items()}
+
+
+"""
+@description: 最近秩法计算已排序列表的分位数
+-------
+@param:
+-------
+@return:
+"""
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def steam_guard_for(username: str) -> str:
+    return json.dumps({'steamid': steam_id_for(username),
+                       'shared_secret': base64.b64encode(username.encode('utf-8').ljust(20, b'0')).decode('ascii'),
+                       'identity_secret': base64.b64encode(username.encode('utf-8').ljust(20, b'1')).decode('ascii')})
+
+
+"""
+@description: 一个账号的一轮操作：获取交易报价、接受其中几个（包括手机确认）、获取库存和查询价格
+-------
+@param:
+-------
+@return:
+"""
+def account_round(client, recorder: LoadRecorder, accept_per_round: int) -> None:
+    offers = recorder.record('get_trade_offers', client.get_trade_offers)
+    if offers is not None:
+        for offer in offers['response']['trade_offers_received'][:accept_per_round]:
+            recorder.record('accept_trade_offer', client.accept_trade_offer, offer['tradeofferid'])
+    recorder.record('get_my_inventory', client.get_my_inventory, GameOptions.CS)
+    recorder.record('fetch_price', client.market.fetch_price, 'Case 1', GameOptions.CS)
+
+
+"""
+@description: 执行压力测试
+-------
+@param: server: 已启动的模拟服务器
+        accounts: 账号数
+        duration: 登录后持续的秒数，每一轮所有账号各执行一次 account_round
+        max_workers: 并发线程数
+        accept_per_round: 每个账号每一轮接受的交易报价数
+        rate_limiter: 所有账号共享的限流器，设置后收到 429 的 GET 请求会自动重试
+-------
+@return: <dict> 操作名称 -> 统计结果，另外 _summary 为总请求数、429 次数、轮数和总秒数
+"""
+def run_load(server: MockSteamServer,
+             accounts: int = 100,
+             duration: float = 30.0,
+             max_workers: int = 32,
+             accept_per_round: int = 2,
+             rate_limiter: RateLimiter = None) -> Dict[str, dict]:
+    recorder = LoadRecorder()
+    adapter = server.adapter(pool_connections=4, pool_maxsize=max_workers)
+    with SteamClientPool(rate_limiter=rate_limiter, max_workers=max_workers, http_adapter=adapter) as pool:
+        usernames = ['account%05d' % i for i in range(accounts)]
+        for username in usernames:
+            pool.add_client('key-%s' % username, username, 'password', steam_guard_for(username))
+        started_at = time.perf_counter()
+        wait([pool.submit(username,
+                          lambda client: recorder.record('login', client.login, client.username,
+                                                         client._password, client.steam_guard))
+              for username in usernames])
+        deadline = time.perf_counter() + duration
+        rounds = 0
+        while time.perf_counter() < deadline:
+            wait([pool.submit(username, account_round, recorder, accept_per_round) for username in usernames])
+            rounds += 1
+        elapsed = time.perf_counter() - started_at
+    report = recorder.report(elapsed)
+    report['_summary'] = {'requests': sum(server.requests.values()),
+                          'rate_limited': server.rate_limited,
+                          'rounds': rounds,
+                          'elapsed': elapsed}
+    return report
+
+
+def print_report(report: Dict[str, dict]) -> None:
+    summary = report.pop('_summary')
+    print('%-20s %8s %8s %9s %9s %9s %9s %9s' % ('operation', 'count', 'errors', 'per sec',
+                                                  'p50 ms', 'p90 ms', 'p99 ms', 'max ms'))
+    for operation, stats in report.items():
+        print('%-20s %8d %8d %9.1f %9.1f %9.1f %9.1f %9.1f' % (operation, stats['count'],
+                                                                 sum(stats['errors'].values()),
+                                                                 stats['per_second'], stats['p50'], stats['p90'],
+                                                                 stats['p99'], stats['max']))
+        for error, count in stats['errors'].items():
+            print('    %s: %d' % (error, count))
+    print('%d requests (%.1f/s), %d rate limited, %d rounds in %.1f s'
+          % (summary['requests'], summary['requests'] / summary['elapsed'], summary['rate_limited'],
+             summary['rounds'], summary['elapsed']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--accept-per-round', type=int, default=2)
+    parser.add_argument('--latency', type=float, default=0.0, help='模拟服务器每个响应的延迟秒数')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='随机返回 429 的比例')
+    parser.add_argument('--inventory-items', type=int, default=500)
+    parser.add_argument('--offers-per-account', type=int, default=10)
+    parser.add_argument('--rate-limiter', action='store_true', help='使用默认的限流器并自动重试 429')
+    args = parser.parse_args()
+    with MockSteamServer(latency=args.latency,
+                         jitter=args.jitter,
+                         rate_limit_rate=args.rate_limit_rate,
+                         inventory_items=args.inventory_items,
+                         offers_per_account=args.offers_per_account,
+                         require_two_factor=False) as mock_server:
+        print_report(run_load(mock_server,
+                              accounts=args.accounts,
+                              duration=args.duration,
+                              max_workers=args.workers,
+                              accept_per_round=args.accept_per_round,
+                              rate_limiter=RateLimiter() if args.rate_limiter else None))
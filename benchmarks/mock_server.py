@@ -0,0 +1,463 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/benchmarks/mock_server.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 19:40:12
+#
+# @DESCRIPTION: 本地的 Steam 模拟服务器，实现 steampy 调用的登录、库存、交易报价、交易确认和市场接口，
+#               可以设置延迟、429 的比例和数据量，用于多账号的压力测试，不访问真实的 Steam
+
+
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.parse as urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+import requests
+import rsa
+from requests.adapters import HTTPAdapter
+from steampy.models import SteamUrl
+from benchmarks.pages import market_page
+
+
+"""
+@description: 把发往 Steam 的请求转发到模拟服务器，请求头 Host 保留原来的域名，
+              会话的 Cookie 仍然按原来的域名保存
+-------
+@param: base_url: 模拟服务器的地址，例如 http://127.0.0.1:8000
+-------
+@return:
+"""
+class RedirectAdapter(HTTPAdapter):
+
+    def __init__(self, base_url: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        parsed_url = urlparse.urlsplit(request.url)
+        redirected = request.copy()
+        redirected.url = self.base_url + urlparse.urlunsplit(('', '', parsed_url.path, parsed_url.query, ''))
+        redirected.headers['Host'] = parsed_url.netloc
+        response = super().send(redirected, **kwargs)
+        # 重定向和 Cookie 都按原来的地址处理
+        response.request = request
+        response.url = request.url
+        return response
+
+
+"""
+@description: 一个账号在模拟服务器上的状态：未处理的交易报价和待确认的交易
+-------
+@param:
+-------
+@return:
+"""
+class MockAccount:
+
+    def __init__(self, steam_id: str) -> None:
+        self.steam_id = steam_id
+        # 交易报价 ID -> 报价
+        self.offers = {}
+        # 交易确认 ID -> (确认 key, 交易报价 ID)
+        self.confirmations = {}
+        self.lock = threading.Lock()
+
+
+"""
+@description: 模拟服务器，在后台线程中运行
+-------
+@param: host, port: 监听地址，port 为 0 时随机选择空闲端口
+        latency: 每个响应前等待的秒数
+        jitter: 在 latency 上随机增加 0 到 jitter 秒
+        rate_limit_rate: 随机返回 429 的比例，0 到 1 之间
+        retry_after: 429 响应的 Retry-After 秒数
+        inventory_items: 每个库存的物品数
+        offers_per_account: 每个账号同时存在的交易报价数，接受后会补充新的报价
+        items_per_offer: 每个交易报价双方各自的物品数
+        sell_listings: /market 页面的卖单数
+        needs_confirmation: 接受交易报价后是否需要手机确认
+        require_two_factor: 登录时是否先返回 requires_twofactor，与真实的登录流程相同
+-------
+@return:
+"""
+class MockSteamServer:
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 rate_limit_rate: float = 0.0,
+                 retry_after: int = 1,
+                 inventory_items: int = 500,
+                 offers_per_account: int = 10,
+                 items_per_offer: int = 3,
+                 sell_listings: int = 50,
+                 needs_confirmation: bool = True,
+                 require_two_factor: bool = True) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.inventory_items = inventory_items
+        self.offers_per_account = offers_per_account
+        self.items_per_offer = items_per_offer
+        self.needs_confirmation = needs_confirmation
+        self.require_two_factor = require_two_factor
+        self.public_key, _ = rsa.newkeys(1024)
+        self._market_page_html = market_page(sell_listings, sell_listings // 10, sell_listings // 5, assets=True)
+        self._inventory_descriptions = [_description(1000000 + i, 'Case %d' % i)
+                                        for i in range(max(1, inventory_items // 5))]
+        self._offer_descriptions = [_description(2000000 + i, 'Sticker %d' % i) for i in range(100)]
+        # API key 或 Steam ID -> MockAccount
+        self._accounts = {}
+        self._next_id = 5000000000
+        self._lock = threading.Lock()
+        # 路径 -> 请求数，以及返回 429 的次数
+        self.requests = {}
+        self.rate_limited = 0
+        self._routes = self._build_routes()
+        self._server = ThreadingHTTPServer((host, port), _handler_class(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def start(self) -> 'MockSteamServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    """
+    @description: 转发到这个服务器的连接池，通过 SteamClient 或 SteamClientPool 的 http_adapter 参数挂载
+    -------
+    @param: kwargs: 传给 HTTPAdapter 的参数，例如 pool_maxsize
+    -------
+    @return:
+    """
+    def adapter(self, **kwargs) -> RedirectAdapter:
+        return RedirectAdapter(self.base_url, **kwargs)
+
+    def _account(self, steam_id: str) -> MockAccount:
+        with self._lock:
+            account = self._accounts.get(steam_id)
+            if account is None:
+                account = self._accounts[steam_id] = MockAccount(steam_id)
+            return account
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def _fill_offers(self, account: MockAccount) -> None:
+        while len(account.offers) < self.offers_per_account:
+            offer_id = str(self._new_id())
+            items = [{'appid': 730, 'contextid': '2', 'assetid': str(20000000000 + int(offer_id) * 10 + i),
+                      'classid': str(2000000 + random.randrange(100)), 'instanceid': '0', 'amount': '1',
+                      'missing': False}
+                     for i in range(2 * self.items_per_offer)]
+            account.offers[offer_id] = {'tradeofferid': offer_id, 'accountid_other': 40000000 + int(offer_id) % 1000000,
+                                        'message': '', 'expiration_time': int(time.time()) + 14 * 86400,
+                                        'trade_offer_state': 2, 'items_to_give': items[:self.items_per_offer],
+                                        'items_to_receive': items[self.items_per_offer:], 'is_our_offer': False,
+                                        'time_created': int(time.time()), 'time_updated': int(time.time()),
+                                        'from_real_time_trade': False, 'escrow_end_date': 0,
+                                        'confirmation_method': 2}
+
+    def _build_routes(self) -> list:
+        community = urlparse.urlsplit(SteamUrl.COMMUNITY_URL).netloc
+        store = urlparse.urlsplit(SteamUrl.STORE_URL).netloc
+        api = urlparse.urlsplit(SteamUrl.API_URL).netloc
+        routes = [('POST', store, r'/login/getrsakey/?', self._get_rsa_key),
+                  ('POST', store, r'/login/dologin/?', self._do_login),
+                  ('POST', None, r'/login/transfer', self._transfer),
+                  ('GET', community, r'/my/?', self._my_profile),
+                  ('GET', community, r'/inventory/(\d+)/(\d+)/(\d+)', self._inventory),
+                  ('GET', api, r'/IEconService/GetTradeOffers/v1/?', self._get_trade_offers),
+                  ('GET', api, r'/IEconService/GetTradeOffer/v1/?', self._get_trade_offer),
+                  ('GET', api, r'/IEconService/GetTradeOffersSummary/v1/?', self._get_trade_offers_summary),
+                  ('POST', community, r'/tradeoffer/(\d+)/accept', self._accept_trade_offer),
+                  ('POST', community, r'/tradeoffer/(\d+)/(?:decline|cancel)', self._remove_trade_offer),
+                  ('GET', community, r'/mobileconf/conf', self._confirmations_page),
+                  ('GET', community, r'/mobileconf/details/(\d+)', self._confirmation_details),
+                  ('GET', community, r'/mobileconf/ajaxop', self._confirm),
+                  ('POST', community, r'/mobileconf/multiajaxop', self._confirm),
+                  ('GET', community, r'/market/?', self._market_page),
+                  ('GET', community, r'/market/priceoverview/?', self._price_overview),
+                  ('GET', community, r'/market/pricehistory/?', self._price_history),
+                  ('POST', community, r'/market/sellitem/?', self._sell_item),
+                  ('POST', community, r'/market/removelisting/(\d+)', self._success),
+                  ('POST', community, r'/market/createbuyorder/?', self._create_buy_order),
+                  ('POST', community, r'/market/cancelbuyorder/?', self._success)]
+        return [(method, host, re.compile(pattern + '$'), handler) for method, host, pattern, handler in routes]
+
+    """
+    @description: 处理一个请求
+    -------
+    @param:
+    -------
+    @return: <tuple> (状态码, 响应头列表, 响应体)
+    """
+    def handle(self, method: str, host: str, path: str, params: dict, cookies: dict) -> tuple:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        for route_method, route_host, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match is None or route_method != method or (route_host is not None and route_host != host):
+                continue
+            with self._lock:
+                self.requests[path] = self.requests.get(path, 0) + 1
+                rate_limited = self.rate_limit_rate and random.random() < self.rate_limit_rate
+                if rate_limited:
+                    self.rate_limited += 1
+            if rate_limited:
+                return 429, [('Retry-After', str(self.retry_after))], b''
+            return handler(params, cookies, *match.groups())
+        return 404, [], b'Not Found'
+
+    @staticmethod
+    def _json(value) -> tuple:
+        return 200, [('Content-Type', 'application/json; charset=utf-8')], json.dumps(value).encode('utf-8')
+
+    @staticmethod
+    def _html(text: str) -> tuple:
+        return 200, [('Content-Type', 'text/html; charset=UTF-8')], text.encode('utf-8')
+
+    def _success(self, params: dict, cookies: dict, *args) -> tuple:
+        return self._json({'success': 1})
+
+    def _get_rsa_key(self, params: dict, cookies: dict) -> tuple:
+        return self._json({'success': True,
+                           'publickey_mod': '%x' % self.public_key.n,
+                           'publickey_exp': '%x' % self.public_key.e,
+                           'timestamp': str(int(time.time() * 1000)),
+                           'token_gid': '1a2b3c'})
+
+    def _do_login(self, params: dict, cookies: dict) -> tuple:
+        if self.require_two_factor and not params.get('twofactorcode'):
+            return self._json({'success': False, 'requires_twofactor': True, 'message': ''})
+        steam_id = steam_id_for(params.get('username', ''))
+        return self._json({'success': True,
+                           'requires_twofactor': False,
+                           'login_complete': True,
+                           'transfer_urls': [SteamUrl.COMMUNITY_URL + '/login/transfer',
+                                             'https://help.steampowered.com/login/transfer'],
+                           'transfer_parameters': {'steamid': steam_id, 'token_secure': 'token',
+                                                   'auth': 'auth', 'remember_login': True}})
+
+    def _transfer(self, params: dict, cookies: dict) -> tuple:
+        session_id = hashlib.md5(params.get('steamid', '').encode('ascii')).hexdigest()[:24]
+        return 200, [('Set-Cookie', 'sessionid=%s; Path=/; Secure' % session_id),
+                     ('Set-Cookie', 'steamLoginSecure=%s%%7C%%7Ctoken; Path=/; Secure; HttpOnly'
+                      % params.get('steamid', ''))], b''
+
+    def _my_profile(self, params: dict, cookies: dict) -> tuple:
+        steam_id = urlparse.unquote(cookies.get('steamLoginSecure', '')).split('||')[0]
+        if not steam_id:
+            return 302, [('Location', SteamUrl.COMMUNITY_URL + '/login/home/?goto=%2Fmy%2F')], b''
+        return 302, [('Location', '%s/profiles/%s/' % (SteamUrl.COMMUNITY_URL, steam_id))], b''
+
+    def _inventory(self, params: dict, cookies: dict, steam_id: str, app_id: str, context_id: str) -> tuple:
+        count = min(int(params.get('count', 5000)), 5000)
+        start = int(params['start_assetid']) - 10000000000 + 1 if params.get('start_assetid') else 0
+        end = min(start + count, self.inventory_items)
+        class_count = len(self._inventory_descriptions)
+        assets = [{'appid': int(app_id), 'contextid': context_id, 'assetid': str(10000000000 + i),
+                   'classid': str(1000000 + i % class_count), 'instanceid': '0', 'amount': '1'}
+                  for i in range(start, end)]
+        classids = {asset['classid'] for asset in assets}
+        response = {'assets': assets,
+                    'descriptions': [description for description in self._inventory_descriptions
+                                     if description['classid'] in classids],
+                    'total_inventory_count': self.inventory_items,
+                    'success': 1,
+                    'rwgrsn': -2}
+        if end < self.inventory_items:
+            response.update({'more_items': 1, 'last_assetid': assets[-1]['assetid']})
+        return self._json(response)
+
+    def _get_trade_offers(self, params: dict, cookies: dict) -> tuple:
+        account = self._account(params.get('key', ''))
+        with account.lock:
+            self._fill_offers(account)
+            offers = list(account.offers.values())
+        return self._json({'response': {'trade_offers_received': offers,
+                                        'trade_offers_sent': [],
+                                        'descriptions': self._offer_descriptions,
+                                        'next_cursor': 0}})
+
+    def _get_trade_offer(self, params: dict, cookies: dict) -> tuple:
+        account = self._account(params.get('key', ''))
+        with account.lock:
+            offer = account.offers.get(params.get('tradeofferid'))
+        if offer is None:
+            return self._json({'response': {}})
+        return self._json({'response': {'offer': offer, 'descriptions': self._offer_descriptions}})
+
+    def _get_trade_offers_summary(self, params: dict, cookies: dict) -> tuple:
+        account = self._account(params.get('key', ''))
+        return self._json({'response': {'pending_received_count': len(account.offers),
+                                        'new_received_count': 0, 'updated_received_count': 0,
+                                        'historical_received_count': 0, 'pending_sent_count': 0,
+                                        'newly_accepted_sent_count': 0, 'updated_sent_count': 0,
+                                        'historical_sent_count': 0, 'escrow_received_count': 0,
+                                        'escrow_sent_count': 0}})
+
+    def _accept_trade_offer(self, params: dict, cookies: dict, trade_offer_id: str) -> tuple:
+        steam_id = urlparse.unquote(cookies.get('steamLoginSecure', '')).split('||')[0]
+        # 交易报价按 API key 保存，接受时从所有账号中查找
+        with self._lock:
+            accounts = list(self._accounts.values())
+        for account in accounts:
+            with account.lock:
+                if account.offers.pop(trade_offer_id, None) is None:
+                    continue
+            if self.needs_confirmation:
+                confirming_account = self._account(steam_id)
+                with confirming_account.lock:
+                    confirming_account.confirmations[str(self._new_id())] = (str(self._new_id()), trade_offer_id)
+            return self._json({'tradeid': str(self._new_id()), 'needs_mobile_confirmation': self.needs_confirmation,
+                               'needs_email_confirmation': False})
+        return self._json({'strError': 'There was an error accepting this trade offer. (28)'})
+
+    def _remove_trade_offer(self, params: dict, cookies: dict, trade_offer_id: str) -> tuple:
+        with self._lock:
+            accounts = list(self._accounts.values())
+        for account in accounts:
+            with account.lock:
+                account.offers.pop(trade_offer_id, None)
+        return self._json({'tradeofferid': trade_offer_id})
+
+    def _confirmations_page(self, params: dict, cookies: dict) -> tuple:
+        account = self._account(params.get('a', ''))
+        with account.lock:
+            confirmations = list(account.confirmations.items())
+        if not confirmations:
+            return self._html('<html><body><div id="mobileconf_empty">Nothing to confirm</div></body></html>')
+        entries = ''.join('<div class="mobileconf_list_entry" id="conf%s" data-confid="%s" data-key="%s" '
+                          'data-type="2"><div class="mobileconf_list_entry_description">'
+                          '<div>Trade offer %s</div></div></div>' % (confid, confid, key, trade_offer_id)
+                          for confid, (key, trade_offer_id) in confirmations)
+        return self._html('<html><body><div id="mobileconf_list">%s</div></body></html>' % entries)
+
+    def _confirmation_details(self, params: dict, cookies: dict, confirmation_id: str) -> tuple:
+        account = self._account(params.get('a', ''))
+        with account.lock:
+            confirmation = account.confirmations.get(confirmation_id)
+        if confirmation is None:
+            return self._json({'success': False})
+        return self._json({'success': True,
+                           'html': '<div class="mobileconf_trade_area"><div class="tradeoffer" '
+                                   'id="tradeofferid_%s"></div></div>' % confirmation[1]})
+
+    def _confirm(self, params: dict, cookies: dict) -> tuple:
+        account = self._account(params.get('a', ''))
+        confirmation_ids = params.get('cid[]') or [params.get('cid')]
+        with account.lock:
+            for confirmation_id in confirmation_ids:
+                account.confirmations.pop(confirmation_id, None)
+        return self._json({'success': True})
+
+    def _market_page(self, params: dict, cookies: dict) -> tuple:
+        return self._html(self._market_page_html)
+
+    def _price_overview(self, params: dict, cookies: dict) -> tuple:
+        return self._json({'success': True, 'lowest_price': '$1.23', 'volume': '1,234', 'median_price': '$1.25'})
+
+    def _price_history(self, params: dict, cookies: dict) -> tuple:
+        return self._json({'success': True, 'price_prefix': '$', 'price_suffix': '',
+                           'prices': [['Jul 02 2014 01: +0', 0.5 + day / 100, str(100 + day)]
+                                      for day in range(100)]})
+
+    def _sell_item(self, params: dict, cookies: dict) -> tuple:
+        return self._json({'success': True, 'requires_confirmation': 0,
+                           'needs_mobile_confirmation': False, 'needs_email_confirmation': False})
+
+    def _create_buy_order(self, params: dict, cookies: dict) -> tuple:
+        return self._json({'success': 1, 'buy_orderid': str(self._new_id())})
+
+
+def _description(class_id: int, name: str) -> dict:
+    return {'appid': 730, 'classid': str(class_id), 'instanceid': '0', 'currency': 0,
+            'icon_url': 'icon%d' % class_id, 'tradable': 1, 'marketable': 1,
+            'name': name, 'market_hash_name': name, 'market_name': name, 'type': 'Base Grade Container'}
+
+
+"""
+@description: 根据账号名生成固定的 Steam ID，同一个账号每次登录得到相同的 ID
+-------
+@param:
+-------
+@return:
+"""
+def steam_id_for(username: str) -> str:
+    return str(76561197960265728 + int(hashlib.md5(username.encode('utf-8')).hexdigest()[:7], 16))
+
+
+def _handler_class(server: MockSteamServer) -> Callable:
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self) -> None:
+            super().setup()
+            # 响应头和响应体分两次写入，关闭 Nagle 算法避免每个响应多等一次延迟确认
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+        def _handle(self, method: str) -> None:
+            parsed_url = urlparse.urlsplit(self.path)
+            params = dict(urlparse.parse_qsl(parsed_url.query, keep_blank_values=True))
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                form = urlparse.parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+                params.update({name: values if name.endswith('[]') else values[-1]
+                               for name, values in form.items()})
+            cookies = {}
+            for cookie in (self.headers.get('Cookie') or '').split(';'):
+                name, _, value = cookie.strip().partition('=')
+                if name:
+                    cookies[name] = value
+            status, headers, body = server.handle(method, self.headers.get('Host', ''), parsed_url.path,
+                                                  params, cookies)
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            self._handle('GET')
+
+        def do_POST(self) -> None:
+            self._handle('POST')
+
+    return Handler
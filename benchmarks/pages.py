@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/benchmarks/pages.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 14:02:37
+#
+# @DESCRIPTION: 生成与 Steam 社区市场页面结构相同的测试页面
+
+
+import json
+
+SELL_LISTING_ROW = '''
+    <div class="market_listing_row market_recent_listing_row listing_{listing_id}" id="mylisting_{listing_id}">
+      <img id="mylisting_{listing_id}_image" src="https://community.cloudflare.steamstatic.com/economy/image/{listing_id}/38fx38f" alt="">
+      <div class="market_listing_right_cell market_listing_edit_buttons placeholder"></div>
+      <div class="market_listing_right_cell market_listing_my_price">
+        <span class="market_table_value">
+          <span class="market_listing_price">
+            <span style="display: inline-block">
+              <span title="This is the price the buyer pays.">${buyer_pay}</span>
+              <br>
+              <span title="This is how much you will receive." style="color: #AFAFAF">(${you_receive})</span>
+            </span>
+          </span>
+        </span>
+      </div>
+      <div class="market_listing_right_cell market_listing_listed_date can_combine">
+        {day} Oct
+      </div>
+      <div class="market_listing_item_name_block">
+        <span id="mylisting_{listing_id}_name" class="market_listing_item_name">Sticker | Item &amp; {listing_id}</span>
+        <br><span class="market_listing_game_name">Counter-Strike: Global Offensive</span>
+      </div>
+    </div>'''
+
+BUY_ORDER_ROW = '''
+    <div class="market_listing_row market_recent_listing_row" id="mybuyorder_{order_id}">
+      <div class="market_listing_right_cell market_listing_my_price market_listing_buyorder_qty">
+        <span class="market_listing_inline_buyorder_qty">{quantity} @</span>
+      </div>
+      <div class="market_listing_right_cell market_listing_my_price">
+        <span class="market_listing_price">
+          {quantity} @
+          ${price}
+        </span>
+      </div>
+      <div class="market_listing_item_name_block">
+        <span class="market_listing_item_name"><a class="market_listing_item_name_link" href="https://steamcommunity.com/market/listings/730/Case%20{order_id}">Case {order_id}</a></span>
+      </div>
+    </div>'''
+
+SECTION = '''
+  <div class="my_listing_section market_content_block market_home_listing_table">
+    <h3 class="my_market_header">
+      <span class="my_market_header_active">{title}</span> <span class="my_market_header_count">(<span>{count}</span>)</span>
+    </h3>
+    <div class="market_listing_table_header"><span class="market_listing_right_cell">PRICE</span></div>{rows}
+  </div>'''
+
+
+"""
+@description: 生成卖单行
+-------
+@param:
+-------
+@return:
+"""
+def sell_listing_rows(count: int, first_id: int = 3185447744373414153) -> str:
+    return ''.join(SELL_LISTING_ROW.format(listing_id=first_id + i,
+                                           buyer_pay='%.2f' % (0.05 + i / 100),
+                                           you_receive='%.2f' % (0.04 + i / 100),
+                                           day=i % 28 + 1)
+                   for i in range(count))
+
+
+"""
+@description: 生成卖单物品的描述（g_rgAssets）和悬停脚本，listing ID 与 sell_listing_rows 相同
+-------
+@param:
+-------
+@return: <tuple> (g_rgAssets, 悬停脚本)
+"""
+def sell_listing_assets(count: int, first_id: int = 3185447744373414153) -> tuple:
+    assets = {}
+    hovers = []
+    for i in range(count):
+        listing_id = first_id + i
+        asset_id = str(20000000000 + listing_id % 1000000000)
+        assets[asset_id] = {'id': asset_id, 'classid': str(3000000 + i % 50), 'instanceid': '0', 'amount': '1',
+                            'appid': 730, 'contextid': '2', 'market_hash_name': 'Sticker | Item & %d' % listing_id,
+                            'tradable': 0, 'marketable': 1}
+        hovers.append("CreateItemHoverFromContainer( g_rgAssets, 'mylisting_%d_name', 730, '2', '%s', 0 );"
+                      % (listing_id, asset_id))
+    return assets, '\r\n'.join(hovers)
+
+
+"""
+@description: 生成 /market 页面，包含卖单、待确认的卖单和求购单
+-------
+@param: assets: 是否包含物品描述和悬停脚本，get_my_market_listings 需要它们才能合并描述
+-------
+@return:
+"""
+def market_page(sell_listings: int = 100,
+                awaiting_confirmation: int = 10,
+                buy_orders: int = 20,
+                assets: bool = False) -> str:
+    sections = [SECTION.format(title='My sell listings', count=sell_listings,
+                               rows=sell_listing_rows(sell_listings)),
+                SECTION.format(title='My listings awaiting confirmation', count=awaiting_confirmation,
+                               rows=sell_listing_rows(awaiting_confirmation, 3185447744373500000)),
+                SECTION.format(title='My buy orders', count=buy_orders,
+                               rows=''.join(BUY_ORDER_ROW.format(order_id=5107925021 + i,
+                                                                 quantity=i % 5 + 1,
+                                                                 price='%.2f' % (1 + i / 10))
+                                            for i in range(buy_orders)))]
+    if not assets:
+        return ('<html><head><title>Steam Community Market</title></head><body>'
+                '<div id="tabContentsMyListings"><div id="myListings">%s</div></div>'
+                '<script type="text/javascript">var g_rgAssets = {};</script></body></html>') % ''.join(sections)
+    listed_assets, listed_hovers = sell_listing_assets(sell_listings)
+    awaiting_assets, awaiting_hovers = sell_listing_assets(awaiting_confirmation, 3185447744373500000)
+    listed_assets.update(awaiting_assets)
+    return ('<html><head><title>Steam Community Market</title></head><body>'
+            '<div id="tabContentsMyListings"><div id="myListings">%s</div></div>'
+            '<script type="text/javascript">\r\nvar g_rgAssets = %s;\r\n%s\r\n%s\r\n</script></body></html>'
+            % (''.join(sections), json.dumps({'730': {'2': listed_assets}}), listed_hovers, awaiting_hovers))
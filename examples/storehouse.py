@@ -9,8 +9,8 @@
 # @DESCRIPTION: todo...
 
 
-import time
 from steampy.client import SteamClient, TradeOfferState
+from steampy.offer_watcher import TradeOfferWatcher, TradeOfferEventType
 
 
 # API KEY
@@ -38,16 +38,19 @@ def main():
         return
     client = SteamClient(api_key)
     client.login(username, password, steamguard_path)
-    print('Bot logged in successfully, fetching offers every 60 seconds')
-    while True:
-        offers = client.get_trade_offers()['response']['trade_offers_received']
-        for offer in offers:
-            if is_donation(offer):
-                offer_id = offer['tradeofferid']
-                num_accepted_items = len(offer['items_to_receive'])
-                client.accept_trade_offer(offer_id)
-                print('Accepted trade offer {}. Got {} items'.format(offer_id, num_accepted_items))
-        time.sleep(60)
+    print('Bot logged in successfully, checking offers every 60 seconds')
+    # 只有报价发生变化时才会请求报价列表
+    watcher = TradeOfferWatcher(client, interval=60, get_sent_offers=False)
+    watcher.on(TradeOfferEventType.NEW, lambda event: accept_if_donation(client, event.offer))
+    watcher.run()
+
+
+def accept_if_donation(client: SteamClient, offer: dict) -> None:
+    if is_donation(offer):
+        offer_id = offer['tradeofferid']
+        num_accepted_items = len(offer['items_to_receive'])
+        client.accept_trade_offer(offer_id)
+        print('Accepted trade offer {}. Got {} items'.format(offer_id, num_accepted_items))
 
 
 def are_credentials_filled() -> bool:
@@ -1,8 +1,8 @@
 from setuptools import setup
 import sys
 
-if not sys.version_info[0] == 3 and sys.version_info[1] < 5:
-    sys.exit('Python < 3.5 is not supported')
+if sys.version_info < (3, 7):
+    sys.exit('Python < 3.7 is not supported')
 
 version = '0.70'
 
@@ -17,10 +17,22 @@ setup(
     url='https://github.com/bukson/steampy',
     download_url='https://github.com/bukson/steampy/tarball/' + version,
     keywords=['steam', 'trade', ],
-    classifiers=[],
+    classifiers=[
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+    ],
+    python_requires='>=3.7',
     install_requires=[
         "requests",
         "beautifulsoup4",
         "rsa"
     ],
+    extras_require={
+        "analytics": ["numpy>=1.20"],
+    },
 )
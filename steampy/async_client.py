@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/async_client.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 10:12:40
+#
+# @DESCRIPTION: asyncio 版本的 Client、Market 和交易确认器
+
+
+import asyncio
+import functools
+import requests
+from concurrent.futures import Executor
+from typing import AsyncIterator
+from steampy.client import SteamClient
+from steampy.confirmation import ConfirmationExecutor
+from steampy.market import PriceResult, SteamMarket
+from steampy.models import Currency, GameOptions, SteamUrl
+from steampy.rate_limit import RateLimiter
+
+
+# 同步迭代器结束的标记
+_END = object()
+
+
+"""
+@description: 生成一个在线程池中执行同名同步方法的协程方法
+-------
+@param: name: 被包装对象的方法名
+-------
+@return:
+"""
+def _async_method(name: str):
+    async def method(self, *args, **kwargs):
+        return await self._run(getattr(self._wrapped, name), *args, **kwargs)
+
+    method.__name__ = name
+    method.__qualname__ = name
+    return method
+
+
+"""
+@description: 在 prepaid 上下文中执行同步方法，请求使用事件循环中已经取走的令牌
+-------
+@param:
+-------
+@return:
+"""
+def _call_prepaid(rate_limiter: RateLimiter, url: str, func, *args):
+    with rate_limiter.prepaid(url):
+        return func(*args)
+
+
+"""
+@description: 异步包装的基类，同步的 requests 调用会被放进线程池执行，
+              这样一个事件循环可以同时驱动多个账号的请求，
+              同时进行的请求数受线程池大小限制
+-------
+@param:
+-------
+@return:
+"""
+class _AsyncWrapper:
+
+    def __init__(self, wrapped, executor: Executor = None) -> None:
+        self._wrapped = wrapped
+        # 为 None 时使用事件循环默认的线程池
+        self._executor = executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor,
+                                          functools.partial(func, *args, **kwargs))
+
+    """
+    @description: 在线程池中逐个取出同步迭代器的元素，提前退出或被取消时
+                  等正在执行的 next 结束后在线程池中关闭迭代器
+    -------
+    @param:
+    -------
+    @return: <AsyncIterator>
+    """
+    async def _iterate(self, iterator):
+        loop = asyncio.get_running_loop()
+        future = None
+        try:
+            while True:
+                future = loop.run_in_executor(self._executor, next, iterator, _END)
+                # shield 防止取消时 future 被标记为完成，而线程中的 next 还在执行
+                item = await asyncio.shield(future)
+                if item is _END:
+                    return
+                yield item
+        finally:
+            if future is not None and not future.done():
+                await asyncio.wait([future])
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                await self._run(close)
+
+
+"""
+@description: 异步 Steam 社区市场类
+-------
+@param:
+-------
+@return:
+"""
+class AsyncSteamMarket(_AsyncWrapper):
+
+    def __init__(self, market: SteamMarket, executor: Executor = None) -> None:
+        super().__init__(market, executor)
+
+    """
+    @description: 会话带有限流器时，先在事件循环中取走令牌并等待，线程池中的请求不会再取令牌，
+                  避免线程阻塞在限流上，缓存中已有的结果在调用前直接返回，不需要等待
+    -------
+    @param: url: 用来判断限流类别的请求地址
+    -------
+    @return:
+    """
+    async def _run_rate_limited(self, url: str, func, *args):
+        rate_limiter = getattr(self._wrapped._session, 'rate_limiter', None)
+        if rate_limiter is None:
+            return await self._run(func, *args)
+        await rate_limiter.acquire_async(url)
+        return await self._run(_call_prepaid, rate_limiter, url, func, *args)
+
+    async def fetch_price(self,
+                          item_hash_name: str,
+                          game: GameOptions,
+                          currency: str = Currency.USD,
+                          country: str = 'PL') -> dict:
+        cached = self._wrapped._get_cached_price(item_hash_name, game, currency, country)
+        if cached is not None:
+            return cached
+        return await self._run_rate_limited(SteamUrl.COMMUNITY_URL + '/market/priceoverview/',
+                                            self._wrapped.fetch_price, item_hash_name, game, currency, country)
+
+    async def fetch_price_history(self,
+                                  item_hash_name: str,
+                                  game: GameOptions,
+                                  country: str = 'PL') -> dict:
+        cached = self._wrapped._get_cached_price_history(item_hash_name, game, country)
+        if cached is not None:
+            return cached
+        return await self._run_rate_limited(SteamUrl.COMMUNITY_URL + '/market/pricehistory/',
+                                            self._wrapped.fetch_price_history, item_hash_name, game, country)
+
+    """
+    @description: 批量获取价格，结果按完成顺序异步返回
+    -------
+    @param: 与 SteamMarket.fetch_prices 相同
+    -------
+    @return: <AsyncIterator[PriceResult]>
+    """
+    async def fetch_prices(self, *args, **kwargs) -> AsyncIterator[PriceResult]:
+        async for result in self._iterate(iter(self._wrapped.fetch_prices(*args, **kwargs))):
+            yield result
+
+    """
+    @description: 按页异步遍历自己的市场挂单，页面的顺序为请求完成的顺序
+    -------
+    @param: 与 SteamMarket.iter_my_market_listings 相同
+    -------
+    @return: <AsyncIterator[dict]>
+    """
+    async def iter_my_market_listings(self, max_workers: int = 4) -> AsyncIterator[dict]:
+        async for page in self._iterate(self._wrapped.iter_my_market_listings(max_workers)):
+            yield page
+
+    get_my_market_listings = _async_method('get_my_market_listings')
+    create_sell_order = _async_method('create_sell_order')
+    create_sell_orders = _async_method('create_sell_orders')
+    create_buy_order = _async_method('create_buy_order')
+    buy_item = _async_method('buy_item')
+    cancel_sell_order = _async_method('cancel_sell_order')
+    cancel_buy_order = _async_method('cancel_buy_order')
+    cancel_sell_orders = _async_method('cancel_sell_orders')
+    cancel_buy_orders = _async_method('cancel_buy_orders')
+    cancel_all_listings = _async_method('cancel_all_listings')
+
+
+"""
+@description: 异步交易确认器类
+-------
+@param:
+-------
+@return:
+"""
+class AsyncConfirmationExecutor(_AsyncWrapper):
+
+    def __init__(self,
+                 identity_secret: str,
+                 my_steam_id: str,
+                 session: requests.Session,
+                 executor: Executor = None,
+                 **kwargs) -> None:
+        super().__init__(ConfirmationExecutor(identity_secret, my_steam_id, session,
+                                              **kwargs),
+                         executor)
+
+    send_trade_allow_request = _async_method('send_trade_allow_request')
+    confirm_sell_listing = _async_method('confirm_sell_listing')
+    confirm_trade_offers = _async_method('confirm_trade_offers')
+    confirm_sell_listings = _async_method('confirm_sell_listings')
+    confirm_all_sell_listings = _async_method('confirm_all_sell_listings')
+
+
+"""
+@description: 异步 Steam Client 类，方法与 SteamClient 一一对应
+-------
+@param:
+-------
+@return:
+"""
+class AsyncSteamClient(_AsyncWrapper):
+
+    """
+    @description: 初始化方法
+    -------
+    @param: executor: 执行同步请求的线程池，管理大量账号时建议传入共享的线程池
+            kwargs: 其他传给 SteamClient 的参数
+    -------
+    @return:
+    """
+    def __init__(self,
+                 api_key: str,
+                 username: str = None,
+                 password: str = None,
+                 steam_guard: str = None,
+                 executor: Executor = None,
+                 **kwargs) -> None:
+        super().__init__(SteamClient(api_key, username, password, steam_guard,
+                                     **kwargs),
+                         executor)
+        self.market = AsyncSteamMarket(self._wrapped.market, executor)
+
+    """
+    @description: 被包装的同步 SteamClient
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @property
+    def client(self) -> SteamClient:
+        return self._wrapped
+
+    @property
+    def was_login_executed(self) -> bool:
+        return self._wrapped.was_login_executed
+
+    """
+    @description: 获取当前账号的异步交易确认器，需要先登录
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def get_confirmation_executor(self) -> AsyncConfirmationExecutor:
+        steam_guard = self._wrapped.steam_guard
+        return AsyncConfirmationExecutor(steam_guard['identity_secret'],
+                                         steam_guard['steamid'],
+                                         self._wrapped._session,
+                                         self._executor,
+                                         index=self._wrapped._confirmation_index,
+                                         signer=self._wrapped._guard_signer)
+
+    async def __aenter__(self):
+        await self._run(self._wrapped.__enter__)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._run(self._wrapped.__exit__, exc_type, exc_val, exc_tb)
+
+    """
+    @description: 按页异步遍历库存，每一页都在线程池中请求
+    -------
+    @param:
+    -------
+    @return: <AsyncIterator[dict]>
+    """
+    async def iter_inventory(self,
+                             steam_id: str,
+                             game: GameOptions,
+                             page_size: int = 2000,
+                             merge: bool = True) -> AsyncIterator[dict]:
+        async for page in self._iterate(self._wrapped.iter_inventory(steam_id, game, page_size, merge)):
+            yield page
+
+    login = _async_method('login')
+    logout = _async_method('logout')
+    is_session_alive = _async_method('is_session_alive')
+    relogin = _async_method('relogin')
+    start_keep_alive = _async_method('start_keep_alive')
+    stop_keep_alive = _async_method('stop_keep_alive')
+    api_call = _async_method('api_call')
+    get_my_inventory = _async_method('get_my_inventory')
+    get_partner_inventory = _async_method('get_partner_inventory')
+    fetch_inventory = _async_method('fetch_inventory')
+    snapshot_inventories = _async_method('snapshot_inventories')
+    get_trade_offers_summary = _async_method('get_trade_offers_summary')
+    get_trade_offers = _async_method('get_trade_offers')
+    get_trade_offer = _async_method('get_trade_offer')
+    get_trade_history = _async_method('get_trade_history')
+    get_trade_receipt = _async_method('get_trade_receipt')
+    accept_trade_offer = _async_method('accept_trade_offer')
+    decline_trade_offer = _async_method('decline_trade_offer')
+    cancel_trade_offer = _async_method('cancel_trade_offer')
+    make_offer = _async_method('make_offer')
+    make_offer_with_url = _async_method('make_offer_with_url')
+    get_profile = _async_method('get_profile')
+    get_friend_list = _async_method('get_friend_list')
+    get_escrow_duration = _async_method('get_escrow_duration')
+    get_wallet_balance = _async_method('get_wallet_balance')
+
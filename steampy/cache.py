@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/cache.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 12:05:31
+#
+# @DESCRIPTION: 带过期时间和 LRU 容量限制的响应缓存
+
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+"""
+@description: 缓存后端接口，自定义后端（例如 Redis）实现 get、set 和 clear 即可
+-------
+@param:
+-------
+@return:
+"""
+class CacheBackend(ABC):
+
+    """
+    @description: 获取缓存，不存在或已过期时返回 None，修改返回值不能影响缓存中的值
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+"""
+@description: 进程内的缓存后端，超过 max_size 时删除最久没有使用的记录，
+              保存和返回的都是值的副本
+-------
+@param:
+-------
+@return:
+"""
+class MemoryCacheBackend(CacheBackend):
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+"""
+@description: SQLite 文件缓存后端，可以在多个进程之间共享，值需要能被 JSON 序列化
+-------
+@param:
+-------
+@return:
+"""
+class SQLiteCacheBackend(CacheBackend):
+
+    def __init__(self, path: str, max_size: int = 100000) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS cache ('
+                                  'key TEXT PRIMARY KEY, value TEXT, expires_at REAL, accessed_at REAL)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)')
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+            self._connection.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                                     (key, json.dumps(value), now + ttl, now))
+            count = self._connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+            if count > self.max_size:
+                self._connection.execute('DELETE FROM cache WHERE key IN '
+                                         '(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)',
+                                         (count - self.max_size,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM cache')
+
+
+"""
+@description: 按接口区分过期时间的响应缓存，并统计命中和未命中次数
+-------
+@param: backend: 缓存后端，默认使用进程内缓存
+        ttls: 覆盖默认值的各接口缓存秒数
+-------
+@return:
+"""
+class ResponseCache:
+
+    PRICE_OVERVIEW = 'priceoverview'
+    PRICE_HISTORY = 'pricehistory'
+
+    DEFAULT_TTLS = {
+        PRICE_OVERVIEW: 60,
+        PRICE_HISTORY: 3600,
+    }
+
+    def __init__(self, backend: CacheBackend = None, ttls: Dict[str, float] = None) -> None:
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @staticmethod
+    def make_key(endpoint: str, *key_parts) -> str:
+        return json.dumps([endpoint] + [str(part) for part in key_parts])
+
+    def get(self, endpoint: str, *key_parts) -> Optional[Any]:
+        value = self.backend.get(self.make_key(endpoint, *key_parts))
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            stats['hits' if value is not None else 'misses'] += 1
+        return value
+
+    def set(self, endpoint: str, value: Any, *key_parts) -> None:
+        ttl = self.ttls.get(endpoint)
+        if not ttl:
+            return
+        self.backend.set(self.make_key(endpoint, *key_parts), value, ttl)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    """
+    @description: 各接口的命中和未命中次数
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
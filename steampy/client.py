@@ -12,17 +12,27 @@
 import bs4
 import json
 import decimal
+import time
+import threading
 import requests
 import urllib.parse as urlparse
-from typing import List, Union
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Callable, Iterable, Iterator, List, Optional, Union
 from steampy import guard
+from steampy.cache import MemoryCacheBackend, ResponseCache
 from steampy.chat import SteamChat
-from steampy.confirmation import ConfirmationExecutor
+from steampy.confirmation import ConfirmationExecutor, ConfirmationIndex
 from steampy.exceptions import SevenDaysHoldException, \
     LoginRequired, ApiException
+from steampy.instrumentation import RequestHook
+from steampy.inventory import Inventory, InventorySnapshot
 from steampy.login import LoginExecutor, InvalidCredentials
 from steampy.market import SteamMarket
 from steampy.models import Asset, TradeOfferState, SteamUrl, GameOptions
+from steampy.rate_limit import RateLimiter
+from steampy.session import SteamSession
+from steampy.session_store import SessionStore, dump_cookies, load_cookies
 from steampy.utils import text_between, texts_between, \
     merge_items_with_descriptions_from_inventory, steam_id_to_account_id, \
     merge_items_with_descriptions_from_offers, get_description_key, \
@@ -56,10 +66,27 @@ def login_required(func):
 """
 class SteamClient:
 
+    # 交易报价页面信息的缓存秒数
+    TRADE_OFFER_PAGE_TTL = 600
+
+    # snapshot_inventories 默认获取的游戏
+    SNAPSHOT_GAMES = (GameOptions.CS,
+                      GameOptions.DOTA2,
+                      GameOptions.TF2,
+                      GameOptions.RUST,
+                      GameOptions.PUBG,
+                      GameOptions.STEAM)
+
     """
     @description: 初始化方法
     -------
-    @param:
+    @param: confirmation_index_path: 交易确认 ID 索引的保存路径，为 None 时只保存在内存中
+            rate_limiter: 限流器，多个账号可以共享同一个，为 None 时不限流
+            market_cache: 市场价格的响应缓存，多个账号可以共享同一个，为 None 时不缓存
+            session_store: 会话存储，登录时先尝试恢复保存的会话，为 None 时每次都完整登录
+            session_alive_ttl: is_session_alive 结果的缓存秒数
+            http_adapter: 会话使用的连接池，多个账号可以共享同一个（见 SteamClientPool）
+            request_hooks: 埋点钩子，例如 PrometheusMetrics，多个账号可以共享同一个，为空时不统计
     -------
     @return:
     """
@@ -67,19 +94,40 @@ class SteamClient:
                  api_key: str,
                  username: str=None,
                  password: str=None,
-                 steam_guard:str=None) -> None:
+                 steam_guard:str=None,
+                 confirmation_index_path: str=None,
+                 rate_limiter: RateLimiter=None,
+                 market_cache: ResponseCache=None,
+                 session_store: SessionStore=None,
+                 session_alive_ttl: float=60,
+                 http_adapter: HTTPAdapter=None,
+                 request_hooks: Iterable[RequestHook]=None) -> None:
         self._api_key = api_key
-        self._session = requests.Session()
+        # Market、Chat 和交易确认器都使用这个会话，共享同一个限流器和埋点钩子
+        self._session = SteamSession(rate_limiter, http_adapter=http_adapter, request_hooks=request_hooks)
         self.steam_guard = steam_guard
         # 是否执行过登录
         self.was_login_executed = False
         self.username = username
         self._password = password
-        self.market = SteamMarket(self._session)
+        # 同一账号的所有交易确认共享一个索引
+        self._confirmation_index = ConfirmationIndex(confirmation_index_path)
+        self.market = SteamMarket(self._session, market_cache)
         self.chat = SteamChat(self._session)
+        self._session_store = session_store
+        self.session_alive_ttl = session_alive_ttl
+        # 最近一次会话检查的结果和时间
+        self._session_alive = None
+        self._session_checked_at = 0.0
+        self._login_lock = threading.Lock()
+        self._keep_alive_stop = None
+        # 交易报价页面地址 -> 页面中的信息
+        self._trade_offer_page_cache = MemoryCacheBackend(max_size=1000)
+        # 交易确认码的签名器，登录后创建，所有交易确认器共享
+        self._guard_signer = None
 
     """
-    @description: 登录
+    @description: 登录，有会话存储时先恢复保存的会话，会话失效时才完整登录
     -------
     @param:
     -------
@@ -88,25 +136,132 @@ class SteamClient:
     def login(self, username: str, password: str, steam_guard: str) -> None:
         # 读取 Steam 手机令牌登录码
         self.steam_guard = guard.load_steam_guard(steam_guard)
+        self._guard_signer = None
         self.username = username
         self._password = password
-        LoginExecutor(username,
-                      password,
+        with self._login_lock:
+            if not self._restore_session():
+                self._full_login()
+            self._set_login_executed()
+
+    """
+    @description: 不使用保存的会话，用已有的账号信息重新完整登录，会话过期时使用
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @login_required
+    def relogin(self) -> None:
+        with self._login_lock:
+            self._session.cookies.clear()
+            self._full_login()
+            self._set_login_executed()
+
+    def _full_login(self) -> None:
+        LoginExecutor(self.username,
+                      self._password,
                       self.steam_guard['shared_secret'],
                       self._session).login()
+        self.save_session()
+
+    def _set_login_executed(self) -> None:
         self.was_login_executed = True
+        self._session_alive = True
+        self._session_checked_at = time.monotonic()
+        if self._guard_signer is None:
+            self._guard_signer = guard.GuardSigner(self.steam_guard['identity_secret'],
+                                                   self.steam_guard['steamid'],
+                                                   self.steam_guard.get('shared_secret'))
         # Steam 手机令牌地址和 Steam 社区市场会话 Session
         self.market._set_login_executed(self.steam_guard,
-                                        self._get_session_id())
+                                        self._get_session_id(),
+                                        self._confirmation_index,
+                                        self._guard_signer)
 
     @login_required
     def logout(self) -> None:
+        self.stop_keep_alive()
         url = SteamUrl.STORE_URL + '/logout/'
         data = {'sessionid': self._get_session_id()}
         self._session.post(url, data=data)
-        if self.is_session_alive():
+        if self.is_session_alive(max_age=0):
             raise Exception("Logout unsuccessful")
         self.was_login_executed = False
+        if self._session_store is not None:
+            self._session_store.delete(self.username)
+
+    """
+    @description: 启动后台线程定期检查会话，会话失效时自动重新登录
+    -------
+    @param: interval: 检查间隔秒数
+            relogin: 会话失效时是否重新登录
+            on_error: 检查或重新登录出错时的回调，参数为异常，出错后线程会在下一次间隔继续检查
+    -------
+    @return:
+    """
+    @login_required
+    def start_keep_alive(self,
+                         interval: float = 300,
+                         relogin: bool = True,
+                         on_error: Callable[[Exception], None] = None) -> None:
+        self.stop_keep_alive()
+        self._keep_alive_stop = threading.Event()
+        threading.Thread(target=self._keep_alive,
+                         args=(self._keep_alive_stop, interval, relogin, on_error),
+                         daemon=True).start()
+
+    def stop_keep_alive(self) -> None:
+        if self._keep_alive_stop is not None:
+            self._keep_alive_stop.set()
+            self._keep_alive_stop = None
+
+    def _keep_alive(self,
+                    stop_event: threading.Event,
+                    interval: float,
+                    relogin: bool,
+                    on_error: Callable[[Exception], None]) -> None:
+        while not stop_event.wait(interval):
+            try:
+                if not self.is_session_alive(max_age=0) and relogin:
+                    self.relogin()
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+
+    """
+    @description: 把当前会话的 Cookie 保存到会话存储
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def save_session(self) -> None:
+        if self._session_store is None:
+            return
+        self._session_store.save(self.username,
+                                 {'cookies': dump_cookies(self._session.cookies),
+                                  'saved_at': time.time()})
+
+    """
+    @description: 从会话存储恢复会话，恢复的会话失效时删除保存的会话
+    -------
+    @param:
+    -------
+    @return: <bool> 是否恢复成功
+    """
+    def _restore_session(self) -> bool:
+        if self._session_store is None:
+            return False
+        state = self._session_store.load(self.username)
+        if not state:
+            return False
+        load_cookies(self._session.cookies, state.get('cookies', []))
+        if 'sessionid' in self._session.cookies and self._check_session_alive():
+            return True
+        self._session.cookies.clear()
+        self._session_store.delete(self.username)
+        return False
 
     def __enter__(self):
         if None in [self.username, self._password, self.steam_guard]:
@@ -118,19 +273,45 @@ class SteamClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.logout()
 
+    """
+    @description: 会话是否有效
+    -------
+    @param: max_age: 可以直接使用的缓存结果的最长秒数，为 None 时使用 session_alive_ttl，为 0 时总是重新检查
+    -------
+    @return:
+    """
     @login_required
-    def is_session_alive(self):
-        steam_login = self.username
-        main_page_response = self._session.get(SteamUrl.COMMUNITY_URL)
-        return steam_login.lower() in main_page_response.text.lower()
+    def is_session_alive(self, max_age: float = None) -> bool:
+        max_age = self.session_alive_ttl if max_age is None else max_age
+        if self._session_alive is not None \
+                and time.monotonic() - self._session_checked_at < max_age:
+            return self._session_alive
+        return self._check_session_alive()
+
+    """
+    @description: 请求 /my/ 但不跟随跳转也不下载内容，
+                  已登录时跳转到个人资料页，未登录时跳转到登录页
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def _check_session_alive(self) -> bool:
+        response = self._session.get(SteamUrl.COMMUNITY_URL + '/my/', allow_redirects=False, stream=True)
+        response.close()
+        location = urlparse.urlparse(response.headers.get('Location', '')).path
+        alive = location.startswith(('/id/', '/profiles/'))
+        self._session_alive = alive
+        self._session_checked_at = time.monotonic()
+        return alive
 
     def api_call(self, request_method: str, interface: str, api_method: str, version: str,
                  params: dict = None) -> requests.Response:
         url = '/'.join([SteamUrl.API_URL, interface, api_method, version])
         if request_method == 'GET':
-            response = requests.get(url, params=params)
+            response = self._session.get(url, params=params)
         else:
-            response = requests.post(url, data=params)
+            response = self._session.post(url, data=params)
         if self.is_invalid_api_key(response):
             raise InvalidCredentials('Invalid API key')
         return response
@@ -157,6 +338,98 @@ class SteamClient:
             return merge_items_with_descriptions_from_inventory(response_dict, game)
         return response_dict
 
+    """
+    @description: 按页遍历库存，根据 last_assetid 游标继续请求下一页，逐页返回
+    -------
+    @param: steam_id: 库存所属用户的 Steam 64 位 ID
+            game: 游戏
+            page_size: 每页请求的物品数量
+            merge: 是否将物品与描述合并，为 False 时返回原始的分页数据
+    -------
+    @return: <Iterator[dict]>
+    """
+    @login_required
+    def iter_inventory(self,
+                       steam_id: str,
+                       game: GameOptions,
+                       page_size: int = 2000,
+                       merge: bool = True) -> Iterator[dict]:
+        url = '/'.join([SteamUrl.COMMUNITY_URL, 'inventory', steam_id, game.app_id, game.context_id])
+        params = {'l': 'english',
+                  'count': page_size}
+        while True:
+            response_dict = self._session.get(url, params=params).json()
+            if response_dict is None or response_dict.get('success') != 1:
+                raise ApiException('Success value should be 1.')
+            if merge:
+                yield merge_items_with_descriptions_from_inventory(response_dict, game)
+            else:
+                yield response_dict
+            # 没有下一页时 Steam 不会返回 more_items 和 last_assetid
+            if not response_dict.get('more_items') or not response_dict.get('last_assetid'):
+                return
+            params['start_assetid'] = response_dict['last_assetid']
+
+    """
+    @description: 获取完整库存，返回紧凑的 Inventory 结构，
+                  同类物品共享描述，可以按 market_hash_name、classid 和可交易、可出售状态查找
+    -------
+    @param: steam_id: 库存所属用户的 Steam 64 位 ID
+            game: 游戏
+            page_size: 每页请求的物品数量
+            inventory: 合并到已有的库存中，为 None 时新建
+    -------
+    @return: <Inventory>
+    """
+    @login_required
+    def fetch_inventory(self,
+                        steam_id: str,
+                        game: GameOptions,
+                        page_size: int = 2000,
+                        inventory: Inventory = None) -> Inventory:
+        inventory = inventory if inventory is not None else Inventory()
+        for page in self.iter_inventory(steam_id, game, page_size, merge=False):
+            inventory.add_response(page, game)
+        return inventory
+
+    """
+    @description: 并发获取多个游戏的库存并合并到一个 Inventory 中，请求频率受会话的限流器限制，
+                  某个游戏请求失败时不影响其他游戏，失败的游戏记录在 errors 中
+    -------
+    @param: steam_id: 库存所属用户的 Steam 64 位 ID
+            games: 要获取的游戏，为 None 时获取 SNAPSHOT_GAMES 中的所有游戏
+            page_size: 每页请求的物品数量
+    -------
+    @return: <InventorySnapshot>
+    """
+    @login_required
+    def snapshot_inventories(self,
+                             steam_id: str,
+                             games: List[GameOptions] = None,
+                             page_size: int = 2000) -> InventorySnapshot:
+        games = list(self.SNAPSHOT_GAMES if games is None else games)
+        inventory = Inventory()
+        lock = threading.Lock()
+        timings = {}
+        errors = {}
+
+        def fetch(game: GameOptions) -> None:
+            started = time.monotonic()
+            try:
+                for page in self.iter_inventory(steam_id, game, page_size, merge=False):
+                    # Inventory 不是线程安全的，合并时加锁
+                    with lock:
+                        inventory.add_response(page, game)
+            except Exception as e:
+                errors[game] = e
+            timings[game] = time.monotonic() - started
+
+        started = time.monotonic()
+        if games:
+            with ThreadPoolExecutor(max_workers=len(games)) as executor:
+                list(executor.map(fetch, games))
+        return InventorySnapshot(inventory, timings, errors, time.monotonic() - started)
+
     def _get_session_id(self) -> str:
         return self._session.cookies.get_dict()['sessionid']
 
@@ -236,7 +509,7 @@ class SteamClient:
         if trade_offer_state is not TradeOfferState.Active:
             raise ApiException("Invalid trade offer state: {} ({})".format(trade_offer_state.name,
                                                                            trade_offer_state.value))
-        partner = self._fetch_trade_partner_id(trade_offer_id)
+        partner = self._fetch_trade_partner_id(trade_offer_id, trade['response']['offer'].get('accountid_other'))
         session_id = self._get_session_id()
         accept_url = SteamUrl.COMMUNITY_URL + '/tradeoffer/' + trade_offer_id + '/accept'
         params = {'sessionid': session_id,
@@ -250,16 +523,51 @@ class SteamClient:
             return self._confirm_transaction(trade_offer_id)
         return response
 
-    def _fetch_trade_partner_id(self, trade_offer_id: str) -> str:
-        url = self._get_trade_offer_url(trade_offer_id)
-        offer_response_text = self._session.get(url).text
-        if 'You have logged in from a new device. In order to protect the items' in offer_response_text:
+    def _fetch_trade_partner_id(self, trade_offer_id: str, account_id: int = None) -> str:
+        # 新设备登录的限制只能从报价页面得知，所以页面仍然需要请求（有缓存）
+        page_facts = self._get_trade_offer_page_facts(self._get_trade_offer_url(trade_offer_id))
+        if page_facts['new_device_hold']:
             raise SevenDaysHoldException("Account has logged in a new device and can't trade for 7 days")
-        return text_between(offer_response_text, "var g_ulTradePartnerSteamID = '", "';")
+        # Web API 返回的报价中已经有对方的账号 ID 时优先使用
+        if account_id:
+            return account_id_to_steam_id(account_id)
+        if page_facts['partner_steam_id'] is None:
+            raise ValueError('Trade partner id not found in trade offer page')
+        return page_facts['partner_steam_id']
+
+    """
+    @description: 获取交易报价页面中的信息（对方的 Steam ID、双方的暂挂天数、是否因新设备登录被限制交易），
+                  结果按页面地址缓存 TRADE_OFFER_PAGE_TTL 秒，同一个页面只请求一次，
+                  未登录或出错的页面中没有这些信息，不缓存
+    -------
+    @param:
+    -------
+    @return: <dict>
+    """
+    def _get_trade_offer_page_facts(self, url: str, headers: dict = None) -> dict:
+        page_facts = self._trade_offer_page_cache.get(url)
+        if page_facts is not None:
+            return page_facts
+        text = self._session.get(url, headers=headers).text
+        page_facts = {'partner_steam_id': self._text_between_or_none(text, "var g_ulTradePartnerSteamID = '", "';"),
+                      'my_escrow_days': self._text_between_or_none(text, "var g_daysMyEscrow = ", ";"),
+                      'their_escrow_days': self._text_between_or_none(text, "var g_daysTheirEscrow = ", ";"),
+                      'new_device_hold': 'You have logged in from a new device. In order to protect the items' in text}
+        if page_facts['partner_steam_id'] is not None or page_facts['my_escrow_days'] is not None:
+            self._trade_offer_page_cache.set(url, page_facts, self.TRADE_OFFER_PAGE_TTL)
+        return page_facts
+
+    @staticmethod
+    def _text_between_or_none(text: str, begin: str, end: str) -> Optional[str]:
+        try:
+            return text_between(text, begin, end)
+        except ValueError:
+            return None
 
     def _confirm_transaction(self, trade_offer_id: str) -> dict:
         confirmation_executor = ConfirmationExecutor(self.steam_guard['identity_secret'], self.steam_guard['steamid'],
-                                                     self._session)
+                                                     self._session, index=self._confirmation_index,
+                                                     signer=self._guard_signer)
         return confirmation_executor.send_trade_allow_request(trade_offer_id)
 
     def decline_trade_offer(self, trade_offer_id: str) -> dict:
@@ -333,10 +641,10 @@ class SteamClient:
     def get_escrow_duration(self, trade_offer_url: str) -> int:
         headers = {'Referer': SteamUrl.COMMUNITY_URL + urlparse.urlparse(trade_offer_url).path,
                    'Origin': SteamUrl.COMMUNITY_URL}
-        response = self._session.get(trade_offer_url, headers=headers).text
-        my_escrow_duration = int(text_between(response, "var g_daysMyEscrow = ", ";"))
-        their_escrow_duration = int(text_between(response, "var g_daysTheirEscrow = ", ";"))
-        return max(my_escrow_duration, their_escrow_duration)
+        page_facts = self._get_trade_offer_page_facts(trade_offer_url, headers)
+        if page_facts['my_escrow_days'] is None or page_facts['their_escrow_days'] is None:
+            raise ValueError('Escrow duration not found in trade offer page')
+        return max(int(page_facts['my_escrow_days']), int(page_facts['their_escrow_days']))
 
     @login_required
     def make_offer_with_url(self, items_from_me: List[Asset], items_from_them: List[Asset],
@@ -11,13 +11,20 @@
 
 import enum
 import json
-import time
+import logging
+import os
+import threading
 import requests
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
 from bs4 import BeautifulSoup
 from steampy import guard
 from steampy.exceptions import ConfirmationExpected
 from steampy.login import InvalidCredentials
+from steampy.session import parsing
+
+
+logger = logging.getLogger(__name__)
 
 
 """
@@ -36,10 +43,12 @@ class Confirmation:
     -------
     @return:
     """
-    def __init__(self, _id, data_confid, data_key):
+    def __init__(self, _id, data_confid, data_key, data_type=None):
         self.id = _id.split("conf")[1]
         self.data_confid = data_confid
         self.data_key = data_key
+        # 交易确认的类型（ConfirmationType），页面中没有时为 None
+        self.data_type = data_type
 
 
 """
@@ -56,6 +65,105 @@ class Tag(enum.Enum):
     CANCEL = "cancel"
 
 
+"""
+@description: 交易确认的类型（列表页面中的 data-type 属性）
+-------
+@param:
+-------
+@return:
+"""
+class ConfirmationType(enum.IntEnum):
+    TRADE = 2
+    MARKET_LISTING = 3
+
+
+"""
+@description: 交易确认 ID 到交易报价 ID / 出售物品 asset ID 的索引，
+              同一个交易确认对应的内容不会变化，解析过一次的详细页面就不需要再请求
+-------
+@param: path: 索引文件路径，为 None 时只保存在内存中，文件无法读取时从空索引开始
+-------
+@return:
+"""
+class ConfirmationIndex:
+
+    TRADE_OFFER_ID = "trade_offer_id"
+    ASSET_ID = "asset_id"
+
+    def __init__(self, path: str = None) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path, "r") as f:
+                    entries = json.loads(f.read())
+                if not isinstance(entries, dict):
+                    raise ValueError("index is not a JSON object")
+                self._entries = entries
+            except (OSError, ValueError) as e:
+                # 索引只是缓存，丢失后重新请求详细页面即可
+                logger.warning("Ignoring unreadable confirmation index %s: %s", path, e)
+
+    def __contains__(self, data_confid: str) -> bool:
+        return data_confid in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    """
+    @description: 获取交易确认对应的记录，没有时返回 None
+    -------
+    @param:
+    -------
+    @return: <dict> 形如 {"trade_offer_id": ..., "asset_id": ...}
+    """
+    def get(self, data_confid: str) -> Optional[dict]:
+        return self._entries.get(data_confid)
+
+    def set(self,
+            data_confid: str,
+            trade_offer_id: Optional[str] = None,
+            asset_id: Optional[str] = None) -> dict:
+        entry = {self.TRADE_OFFER_ID: trade_offer_id, self.ASSET_ID: asset_id}
+        with self._lock:
+            self._entries[data_confid] = entry
+        return entry
+
+    """
+    @description: 删除已经不在待确认列表中的记录，防止索引无限增长
+    -------
+    @param: active_confids: 当前待确认列表中所有的交易确认 ID
+    -------
+    @return: <bool> 是否删除了记录
+    """
+    def prune(self, active_confids: Iterable[str]) -> bool:
+        active_confids = set(active_confids)
+        with self._lock:
+            entries = {data_confid: entry
+                       for data_confid, entry in self._entries.items()
+                       if data_confid in active_confids}
+            pruned = len(entries) != len(self._entries)
+            self._entries = entries
+        return pruned
+
+    """
+    @description: 保存到索引文件，先写临时文件再替换，进程中途退出时不会留下不完整的文件
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def save(self) -> None:
+        if self._path is None:
+            return
+        temp_path = self._path + ".tmp"
+        with self._lock:
+            with open(temp_path, "w") as f:
+                f.write(json.dumps(self._entries))
+            os.replace(temp_path, self._path)
+
+
 """
 @description: 交易确认器类
 -------
@@ -67,6 +175,9 @@ class ConfirmationExecutor:
 
     # 交易确认链接
     CONF_URL = "https://steamcommunity.com/mobileconf"
+    # 索引字段对应的交易确认类型
+    _KIND_TO_TYPE = {ConfirmationIndex.TRADE_OFFER_ID: ConfirmationType.TRADE,
+                     ConfirmationIndex.ASSET_ID: ConfirmationType.MARKET_LISTING}
 
     """
     @description: 初始化
@@ -78,13 +189,23 @@ class ConfirmationExecutor:
     def __init__(self,
                  identity_secret: str,
                  my_steam_id: str,
-                 session: requests.Session) -> None:
+                 session: requests.Session,
+                 max_workers: int = 8,
+                 index: ConfirmationIndex = None,
+                 signer: guard.GuardSigner = None) -> None:
         # 我的 Steam ID
         self._my_steam_id = my_steam_id
         # Steam 身份密钥
         self._identity_secret = identity_secret
         # 会话 Session
         self._session = session
+        # 批量确认时并发获取详细页面的线程数
+        self._max_workers = max_workers
+        # 交易确认 ID 索引，同一个账号的多个确认器之间可以共享
+        self._index = index if index is not None else ConfirmationIndex()
+        # 交易确认码的签名器，同一个账号的多个确认器之间可以共享
+        self._signer = signer if signer is not None \
+            else guard.GuardSigner(identity_secret, my_steam_id)
 
     """
     @description: 发送允许交易的请求
@@ -116,6 +237,180 @@ class ConfirmationExecutor:
                                                               asset_id)
         return self._send_confirmation(confirmation)
 
+    """
+    @description: 批量确认交易报价，只获取一次待确认列表，并发解析详细页面后
+                  通过 multiajaxop 一次性提交
+    -------
+    @param: trade_offer_ids: 交易报价 ID 列表
+    -------
+    @return: <dict> Steam 的返回结果，并附加 confirmed、failed 和 not_found 三个 ID 列表，
+                    Steam 拒绝了这次批量确认时找到的 ID 都放在 failed 中
+    """
+    def confirm_trade_offers(self, trade_offer_ids: Iterable[str]) -> dict:
+        confirmations = [confirmation for confirmation in self._get_confirmations()
+                         if confirmation.data_type in (None, ConfirmationType.TRADE)]
+        offer_ids = self._resolve_confirmations(confirmations,
+                                                ConfirmationIndex.TRADE_OFFER_ID)
+        return self._confirm_matching(confirmations, offer_ids, trade_offer_ids)
+
+    """
+    @description: 批量确认出售，逻辑同 confirm_trade_offers
+    -------
+    @param: asset_ids: 出售物品的 asset ID 列表
+    -------
+    @return: <dict>
+    """
+    def confirm_sell_listings(self, asset_ids: Iterable[str]) -> dict:
+        confirmations = [confirmation for confirmation in self._get_confirmations()
+                         if confirmation.data_type in (None, ConfirmationType.MARKET_LISTING)]
+        listing_asset_ids = self._resolve_confirmations(confirmations,
+                                                        ConfirmationIndex.ASSET_ID)
+        return self._confirm_matching(confirmations, listing_asset_ids, asset_ids)
+
+    """
+    @description: 确认所有待确认的出售，列表页面带有类型时不需要请求详细页面
+    -------
+    @param:
+    -------
+    @return: <dict> Steam 的返回结果，并附加交易确认 ID 列表 confirmed 和 failed
+    """
+    def confirm_all_sell_listings(self) -> dict:
+        confirmations = self._get_confirmations()
+        listings = [confirmation for confirmation in confirmations
+                    if confirmation.data_type == ConfirmationType.MARKET_LISTING]
+        # 旧版本页面没有类型，只能解析详细页面来判断
+        untyped = [confirmation for confirmation in confirmations
+                   if confirmation.data_type is None]
+        listing_asset_ids = self._resolve_confirmations(untyped,
+                                                        ConfirmationIndex.ASSET_ID)
+        listings += [confirmation for confirmation, asset_id in zip(untyped, listing_asset_ids)
+                     if asset_id is not None]
+        response = self._send_confirmations(listings)
+        # 这里返回的是交易确认 ID
+        self._split_confirmed(response, [confirmation.data_confid for confirmation in listings])
+        return response
+
+    """
+    @description: 从待确认列表中选出 ID 匹配的交易并批量确认
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def _confirm_matching(self,
+                          confirmations: List[Confirmation],
+                          resolved_ids: List[Optional[str]],
+                          wanted_ids: Iterable[str]) -> dict:
+        wanted_ids = [str(wanted_id) for wanted_id in wanted_ids]
+        id_to_confirmation = {resolved_id: confirmation
+                              for confirmation, resolved_id in zip(confirmations, resolved_ids)
+                              if resolved_id is not None}
+        selected = [id_to_confirmation[wanted_id] for wanted_id in wanted_ids
+                    if wanted_id in id_to_confirmation]
+        response = self._send_confirmations(selected)
+        self._split_confirmed(response, [wanted_id for wanted_id in wanted_ids
+                                         if wanted_id in id_to_confirmation])
+        response["not_found"] = [wanted_id for wanted_id in wanted_ids
+                                 if wanted_id not in id_to_confirmation]
+        return response
+
+    """
+    @description: 根据 Steam 返回的 success 把提交的 ID 放入 confirmed 或 failed，
+                  multiajaxop 只会整体成功或整体失败
+    -------
+    @param: response: Steam 的返回结果
+            sent_ids: 这次提交的 ID 列表
+    -------
+    @return:
+    """
+    @staticmethod
+    def _split_confirmed(response: dict, sent_ids: List[str]) -> None:
+        if response.get("success"):
+            response["confirmed"] = sent_ids
+            response["failed"] = []
+        else:
+            response["confirmed"] = []
+            response["failed"] = sent_ids
+
+    """
+    @description: 并发解析出交易报价 ID 或出售的 asset ID，已经在索引中的交易确认
+                  不会再请求详细页面，类型不符的位置为 None
+    -------
+    @param: kind: ConfirmationIndex.TRADE_OFFER_ID 或 ConfirmationIndex.ASSET_ID
+    -------
+    @return: <List[Optional[str]]> 与 confirmations 一一对应
+    """
+    def _resolve_confirmations(self,
+                               confirmations: List[Confirmation],
+                               kind: str) -> List[Optional[str]]:
+        unknown = [confirmation for confirmation in confirmations
+                   if confirmation.data_confid not in self._index]
+        if len(unknown) > 1:
+            # 一次性生成当前时间戳下所有详细页面的确认码
+            self._signer.confirmation_keys(["details" + confirmation.id
+                                            for confirmation in unknown])
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                list(executor.map(self._resolve_confirmation, unknown))
+        elif unknown:
+            self._resolve_confirmation(unknown[0])
+        if unknown:
+            self._index.save()
+        return [self._index.get(confirmation.data_confid)[kind]
+                for confirmation in confirmations]
+
+    """
+    @description: 获取交易确认对应的交易报价 ID 和出售 asset ID，
+                  不在索引中时请求详细页面解析后加入索引
+    -------
+    @param:
+    -------
+    @return: <dict>
+    """
+    def _resolve_confirmation(self, confirmation: Confirmation) -> dict:
+        entry = self._index.get(confirmation.data_confid)
+        if entry is not None:
+            return entry
+        details_page = self._fetch_confirmation_details_page(confirmation)
+        trade_offer_id = None
+        asset_id = None
+        if confirmation.data_type in (None, ConfirmationType.TRADE):
+            trade_offer_id = self._parse_or_none(
+                self._get_confirmation_trade_offer_id, details_page)
+        if confirmation.data_type in (None, ConfirmationType.MARKET_LISTING):
+            asset_id = self._parse_or_none(
+                self._get_confirmation_sell_listing_id, details_page)
+        return self._index.set(confirmation.data_confid,
+                               trade_offer_id=trade_offer_id,
+                               asset_id=asset_id)
+
+    @staticmethod
+    def _parse_or_none(parser, details_page: str) -> Optional[str]:
+        try:
+            return parser(details_page)
+        except (IndexError, KeyError, ValueError):
+            return None
+
+    """
+    @description: 通过 multiajaxop 一次请求确认多个交易
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def _send_confirmations(self, confirmations: List[Confirmation]) -> dict:
+        if not confirmations:
+            return {"success": True}
+        tag = Tag.ALLOW
+        data = self._create_confirmation_params(tag.value)
+        data["op"] = tag.value
+        data["cid[]"] = [confirmation.data_confid for confirmation in confirmations]
+        data["ck[]"] = [confirmation.data_key for confirmation in confirmations]
+        headers = {"X-Requested-With": "XMLHttpRequest"}
+        response = self._session.post(self.CONF_URL + "/multiajaxop",
+                                      data=data,
+                                      headers=headers).json()
+        return response
+
     """
     @description: 确认交易
     -------
@@ -146,20 +441,35 @@ class ConfirmationExecutor:
         confirmations = []
         # 获取待确认的交易界面并解析
         confirmations_page = self._fetch_confirmations_page()
-        soup = BeautifulSoup(confirmations_page.text, "html.parser")
-        # 如果没有待确认的交易，返回空列表
-        if soup.select("#mobileconf_empty"):
-            return confirmations
-        # 如果有待确认的交易
-        for confirmation_div in soup.select(
-                "#mobileconf_list .mobileconf_list_entry"):
-            _id = confirmation_div["id"]
-            data_confid = confirmation_div["data-confid"]
-            data_key = confirmation_div["data-key"]
-            # 创建交易对象类并加入结果列表
-            confirmations.append(Confirmation(_id, data_confid, data_key))
+        with parsing(self._session, confirmations_page.url):
+            soup = BeautifulSoup(confirmations_page.text, "html.parser")
+            # 如果没有待确认的交易，清空索引后返回空列表
+            if soup.select("#mobileconf_empty"):
+                self._prune_index([])
+                return confirmations
+            # 如果有待确认的交易
+            for confirmation_div in soup.select(
+                    "#mobileconf_list .mobileconf_list_entry"):
+                _id = confirmation_div["id"]
+                data_confid = confirmation_div["data-confid"]
+                data_key = confirmation_div["data-key"]
+                data_type = confirmation_div.get("data-type")
+                if data_type is not None and data_type.isdigit():
+                    data_type = int(data_type)
+                else:
+                    data_type = None
+                # 创建交易对象类并加入结果列表
+                confirmations.append(Confirmation(_id, data_confid, data_key,
+                                                  data_type))
+        # 已经完成的交易确认不会再出现，从索引中删除
+        self._prune_index([confirmation.data_confid
+                           for confirmation in confirmations])
         return confirmations
 
+    def _prune_index(self, active_confids: List[str]) -> None:
+        if self._index.prune(active_confids):
+            self._index.save()
+
     """
     @description: 获取 Steam 交易确认界面
     -------
@@ -209,18 +519,7 @@ class ConfirmationExecutor:
     @return:
     """
     def _create_confirmation_params(self, tag_string: str) -> dict:
-        timestamp = int(time.time())
-        # 生成当前时间的交易确认码
-        confirmation_key = guard.generate_confirmation_key(
-            self._identity_secret, tag_string, timestamp)
-        # 生成设备 ID
-        android_id = guard.generate_device_id(self._my_steam_id)
-        return {"p": android_id,
-                "a": self._my_steam_id,
-                "k": confirmation_key,
-                "t": timestamp,
-                "m": "android",
-                "tag": tag_string}
+        return self._signer.confirmation_params(tag_string)
 
     """
     @description: 根据交易 ID 获取交易
@@ -232,18 +531,9 @@ class ConfirmationExecutor:
     def _select_trade_offer_confirmation(self,
                                          confirmations: List[Confirmation],
                                          trade_offer_id: str) -> Confirmation:
-        # 遍历所有交易
-        for confirmation in confirmations:
-            # 交易详细页面
-            confirmation_details_page = self._fetch_confirmation_details_page(
-                confirmation)
-            # 获取这个详细页面内的交易 ID
-            confirmation_id = self._get_confirmation_trade_offer_id(
-                confirmation_details_page)
-            if confirmation_id == trade_offer_id:
-                return confirmation
-        # 未找到对应交易
-        raise ConfirmationExpected
+        return self._select_confirmation(confirmations,
+                                         ConfirmationIndex.TRADE_OFFER_ID,
+                                         trade_offer_id)
 
     """
     @description: 获取待确认的出售交易确认
@@ -255,16 +545,39 @@ class ConfirmationExecutor:
     def _select_sell_listing_confirmation(self,
                                           confirmations: List[Confirmation],
                                           asset_id: str) -> Confirmation:
-        # 遍历所有交易
+        return self._select_confirmation(confirmations,
+                                         ConfirmationIndex.ASSET_ID,
+                                         asset_id)
+
+    """
+    @description: 先在索引中查找，找不到时再逐个请求未知交易确认的详细页面
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def _select_confirmation(self,
+                             confirmations: List[Confirmation],
+                             kind: str,
+                             wanted_id: str) -> Confirmation:
+        wanted_type = self._KIND_TO_TYPE[kind]
+        unknown = []
         for confirmation in confirmations:
-            # 交易详细页面
-            confirmation_details_page = self._fetch_confirmation_details_page(
-                confirmation)
-            # 获取这个详细页面内的出售确认 ID
-            confirmation_id = self._get_confirmation_sell_listing_id(
-                confirmation_details_page)
-            if confirmation_id == asset_id:
+            entry = self._index.get(confirmation.data_confid)
+            if entry is None:
+                # 类型已知且不符的交易确认不需要请求详细页面
+                if confirmation.data_type in (None, wanted_type):
+                    unknown.append(confirmation)
+            elif entry[kind] == wanted_id:
                 return confirmation
+        try:
+            # 遍历所有未知交易
+            for confirmation in unknown:
+                if self._resolve_confirmation(confirmation)[kind] == wanted_id:
+                    return confirmation
+        finally:
+            if unknown:
+                self._index.save()
         # 未找到对应交易
         raise ConfirmationExpected
 
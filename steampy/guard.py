@@ -15,9 +15,114 @@ import json
 import struct
 import time
 import os
+import threading
+from collections import OrderedDict
 from hashlib import sha1
+from typing import Dict, Iterable
+import requests
+from steampy.models import SteamUrl
 
 
+# guard 模块所有函数默认使用的时间同步器，为 None 时使用本机时间
+_time_sync = None
+
+
+"""
+@description: 与 Steam 服务器的时间同步器，第一次使用时测量本机时间与服务器时间的差值，
+              之后每隔 refresh_interval 秒重新测量一次，令牌码和交易确认码都使用校正后的时间，
+              本机时间不准时不会因为令牌码错误而登录失败
+-------
+@param: session: 请求服务器时间使用的会话，为 None 时新建
+        refresh_interval: 重新测量的间隔秒数
+-------
+@return:
+"""
+class TimeSync:
+
+    # 查询 Steam 服务器时间的接口
+    QUERY_TIME_URL = SteamUrl.API_URL + "/ITwoFactorService/QueryTime/v0001"
+    # 测量失败后再次重试前等待的秒数
+    RETRY_INTERVAL = 60
+
+    def __init__(self,
+                 session: requests.Session = None,
+                 refresh_interval: float = 3600,
+                 timeout: float = 10) -> None:
+        self._session = session if session is not None else requests.Session()
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        # 服务器时间减去本机时间的秒数
+        self.offset = None
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    """
+    @description: 请求服务器时间并更新差值，请求耗时的一半作为单程延迟扣除
+    -------
+    @param:
+    -------
+    @return: <float> 新的差值
+    """
+    def sync(self) -> float:
+        sent_at = time.time()
+        response = self._session.post(self.QUERY_TIME_URL,
+                                      data={"steamid": "0"},
+                                      timeout=self.timeout)
+        received_at = time.time()
+        server_time = int(response.json()["response"]["server_time"])
+        with self._lock:
+            self.offset = server_time - (sent_at + received_at) / 2
+            self._synced_at = time.monotonic()
+        return self.offset
+
+    """
+    @description: 校正后的当前时间戳，差值过期时重新测量，测量失败时继续使用之前的差值，
+                  从未测量成功时使用本机时间
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def time(self) -> int:
+        if self._synced_at is None \
+                or time.monotonic() - self._synced_at >= self.refresh_interval:
+            try:
+                self.sync()
+            except (requests.RequestException, ValueError, KeyError):
+                # 过一段时间再重试，不在每次签名时都请求
+                with self._lock:
+                    self._synced_at = time.monotonic() \
+                        - self.refresh_interval + min(self.RETRY_INTERVAL, self.refresh_interval)
+        offset = self.offset
+        if offset is None:
+            return int(time.time())
+        return int(time.time() + offset)
+
+
+"""
+@description: 设置 guard 模块所有函数默认使用的时间同步器，为 None 时恢复使用本机时间
+-------
+@param:
+-------
+@return:
+"""
+def set_time_sync(time_sync: TimeSync = None) -> None:
+    global _time_sync
+    _time_sync = time_sync
+
+"""
+@description: 获取当前时间戳，设置了时间同步器时为校正后的服务器时间
+-------
+@param:
+-------
+@return:
+"""
+def get_time() -> int:
+    time_sync = _time_sync
+    if time_sync is not None:
+        return time_sync.time()
+    return int(time.time())
+
 """
 @description: 加载 Steam 令牌
 -------
@@ -41,11 +146,21 @@ def load_steam_guard(steam_guard: str) -> dict:
 """
 def generate_one_time_code(shared_secret: str, timestamp: int=None) -> str:
     if timestamp is None:
-        timestamp = int(time.time())
+        timestamp = get_time()
     # pack as Big endian, uint64
     time_buffer = struct.pack(">Q", timestamp // 30)
     time_hmac = hmac.new(
         base64.b64decode(shared_secret), time_buffer, digestmod=sha1).digest()
+    return _one_time_code_from_hmac(time_hmac)
+
+"""
+@description: 从时间的 HMAC 结果计算 5 位令牌码
+-------
+@param:
+-------
+@return:
+"""
+def _one_time_code_from_hmac(time_hmac: bytes) -> str:
     begin = ord(time_hmac[19:20]) & 0xf
     # unpack as Big endian uint32
     full_code = struct.unpack(
@@ -67,7 +182,10 @@ def generate_one_time_code(shared_secret: str, timestamp: int=None) -> str:
 """
 def generate_confirmation_key(identity_secret: str,
                               tag: str,
-                              timestamp: int=int(time.time())) -> bytes:
+                              timestamp: int=None) -> bytes:
+    # 默认值不能写成 int(time.time())，否则会固定为模块导入时的时间
+    if timestamp is None:
+        timestamp = get_time()
     buffer = struct.pack(">Q", timestamp) + tag.encode("ascii")
     confirmation_key = base64.b64encode(
         hmac.new(base64.b64decode(identity_secret),
@@ -89,3 +207,140 @@ def generate_device_id(steam_id: str) -> str:
                                   hexed_steam_id[12:16],
                                   hexed_steam_id[16:20],
                                   hexed_steam_id[20:32]])
+
+
+"""
+@description: 一个账号的签名器，密钥只解码一次，设备 ID 只计算一次，
+              HMAC 只初始化一次，之后每次签名复制已经初始化好的对象；
+              生成的确认码按 (时间戳, tag) 缓存，可以提前批量生成
+-------
+@param: identity_secret: 交易确认用的身份密钥
+        steam_id: 账号的 Steam ID
+        shared_secret: 登录令牌码用的共享密钥，不需要生成令牌码时可以为 None
+        max_cached: 最多缓存的确认码数量
+-------
+@return:
+"""
+class GuardSigner:
+
+    def __init__(self,
+                 identity_secret: str,
+                 steam_id: str,
+                 shared_secret: str = None,
+                 max_cached: int = 4096) -> None:
+        self.steam_id = str(steam_id)
+        self.device_id = generate_device_id(self.steam_id)
+        self.max_cached = max_cached
+        self._identity_hmac = hmac.new(base64.b64decode(identity_secret),
+                                       digestmod=sha1)
+        self._shared_hmac = None
+        if shared_secret is not None:
+            self._shared_hmac = hmac.new(base64.b64decode(shared_secret),
+                                         digestmod=sha1)
+        # (时间戳, tag) -> 确认码
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    """
+    @description: 生成交易确认码，与 generate_confirmation_key 的结果相同
+    -------
+    @param: timestamp: 为 None 时使用当前时间
+    -------
+    @return:
+    """
+    def confirmation_key(self, tag: str, timestamp: int=None) -> bytes:
+        if timestamp is None:
+            timestamp = get_time()
+        with self._lock:
+            key = self._keys.get((timestamp, tag))
+        if key is None:
+            key = self._derive(tag, timestamp)
+            self._store({(timestamp, tag): key})
+        return key
+
+    """
+    @description: 批量生成同一时间戳下多个 tag 的交易确认码
+    -------
+    @param: timestamp: 为 None 时使用当前时间
+    -------
+    @return: <dict> tag -> 确认码
+    """
+    def confirmation_keys(self,
+                          tags: Iterable[str],
+                          timestamp: int=None) -> Dict[str, bytes]:
+        if timestamp is None:
+            timestamp = get_time()
+        tags = list(tags)
+        with self._lock:
+            keys = {tag: self._keys.get((timestamp, tag)) for tag in tags}
+        derived = {tag: self._derive(tag, timestamp)
+                   for tag, key in keys.items() if key is None}
+        self._store({(timestamp, tag): key for tag, key in derived.items()})
+        keys.update(derived)
+        return keys
+
+    """
+    @description: 提前生成接下来一段时间内这些 tag 的交易确认码，之后的签名直接读取缓存
+    -------
+    @param: start: 开始的时间戳，为 None 时使用当前时间
+            window: 生成多少秒的确认码
+    -------
+    @return:
+    """
+    def precompute(self,
+                   tags: Iterable[str],
+                   start: int=None,
+                   window: int=30) -> None:
+        if start is None:
+            start = get_time()
+        tags = list(tags)
+        self._store({(timestamp, tag): self._derive(tag, timestamp)
+                     for timestamp in range(start, start + window)
+                     for tag in tags})
+
+    """
+    @description: 生成交易确认请求的参数
+    -------
+    @param: timestamp: 为 None 时使用当前时间
+    -------
+    @return: <dict>
+    """
+    def confirmation_params(self, tag: str, timestamp: int=None) -> dict:
+        if timestamp is None:
+            timestamp = get_time()
+        return {"p": self.device_id,
+                "a": self.steam_id,
+                "k": self.confirmation_key(tag, timestamp),
+                "t": timestamp,
+                "m": "android",
+                "tag": tag}
+
+    """
+    @description: 生成登录用令牌码，与 generate_one_time_code 的结果相同
+    -------
+    @param: timestamp: 为 None 时使用当前时间
+    -------
+    @return:
+    """
+    def one_time_code(self, timestamp: int=None) -> str:
+        if self._shared_hmac is None:
+            raise ValueError("shared_secret is required to generate one time codes")
+        if timestamp is None:
+            timestamp = get_time()
+        time_hmac = self._shared_hmac.copy()
+        time_hmac.update(struct.pack(">Q", timestamp // 30))
+        return _one_time_code_from_hmac(time_hmac.digest())
+
+    def _derive(self, tag: str, timestamp: int) -> bytes:
+        key_hmac = self._identity_hmac.copy()
+        key_hmac.update(struct.pack(">Q", timestamp) + tag.encode("ascii"))
+        return base64.b64encode(key_hmac.digest())
+
+    def _store(self, keys: Dict[tuple, bytes]) -> None:
+        if not keys:
+            return
+        with self._lock:
+            self._keys.update(keys)
+            # 超过上限时删除最早生成的确认码
+            while len(self._keys) > self.max_cached:
+                self._keys.popitem(last=False)
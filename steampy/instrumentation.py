@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/instrumentation.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 20:41:53
+#
+# @DESCRIPTION: 请求埋点，SteamSession 在每个请求完成和每次解析响应后调用挂载的钩子，
+#               统计各接口的耗时、流量、状态码和重试次数，可以导出为 Prometheus 指标或 OpenTelemetry Span
+
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional, Tuple
+import requests
+
+try:
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:
+    SpanKind = Status = StatusCode = None
+
+
+# 路径中的数字 ID 替换为 {id}，同一个接口的请求归为一类
+_ID_PATTERN = re.compile(r'/\d+(?=/|$)')
+
+
+"""
+@description: 请求的接口名称，域名加上把数字 ID 替换为 {id} 的路径，不包含查询参数
+-------
+@param:
+-------
+@return:
+"""
+def endpoint_name(url: str) -> str:
+    url = url.split('?', 1)[0]
+    host_start = url.find('//') + 2
+    path_start = url.find('/', host_start)
+    if path_start < 0:
+        return url[host_start:] + '/'
+    return url[host_start:path_start] + _ID_PATTERN.sub('/{id}', url[path_start:])
+
+
+"""
+@description: 一次请求的记录，包括所有 429 重试
+-------
+@param:
+-------
+@return:
+"""
+class RequestEvent:
+
+    __slots__ = ('method', 'url', 'endpoint', 'started_at', 'status_code', 'duration', 'wait_time',
+                 'retries', 'bytes_sent', 'bytes_received', 'error', '_started')
+
+    def __init__(self, request: requests.PreparedRequest) -> None:
+        self.method = request.method
+        self.url = request.url
+        self.endpoint = endpoint_name(request.url)
+        # 开始时间，纳秒级 Unix 时间戳
+        self.started_at = time.time_ns()
+        self.status_code = None
+        # 网络耗时秒数，包括重试，不包括限流等待
+        self.duration = 0.0
+        # 限流器等待的秒数
+        self.wait_time = 0.0
+        self.retries = 0
+        body = request.body
+        self.bytes_sent = len(body) if isinstance(body, (bytes, str)) else 0
+        self.bytes_received = None
+        self.error = None
+        self._started = time.perf_counter()
+
+    def finish(self, response: Optional[requests.Response], error: Exception = None) -> None:
+        self.duration = time.perf_counter() - self._started - self.wait_time
+        self.error = error
+        if response is not None:
+            self.status_code = response.status_code
+            # stream=True 时响应体还没有读取，使用 Content-Length
+            content = response.__dict__.get('_content')
+            if isinstance(content, bytes):
+                self.bytes_received = len(content)
+            elif response.headers.get('Content-Length', '').isdigit():
+                self.bytes_received = int(response.headers['Content-Length'])
+
+    def __repr__(self) -> str:
+        return 'RequestEvent(%s %s, %s, %.3f s)' % (self.method, self.endpoint, self.status_code, self.duration)
+
+
+"""
+@description: 钩子的基类，按需要重写其中的方法，钩子在发出请求的线程中同步调用，需要线程安全且尽量快
+-------
+@param:
+-------
+@return:
+"""
+class RequestHook:
+
+    """
+    @description: 一次请求完成（包括出错）后调用
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def on_request(self, event: RequestEvent) -> None:
+        pass
+
+    """
+    @description: 解析完一个响应后调用，与网络耗时分开统计
+    -------
+    @param: endpoint: 接口名称
+            started_at: 开始时间，纳秒级 Unix 时间戳
+            duration: 解析耗时秒数
+    -------
+    @return:
+    """
+    def on_parse(self, endpoint: str, started_at: int, duration: float) -> None:
+        pass
+
+
+"""
+@description: 解析计时，SteamSession.parsing 返回，结束时通知所有钩子
+-------
+@param:
+-------
+@return:
+"""
+class ParseTimer:
+
+    __slots__ = ('_hooks', '_endpoint', '_started_at', '_started')
+
+    def __init__(self, hooks: Iterable[RequestHook], endpoint: str) -> None:
+        self._hooks = hooks
+        self._endpoint = endpoint
+
+    def __enter__(self) -> 'ParseTimer':
+        self._started_at = time.time_ns()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        duration = time.perf_counter() - self._started
+        for hook in self._hooks:
+            try:
+                hook.on_parse(self._endpoint, self._started_at, duration)
+            except Exception:
+                pass
+
+
+# 请求耗时直方图的默认分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, bucket_count: int) -> None:
+        self.counts = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+"""
+@description: Prometheus 指标，render() 返回文本格式，可以直接作为 /metrics 接口的响应
+-------
+@param: namespace: 指标名称的前缀
+        buckets: 耗时直方图的分桶
+-------
+@return:
+"""
+class PrometheusMetrics(RequestHook):
+
+    # /metrics 响应的 Content-Type
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, namespace: str = 'steampy', buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # (接口, 方法, 状态码) -> 请求数
+        self._requests = {}
+        # (接口, 异常类名) -> 次数
+        self._errors = {}
+        # 接口 -> 数值
+        self._retries = {}
+        self._wait_time = {}
+        self._bytes_sent = {}
+        self._bytes_received = {}
+        self._durations = {}
+        self._parse_durations = {}
+
+    def on_request(self, event: RequestEvent) -> None:
+        endpoint = event.endpoint
+        status = str(event.status_code) if event.status_code is not None else 'error'
+        with self._lock:
+            key = (endpoint, event.method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if event.error is not None:
+                key = (endpoint, type(event.error).__name__)
+                self._errors[key] = self._errors.get(key, 0) + 1
+            if event.retries:
+                self._retries[endpoint] = self._retries.get(endpoint, 0) + event.retries
+            if event.wait_time:
+                self._wait_time[endpoint] = self._wait_time.get(endpoint, 0.0) + event.wait_time
+            self._bytes_sent[endpoint] = self._bytes_sent.get(endpoint, 0) + event.bytes_sent
+            if event.bytes_received:
+                self._bytes_received[endpoint] = self._bytes_received.get(endpoint, 0) + event.bytes_received
+            self._observe(self._durations, endpoint, event.duration)
+
+    def on_parse(self, endpoint: str, started_at: int, duration: float) -> None:
+        with self._lock:
+            self._observe(self._parse_durations, endpoint, duration)
+
+    def _observe(self, histograms: Dict[str, _Histogram], endpoint: str, value: float) -> None:
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = _Histogram(len(self.buckets))
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            histogram.counts[index] += 1
+        histogram.sum += value
+        histogram.count += 1
+
+    """
+    @description: 生成 Prometheus 文本格式的指标
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            self._render_counter(lines, 'requests_total', 'Requests by endpoint, method and status code.',
+                                 ('endpoint', 'method', 'status'), self._requests)
+            self._render_counter(lines, 'request_errors_total', 'Requests that raised an exception.',
+                                 ('endpoint', 'error'), self._errors)
+            self._render_counter(lines, 'request_retries_total', 'Automatic retries after HTTP 429.',
+                                 ('endpoint',), self._retries)
+            self._render_counter(lines, 'rate_limit_wait_seconds_total', 'Time spent waiting for the rate limiter.',
+                                 ('endpoint',), self._wait_time)
+            self._render_counter(lines, 'request_bytes_sent_total', 'Request body bytes sent.',
+                                 ('endpoint',), self._bytes_sent)
+            self._render_counter(lines, 'response_bytes_received_total', 'Response body bytes received.',
+                                 ('endpoint',), self._bytes_received)
+            self._render_histogram(lines, 'request_duration_seconds', 'Network time of requests including retries.',
+                                   self._durations)
+            self._render_histogram(lines, 'parse_duration_seconds', 'Time spent parsing responses.',
+                                   self._parse_durations)
+        return '\n'.join(lines) + '\n'
+
+    def _render_counter(self, lines: list, name: str, help_text: str, label_names: tuple, values: dict) -> None:
+        name = '%s_%s' % (self.namespace, name)
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s counter' % name)
+        for key, value in sorted(values.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            lines.append('%s{%s} %s' % (name, _labels(zip(label_names, key)), _number(value)))
+
+    def _render_histogram(self, lines: list, name: str, help_text: str, histograms: Dict[str, _Histogram]) -> None:
+        name = '%s_%s' % (self.namespace, name)
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s histogram' % name)
+        for endpoint, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bucket, count in zip(self.buckets, histogram.counts):
+                cumulative += count
+                lines.append('%s_bucket{%s} %d' % (name, _labels([('endpoint', endpoint), ('le', _number(bucket))]),
+                                                   cumulative))
+            lines.append('%s_bucket{%s} %d' % (name, _labels([('endpoint', endpoint), ('le', '+Inf')]),
+                                               histogram.count))
+            lines.append('%s_sum{%s} %s' % (name, _labels([('endpoint', endpoint)]), _number(histogram.sum)))
+            lines.append('%s_count{%s} %d' % (name, _labels([('endpoint', endpoint)]), histogram.count))
+
+
+def _labels(labels: Iterable[Tuple[str, str]]) -> str:
+    return ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                    for name, value in labels)
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+"""
+@description: 把每个请求和每次解析导出为 OpenTelemetry Span，tracer 为 opentelemetry.trace.get_tracer 的返回值，
+              只调用 start_span、set_attribute 和 end，不需要安装 opentelemetry 也可以传入兼容的对象
+-------
+@param:
+-------
+@return:
+"""
+class OpenTelemetryHook(RequestHook):
+
+    def __init__(self, tracer) -> None:
+        self.tracer = tracer
+
+    def on_request(self, event: RequestEvent) -> None:
+        attributes = {'http.method': event.method,
+                      # 查询参数中可能有 API key，不记录
+                      'http.url': event.url.split('?', 1)[0],
+                      'steampy.endpoint': event.endpoint,
+                      'steampy.retries': event.retries,
+                      'steampy.rate_limit_wait': event.wait_time,
+                      'http.request_content_length': event.bytes_sent}
+        if event.status_code is not None:
+            attributes['http.status_code'] = event.status_code
+        if event.bytes_received is not None:
+            attributes['http.response_content_length'] = event.bytes_received
+        if event.error is not None:
+            attributes['error.type'] = type(event.error).__name__
+        span = self._start_span('%s %s' % (event.method, event.endpoint), event.started_at, attributes)
+        if Status is not None and (event.error is not None or (event.status_code or 0) >= 400):
+            span.set_status(Status(StatusCode.ERROR))
+        span.end(end_time=event.started_at + int((event.duration + event.wait_time) * 1e9))
+
+    def on_parse(self, endpoint: str, started_at: int, duration: float) -> None:
+        span = self._start_span('parse %s' % endpoint, started_at, {'steampy.endpoint': endpoint})
+        span.end(end_time=started_at + int(duration * 1e9))
+
+    def _start_span(self, name: str, start_time: int, attributes: dict):
+        if SpanKind is not None:
+            return self.tracer.start_span(name, kind=SpanKind.CLIENT, start_time=start_time, attributes=attributes)
+        return self.tracer.start_span(name, start_time=start_time, attributes=attributes)
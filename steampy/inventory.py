@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/inventory.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 15:48:02
+#
+# @DESCRIPTION: 紧凑的库存结构，物品按列存储并引用共享的描述，带有常用的索引
+
+
+import copy
+from array import array
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+from steampy.models import GameOptions
+from steampy.utils import get_description_key
+
+
+# inventory 为合并后的库存，timings 为各游戏的请求耗时，errors 为请求失败的游戏和异常，elapsed 为总耗时
+InventorySnapshot = namedtuple('InventorySnapshot', ['inventory', 'timings', 'errors', 'elapsed'])
+
+
+"""
+@description: 库存中的一个物品，只在访问时创建，description 是同类物品共享的描述，不要修改
+-------
+@param:
+-------
+@return:
+"""
+class InventoryItem:
+
+    __slots__ = ('assetid', 'appid', 'contextid', 'amount', 'description')
+
+    def __init__(self, assetid: str, appid: str, contextid: str, amount: int, description: dict) -> None:
+        self.assetid = assetid
+        self.appid = appid
+        self.contextid = contextid
+        self.amount = amount
+        self.description = description
+
+    def __repr__(self) -> str:
+        return 'InventoryItem(%s, %s)' % (self.assetid, self.market_hash_name)
+
+    @property
+    def classid(self) -> str:
+        return self.description['classid']
+
+    @property
+    def instanceid(self) -> str:
+        return self.description['instanceid']
+
+    @property
+    def market_hash_name(self) -> Optional[str]:
+        return self.description.get('market_hash_name')
+
+    @property
+    def tradable(self) -> bool:
+        return bool(self.description.get('tradable'))
+
+    @property
+    def marketable(self) -> bool:
+        return bool(self.description.get('marketable'))
+
+    """
+    @description: 转换为与 merge_items 相同格式的字典（描述的浅拷贝加上 contextid、id 和 amount）
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def to_dict(self) -> dict:
+        item = copy.copy(self.description)
+        item['contextid'] = self.contextid
+        item['id'] = self.assetid
+        item['amount'] = str(self.amount)
+        return item
+
+
+"""
+@description: 库存，每个物品只保存资产 ID、上下文 ID、数量和描述的序号，
+              相同 classid 和 instanceid 的物品共享一条描述，
+              索引中的行号用字典保存，按添加顺序排列且可以 O(1) 删除
+-------
+@param:
+-------
+@return:
+"""
+class Inventory:
+
+    def __init__(self) -> None:
+        self._asset_ids = []
+        self._context_ids = []
+        self._amounts = array('q')
+        self._description_rows = array('l')
+        # 共享的描述和它们的 appid
+        self._descriptions = []
+        self._description_app_ids = []
+        # (appid, classid_instanceid) -> 描述的序号
+        self._description_keys = {}
+        # (appid, contextid, 资产 ID) -> 行号，不同游戏或上下文中的资产 ID 可能重复
+        self._positions = {}
+        # 资产 ID -> 所有对应的 (appid, contextid, 资产 ID)
+        self._keys_by_asset_id = {}
+        self._by_market_hash_name = {}
+        # (appid, classid) -> 行号，不同游戏的 classid 可能重复
+        self._by_classid = {}
+        self._by_app_id = {}
+        self._tradable = {}
+        self._marketable = {}
+
+    """
+    @description: 从 /inventory 接口的原始响应创建库存
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @classmethod
+    def from_response(cls, inventory_response: dict, game: GameOptions) -> 'Inventory':
+        inventory = cls()
+        inventory.add_response(inventory_response, game)
+        return inventory
+
+    """
+    @description: 添加一页 /inventory 接口的原始响应，可以多次调用以合并多页或多个游戏的库存，
+                  同一游戏和上下文中资产 ID 重复时后添加的物品覆盖之前的那一行
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def add_response(self, inventory_response: dict, game: GameOptions) -> None:
+        description_rows = {}
+        for description in inventory_response.get('descriptions') or []:
+            description_rows[get_description_key(description)] = self._add_description(game.app_id, description)
+        for asset in inventory_response.get('assets') or []:
+            self._add_asset(asset.get('assetid') or asset['id'],
+                            asset.get('contextid') or game.context_id,
+                            int(asset['amount']),
+                            description_rows[get_description_key(asset)])
+
+    def _add_description(self, app_id: str, description: dict) -> int:
+        key = (app_id, get_description_key(description))
+        row = self._description_keys.get(key)
+        if row is None:
+            row = len(self._descriptions)
+            self._descriptions.append(description)
+            self._description_app_ids.append(app_id)
+            self._description_keys[key] = row
+        return row
+
+    def _add_asset(self, asset_id: str, context_id: str, amount: int, description_row: int) -> None:
+        app_id = self._description_app_ids[description_row]
+        key = (app_id, str(context_id), asset_id)
+        row = self._positions.get(key)
+        if row is not None:
+            # 重复的资产直接覆盖原来的行，刷新库存时不会增加行数
+            self._remove_from_indexes(row)
+            self._amounts[row] = amount
+            self._description_rows[row] = description_row
+        else:
+            row = len(self._asset_ids)
+            self._asset_ids.append(asset_id)
+            self._context_ids.append(context_id)
+            self._amounts.append(amount)
+            self._description_rows.append(description_row)
+            self._positions[key] = row
+            self._keys_by_asset_id.setdefault(asset_id, []).append(key)
+        description = self._descriptions[description_row]
+        self._by_market_hash_name.setdefault(description.get('market_hash_name'), {})[row] = None
+        self._by_classid.setdefault((app_id, description['classid']), {})[row] = None
+        self._by_app_id.setdefault(app_id, {})[row] = None
+        if description.get('tradable'):
+            self._tradable[row] = None
+        if description.get('marketable'):
+            self._marketable[row] = None
+
+    def _remove_from_indexes(self, row: int) -> None:
+        description_row = self._description_rows[row]
+        description = self._descriptions[description_row]
+        app_id = self._description_app_ids[description_row]
+        self._remove_from_index(self._by_market_hash_name, description.get('market_hash_name'), row)
+        self._remove_from_index(self._by_classid, (app_id, description['classid']), row)
+        self._remove_from_index(self._by_app_id, app_id, row)
+        self._tradable.pop(row, None)
+        self._marketable.pop(row, None)
+
+    @staticmethod
+    def _remove_from_index(index: Dict[object, Dict[int, None]], key, row: int) -> None:
+        rows = index[key]
+        del rows[row]
+        if not rows:
+            del index[key]
+
+    def _item(self, row: int) -> InventoryItem:
+        description_row = self._description_rows[row]
+        return InventoryItem(self._asset_ids[row],
+                             self._description_app_ids[description_row],
+                             self._context_ids[row],
+                             self._amounts[row],
+                             self._descriptions[description_row])
+
+    def _items(self, rows: Iterable[int]) -> List[InventoryItem]:
+        return [self._item(row) for row in rows]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return asset_id in self._keys_by_asset_id
+
+    def __iter__(self) -> Iterator[InventoryItem]:
+        for row in self._positions.values():
+            yield self._item(row)
+
+    """
+    @description: 按资产 ID 查找物品，合并了多个游戏的库存时传入 game 区分不同游戏中相同的资产 ID，
+                  不传时返回最先添加的那个
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def get(self, asset_id: str, game: GameOptions = None) -> Optional[InventoryItem]:
+        if game is not None:
+            row = self._positions.get((game.app_id, str(game.context_id), asset_id))
+        else:
+            keys = self._keys_by_asset_id.get(asset_id)
+            row = self._positions[keys[0]] if keys else None
+        return self._item(row) if row is not None else None
+
+    def by_market_hash_name(self, market_hash_name: str) -> List[InventoryItem]:
+        return self._items(self._by_market_hash_name.get(market_hash_name, ()))
+
+    """
+    @description: 按 classid 查找物品，传入 game 时只查找这个游戏，不传时返回所有游戏中的物品
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def by_classid(self, classid: str, game: GameOptions = None) -> List[InventoryItem]:
+        app_ids = [game.app_id] if game is not None else list(self._by_app_id)
+        return [self._item(row) for app_id in app_ids
+                for row in self._by_classid.get((app_id, classid), ())]
+
+    def by_game(self, game: GameOptions) -> List[InventoryItem]:
+        return self._items(self._by_app_id.get(game.app_id, ()))
+
+    def tradable(self) -> List[InventoryItem]:
+        return self._items(self._tradable)
+
+    def marketable(self) -> List[InventoryItem]:
+        return self._items(self._marketable)
+
+    """
+    @description: 各 market_hash_name 的物品总数量
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def count_by_market_hash_name(self) -> Dict[str, int]:
+        return {market_hash_name: sum(self._amounts[row] for row in rows)
+                for market_hash_name, rows in self._by_market_hash_name.items()}
+
+    """
+    @description: 与 merge_items 返回值相同的只读字典视图，物品字典在访问时才生成
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def as_dict(self) -> 'InventoryDictView':
+        return InventoryDictView(self)
+
+
+"""
+@description: Inventory 的字典视图，键为资产 ID，值为与 merge_items 相同格式的物品字典，
+              与 merge_items 一样适用于单个游戏的库存
+-------
+@param:
+-------
+@return:
+"""
+class InventoryDictView(Mapping):
+
+    def __init__(self, inventory: Inventory) -> None:
+        self._inventory = inventory
+
+    def __getitem__(self, asset_id: str) -> dict:
+        item = self._inventory.get(asset_id)
+        if item is None:
+            raise KeyError(asset_id)
+        return item.to_dict()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._inventory._keys_by_asset_id)
+
+    def __len__(self) -> int:
+        return len(self._inventory._keys_by_asset_id)
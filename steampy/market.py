@@ -1,10 +1,21 @@
 import json
+import queue
+import threading
+import time
+import weakref
 
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal
-from requests import Session
-from steampy.confirmation import ConfirmationExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from requests import RequestException, Response, Session
+from steampy.cache import ResponseCache
+from steampy.confirmation import ConfirmationExecutor, ConfirmationIndex
 from steampy.exceptions import ApiException, TooManyRequests, LoginRequired
+from steampy.guard import GuardSigner
 from steampy.models import Currency, SteamUrl, GameOptions
+from steampy.rate_limit import RateLimiter, parse_retry_after
+from steampy.session import parsing
 from steampy.utils import text_between, get_listing_id_to_assets_address_from_html, get_market_listings_from_html, \
     merge_items_with_descriptions_from_listing, get_market_sell_listings_from_api
 
@@ -20,79 +31,190 @@ def login_required(func):
 
 
 class SteamMarket:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache: ResponseCache = None):
         self._session = session
+        self.cache = cache
         self._steam_guard = None
         self._session_id = None
+        self._confirmation_index = None
+        self._guard_signer = None
         self.was_login_executed = False
 
-    def _set_login_executed(self, steamguard: dict, session_id: str):
+    def _set_login_executed(self, steamguard: dict, session_id: str, confirmation_index: ConfirmationIndex = None,
+                            guard_signer: GuardSigner = None):
         self._steam_guard = steamguard
         self._session_id = session_id
+        self._confirmation_index = confirmation_index
+        self._guard_signer = guard_signer
         self.was_login_executed = True
 
-    def fetch_price(self, item_hash_name: str, game: GameOptions, currency: str = Currency.USD) -> dict:
+    def fetch_price(self, item_hash_name: str, game: GameOptions, currency: str = Currency.USD,
+                    country: str = 'PL') -> dict:
+        return self._fetch_price(self._session, item_hash_name, game, currency, country)
+
+    def fetch_prices(self, items_hash_names: Iterable[str], game: GameOptions, currency: Currency = Currency.USD,
+                     sessions: List[Session] = None, workers_per_session: int = 1, retries: int = 3,
+                     retry_delay: float = 5.0) -> 'PriceFetchStream':
+        return PriceFetchStream(self, items_hash_names, game, currency, sessions or [self._session],
+                                workers_per_session, retries, retry_delay)
+
+    def _get_cached_price(self, item_hash_name: str, game: GameOptions, currency: Currency,
+                          country: str = 'PL') -> Optional[dict]:
+        if self.cache is None:
+            return None
+        return self.cache.get(ResponseCache.PRICE_OVERVIEW, game.app_id, item_hash_name, currency.value, country)
+
+    def _fetch_price(self, session: Session, item_hash_name: str, game: GameOptions, currency: Currency,
+                     country: str = 'PL', rate_limiter: RateLimiter = None) -> dict:
+        # rate_limiter is used for sessions without their own one, cached prices don't take a token
+        cached = self._get_cached_price(item_hash_name, game, currency, country)
+        if cached is not None:
+            return cached
+        cache_key = (game.app_id, item_hash_name, currency.value, country)
         url = SteamUrl.COMMUNITY_URL + '/market/priceoverview/'
-        params = {'country': 'PL',
+        params = {'country': country,
                   'currency': currency.value,
                   'appid': game.app_id,
                   'market_hash_name': item_hash_name}
-        response = self._session.get(url, params=params)
+        if rate_limiter is not None:
+            rate_limiter.acquire(url)
+        response = session.get(url, params=params)
         if response.status_code == 429:
-            raise TooManyRequests("You can fetch maximum 20 prices in 60s period")
-        return response.json()
+            if rate_limiter is not None:
+                rate_limiter.backoff(url, parse_retry_after(response.headers.get('Retry-After')))
+            raise TooManyRequests("Steam market rate limit exceeded while fetching price")
+        if rate_limiter is not None:
+            rate_limiter.record_success(url)
+        response_dict = response.json()
+        if self.cache is not None and response_dict and response_dict.get('success'):
+            self.cache.set(ResponseCache.PRICE_OVERVIEW, response_dict, *cache_key)
+        return response_dict
+
+    def _get_cached_price_history(self, item_hash_name: str, game: GameOptions, country: str = 'PL') -> Optional[dict]:
+        # prices are returned in the wallet currency of the account, so the history is cached per account
+        if self.cache is None or not self.was_login_executed:
+            return None
+        return self.cache.get(ResponseCache.PRICE_HISTORY, game.app_id, item_hash_name, self._steam_guard['steamid'],
+                              country)
 
     @login_required
-    def fetch_price_history(self, item_hash_name: str, game: GameOptions) -> dict:
+    def fetch_price_history(self, item_hash_name: str, game: GameOptions, country: str = 'PL') -> dict:
+        cached = self._get_cached_price_history(item_hash_name, game, country)
+        if cached is not None:
+            return cached
+        cache_key = (game.app_id, item_hash_name, self._steam_guard['steamid'], country)
         url = SteamUrl.COMMUNITY_URL + '/market/pricehistory/'
-        params = {'country': 'PL',
+        params = {'country': country,
                   'appid': game.app_id,
                   'market_hash_name': item_hash_name}
         response = self._session.get(url, params=params)
         if response.status_code == 429:
-            raise TooManyRequests("You can fetch maximum 20 prices in 60s period")
-        return response.json()
+            raise TooManyRequests("Steam market rate limit exceeded while fetching price history")
+        response_dict = response.json()
+        if self.cache is not None and response_dict and response_dict.get('success'):
+            self.cache.set(ResponseCache.PRICE_HISTORY, response_dict, *cache_key)
+        return response_dict
+
+    @login_required
+    def get_my_market_listings(self, max_workers: int = 4) -> dict:
+        pages = self.iter_my_market_listings(max_workers)
+        listings = next(pages)
+        for page in pages:
+            listings["sell_listings"].update(page["sell_listings"])
+        return listings
 
     @login_required
-    def get_my_market_listings(self) -> dict:
+    def iter_my_market_listings(self, max_workers: int = 4) -> Iterator[dict]:
         response = self._session.get("%s/market" % SteamUrl.COMMUNITY_URL)
         if response.status_code != 200:
             raise ApiException("There was a problem getting the listings. http code: %s" % response.status_code)
-        assets_descriptions = json.loads(text_between(response.text, "var g_rgAssets = ", ";\r\n"))
-        listing_id_to_assets_address = get_listing_id_to_assets_address_from_html(response.text)
-        listings = get_market_listings_from_html(response.text)
-        listings = merge_items_with_descriptions_from_listing(listings, listing_id_to_assets_address,
-                                                              assets_descriptions)
-        if '<span id="tabContentsMyActiveMarketListings_end">' in response.text:
-            n_showing = int(text_between(response.text, '<span id="tabContentsMyActiveMarketListings_end">', '</span>'))
-            n_total = int(text_between(response.text, '<span id="tabContentsMyActiveMarketListings_total">', '</span>').replace(',',''))
-            if n_showing < n_total < 1000:
-                url = "%s/market/mylistings/render/?query=&start=%s&count=%s" % (SteamUrl.COMMUNITY_URL, n_showing, -1)
-                response = self._session.get(url)
-                if response.status_code != 200:
-                    raise ApiException("There was a problem getting the listings. http code: %s" % response.status_code)
-                jresp = response.json()
-                listing_id_to_assets_address = get_listing_id_to_assets_address_from_html(jresp.get("hovers"))
-                listings_2 = get_market_sell_listings_from_api(jresp.get("results_html"))
-                listings_2 = merge_items_with_descriptions_from_listing(listings_2, listing_id_to_assets_address,
-                                                                        jresp.get("assets"))
-                listings["sell_listings"] = {**listings["sell_listings"], **listings_2["sell_listings"]}
-            else:
-                for i in range(0, n_total, 100):
-                    url = "%s/market/mylistings/?query=&start=%s&count=%s" % (SteamUrl.COMMUNITY_URL, n_showing + i, 100)
-                    response = self._session.get(url)
-                    if response.status_code != 200:
-                        raise ApiException("There was a problem getting the listings. http code: %s" % response.status_code)
-                    jresp = response.json()
-                    listing_id_to_assets_address = get_listing_id_to_assets_address_from_html(jresp.get("hovers"))
-                    listings_2 = get_market_sell_listings_from_api(jresp.get("results_html"))
-                    listings_2 = merge_items_with_descriptions_from_listing(listings_2, listing_id_to_assets_address,
-                                                                            jresp.get("assets"))
-                    listings["sell_listings"] = {**listings["sell_listings"], **listings_2["sell_listings"]}
-        return listings
+        with parsing(self._session, response.url):
+            assets_descriptions = json.loads(text_between(response.text, "var g_rgAssets = ", ";\r\n"))
+            listing_id_to_assets_address = get_listing_id_to_assets_address_from_html(response.text)
+            listings = get_market_listings_from_html(response.text)
+            listings = merge_items_with_descriptions_from_listing(listings, listing_id_to_assets_address,
+                                                                  assets_descriptions)
+        yield listings
+        if '<span id="tabContentsMyActiveMarketListings_end">' not in response.text:
+            return
+        n_showing = int(text_between(response.text, '<span id="tabContentsMyActiveMarketListings_end">', '</span>'))
+        n_total = int(text_between(response.text, '<span id="tabContentsMyActiveMarketListings_total">', '</span>').replace(',',''))
+        if n_showing >= n_total:
+            return
+        if n_total < 1000:
+            yield self._get_my_market_listings_page("render/", n_showing, -1)
+            return
+        # Pages are fetched concurrently, the session's rate limiter bounds the request rate
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        futures = [executor.submit(self._get_my_market_listings_page, "", start, 100)
+                   for start in range(n_showing, n_total, 100)]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _get_my_market_listings_page(self, endpoint: str, start: int, count: int) -> dict:
+        url = "%s/market/mylistings/%s?query=&start=%s&count=%s" % (SteamUrl.COMMUNITY_URL, endpoint, start, count)
+        response = self._session.get(url)
+        if response.status_code != 200:
+            raise ApiException("There was a problem getting the listings. http code: %s" % response.status_code)
+        with parsing(self._session, url):
+            jresp = json.loads(response.text)
+            listing_id_to_assets_address = get_listing_id_to_assets_address_from_html(jresp.get("hovers"))
+            listings = get_market_sell_listings_from_api(jresp.get("results_html"))
+            return merge_items_with_descriptions_from_listing(listings, listing_id_to_assets_address,
+                                                              jresp.get("assets"))
 
     @login_required
     def create_sell_order(self, assetid: str, game: GameOptions, money_to_receive: str) -> dict:
+        response = self._post_sell_order(assetid, game, money_to_receive)
+        if response.get("needs_mobile_confirmation"):
+            return self._confirm_sell_listing(assetid)
+        return response
+
+    @login_required
+    def create_sell_orders(self, items: Iterable[Tuple[str, GameOptions, str]], confirm: bool = True,
+                           max_workers: int = 4) -> List['SellOrderResult']:
+        # items are (assetid, game, money_to_receive) tuples, results keep their order
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            responses = list(executor.map(lambda item: self._try_post_sell_order(*item), items))
+        needs_confirmation = [assetid for (assetid, _, _), (response, _) in zip(items, responses)
+                              if response is not None and response.get("needs_mobile_confirmation")]
+        confirmed = set()
+        confirmation_error = None
+        if confirm and needs_confirmation:
+            try:
+                confirmation = self._confirm_sell_listings(needs_confirmation)
+            except Exception as e:
+                confirmation_error = e
+            else:
+                if confirmation.get("success"):
+                    confirmed = set(confirmation.get("confirmed", []))
+                else:
+                    confirmation_error = ApiException("Steam rejected the confirmation of the listings. Message: %s"
+                                                      % confirmation.get("message"))
+        results = []
+        for (assetid, _, _), (response, error) in zip(items, responses):
+            if error is None and response.get("needs_mobile_confirmation") and confirm and assetid not in confirmed:
+                error = confirmation_error or ApiException("Confirmation of the listing was not found")
+            results.append(SellOrderResult(assetid, response, assetid in confirmed, error))
+        return results
+
+    def _try_post_sell_order(self, assetid: str, game: GameOptions, money_to_receive: str) -> tuple:
+        try:
+            response = self._post_sell_order(assetid, game, money_to_receive)
+        except (RequestException, ValueError) as e:
+            return None, e
+        if not response.get("success"):
+            return response, ApiException("There was a problem creating the listing. Message: %s"
+                                          % response.get("message"))
+        return response, None
+
+    def _post_sell_order(self, assetid: str, game: GameOptions, money_to_receive: str) -> dict:
         data = {
             "assetid": assetid,
             "sessionid": self._session_id,
@@ -102,10 +224,7 @@ class SteamMarket:
             "price": money_to_receive
         }
         headers = {'Referer': "%s/profiles/%s/inventory" % (SteamUrl.COMMUNITY_URL, self._steam_guard['steamid'])}
-        response = self._session.post(SteamUrl.COMMUNITY_URL + "/market/sellitem/", data, headers=headers).json()
-        if response.get("needs_mobile_confirmation"):
-            return self._confirm_sell_listing(assetid)
-        return response
+        return self._session.post(SteamUrl.COMMUNITY_URL + "/market/sellitem/", data, headers=headers).json()
 
     @login_required
     def create_buy_order(self, market_name: str, price_single_item: str, quantity: int, game: GameOptions,
@@ -151,26 +270,241 @@ class SteamMarket:
 
     @login_required
     def cancel_sell_order(self, sell_listing_id: str) -> None:
+        self._check_remove_listing_response(self._post_remove_listing(sell_listing_id))
+
+    @login_required
+    def cancel_buy_order(self, buy_order_id) -> dict:
+        return self._check_cancel_buy_order_response(self._post_cancel_buy_order(buy_order_id))
+
+    @login_required
+    def cancel_sell_orders(self, sell_listing_ids: Iterable[str], max_workers: int = 4, retries: int = 2,
+                           retry_delay: float = 1.0) -> Dict[str, 'CancelResult']:
+        return self._cancel_many(self._post_remove_listing, self._check_remove_listing_response, sell_listing_ids,
+                                 max_workers, retries, retry_delay)
+
+    @login_required
+    def cancel_buy_orders(self, buy_order_ids: Iterable[str], max_workers: int = 4, retries: int = 2,
+                          retry_delay: float = 1.0) -> Dict[str, 'CancelResult']:
+        return self._cancel_many(self._post_cancel_buy_order, self._check_cancel_buy_order_response, buy_order_ids,
+                                 max_workers, retries, retry_delay)
+
+    @login_required
+    def cancel_all_listings(self, filter: Callable[[dict], bool] = None, sell_listings: bool = True,
+                            buy_orders: bool = True, max_workers: int = 4, retries: int = 2,
+                            retry_delay: float = 1.0) -> Dict[str, Dict[str, 'CancelResult']]:
+        listings = self.get_my_market_listings(max_workers)
+        result = {"sell_listings": {}, "buy_orders": {}}
+        if sell_listings:
+            ids = [listing_id for listing_id, listing in listings["sell_listings"].items()
+                   if filter is None or filter(listing)]
+            result["sell_listings"] = self.cancel_sell_orders(ids, max_workers, retries, retry_delay)
+        if buy_orders:
+            ids = [order_id for order_id, order in listings["buy_orders"].items()
+                   if filter is None or filter(order)]
+            result["buy_orders"] = self.cancel_buy_orders(ids, max_workers, retries, retry_delay)
+        return result
+
+    def _post_remove_listing(self, sell_listing_id: str) -> Response:
         data = {"sessionid": self._session_id}
         headers = {'Referer': SteamUrl.COMMUNITY_URL + "/market/"}
         url = "%s/market/removelisting/%s" % (SteamUrl.COMMUNITY_URL, sell_listing_id)
-        response = self._session.post(url, data=data, headers=headers)
+        return self._session.post(url, data=data, headers=headers)
+
+    @staticmethod
+    def _check_remove_listing_response(response: Response) -> None:
         if response.status_code != 200:
             raise ApiException("There was a problem removing the listing. http code: %s" % response.status_code)
 
-    @login_required
-    def cancel_buy_order(self, buy_order_id) -> dict:
+    def _post_cancel_buy_order(self, buy_order_id: str) -> Response:
         data = {
             "sessionid": self._session_id,
             "buy_orderid": buy_order_id
         }
         headers = {"Referer": SteamUrl.COMMUNITY_URL + "/market"}
-        response = self._session.post(SteamUrl.COMMUNITY_URL + "/market/cancelbuyorder/", data, headers=headers).json()
+        return self._session.post(SteamUrl.COMMUNITY_URL + "/market/cancelbuyorder/", data, headers=headers)
+
+    @staticmethod
+    def _check_cancel_buy_order_response(response: Response) -> dict:
+        response = response.json()
         if response.get("success") != 1:
             raise ApiException("There was a problem canceling the order. success: %s" % response.get("success"))
         return response
 
+    def _cancel_many(self, post: Callable[[str], Response], check: Callable[[Response], object], ids: Iterable[str],
+                     max_workers: int, retries: int, retry_delay: float) -> Dict[str, 'CancelResult']:
+        ids = list(dict.fromkeys(str(order_id) for order_id in ids))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = executor.map(lambda order_id: self._cancel_with_retries(post, check, order_id, retries,
+                                                                              retry_delay), ids)
+            return {result.id: result for result in results}
+
+    def _cancel_with_retries(self, post: Callable[[str], Response], check: Callable[[Response], object],
+                             order_id: str, retries: int, retry_delay: float) -> 'CancelResult':
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                response = post(order_id)
+                if response.status_code not in TRANSIENT_STATUS_CODES:
+                    check(response)
+                    return CancelResult(order_id, None, attempts)
+                error = ApiException("There was a problem canceling %s. http code: %s"
+                                     % (order_id, response.status_code))
+            except ApiException as e:
+                return CancelResult(order_id, e, attempts)
+            except (RequestException, ValueError) as e:
+                # connection errors and non json (error page) responses are worth retrying
+                error = e
+            if attempts > retries:
+                return CancelResult(order_id, error, attempts)
+            time.sleep(retry_delay * attempts)
+
     def _confirm_sell_listing(self, asset_id: str) -> dict:
         con_executor = ConfirmationExecutor(self._steam_guard['identity_secret'], self._steam_guard['steamid'],
-                                            self._session)
+                                            self._session, index=self._confirmation_index,
+                                            signer=self._guard_signer)
         return con_executor.confirm_sell_listing(asset_id)
+
+    def _confirm_sell_listings(self, asset_ids: List[str]) -> dict:
+        con_executor = ConfirmationExecutor(self._steam_guard['identity_secret'], self._steam_guard['steamid'],
+                                            self._session, index=self._confirmation_index,
+                                            signer=self._guard_signer)
+        return con_executor.confirm_sell_listings(asset_ids)
+
+
+# status codes after which a cancel request is retried
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# error is None when the order was canceled, attempts counts the requests made
+CancelResult = namedtuple('CancelResult', ['id', 'error', 'attempts'])
+
+# error is None when the listing was created (and confirmed if it needed a confirmation)
+SellOrderResult = namedtuple('SellOrderResult', ['assetid', 'response', 'confirmed', 'error'])
+
+
+PriceResult = namedtuple('PriceResult', ['market_hash_name', 'price', 'error'])
+
+# put into the results queue by every worker when it exits
+_WORKER_DONE = object()
+
+
+class PriceFetchStream:
+    """Iterates over PriceResult of many items as they are fetched, ``report`` holds throughput statistics."""
+
+    # sessions without a RateLimiter get a limiter with only the price limit, shared by all streams of the session
+    DEFAULT_LIMITS = {family: None for family in RateLimiter.DEFAULT_LIMITS if family != RateLimiter.MARKET_PRICE}
+    _default_rate_limiters = weakref.WeakKeyDictionary()
+    _default_rate_limiters_lock = threading.Lock()
+
+    def __init__(self, market: SteamMarket, items_hash_names: Iterable[str], game: GameOptions, currency: Currency,
+                 sessions: List[Session], workers_per_session: int, retries: int, retry_delay: float) -> None:
+        self._market = market
+        self._items_hash_names = list(dict.fromkeys(items_hash_names))
+        self._game = game
+        self._currency = currency
+        self._sessions = sessions
+        self._rate_limiters = [None if getattr(session, 'rate_limiter', None) is not None
+                               else self._default_rate_limiter(session) for session in sessions]
+        self._workers_per_session = workers_per_session
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._finished_at = None
+        self._fetched = 0
+        self._failed = 0
+        self._retried = 0
+
+    def __iter__(self) -> Iterator[PriceResult]:
+        if self._started_at is not None:
+            raise RuntimeError('PriceFetchStream can be iterated only once')
+        self._started_at = time.monotonic()
+        pending = queue.Queue()
+        for item_hash_name in self._items_hash_names:
+            pending.put(item_hash_name)
+        results = queue.Queue()
+        workers = [threading.Thread(target=self._work, args=(session, rate_limiter, pending, results), daemon=True)
+                   for session, rate_limiter in zip(self._sessions, self._rate_limiters)
+                   for _ in range(self._workers_per_session)]
+        for worker in workers:
+            worker.start()
+        # after close() the workers finish their current item and exit, results already fetched are still yielded
+        running = len(workers)
+        try:
+            while running:
+                result = results.get()
+                if result is _WORKER_DONE:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            self._stop.set()
+            self._finished_at = time.monotonic()
+
+    def close(self) -> None:
+        self._stop.set()
+
+    @classmethod
+    def _default_rate_limiter(cls, session: Session) -> RateLimiter:
+        with cls._default_rate_limiters_lock:
+            rate_limiter = cls._default_rate_limiters.get(session)
+            if rate_limiter is None:
+                rate_limiter = cls._default_rate_limiters[session] = RateLimiter(cls.DEFAULT_LIMITS)
+            return rate_limiter
+
+    def _work(self, session: Session, rate_limiter: Optional[RateLimiter], pending: queue.Queue,
+              results: queue.Queue) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    item_hash_name = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results.put(self._fetch_with_retries(session, rate_limiter, item_hash_name))
+                except Exception as error:
+                    with self._lock:
+                        self._failed += 1
+                    results.put(PriceResult(item_hash_name, None, error))
+        finally:
+            results.put(_WORKER_DONE)
+
+    def _fetch_with_retries(self, session: Session, rate_limiter: Optional[RateLimiter],
+                            item_hash_name: str) -> PriceResult:
+        attempt = 0
+        while True:
+            try:
+                price = self._market._fetch_price(session, item_hash_name, self._game, self._currency,
+                                                  rate_limiter=rate_limiter)
+                with self._lock:
+                    self._fetched += 1
+                return PriceResult(item_hash_name, price, None)
+            except (TooManyRequests, RequestException, ValueError) as error:
+                # a session with its own rate limiter already retried the 429, so it is not retried again here
+                if attempt >= self._retries or self._stop.is_set() \
+                        or (isinstance(error, TooManyRequests) and rate_limiter is None):
+                    with self._lock:
+                        self._failed += 1
+                    return PriceResult(item_hash_name, None, error)
+                with self._lock:
+                    self._retried += 1
+                # the rate limiter already waits after 429, other errors back off here
+                if not isinstance(error, TooManyRequests):
+                    self._stop.wait(self._retry_delay * 2 ** attempt)
+                attempt += 1
+
+    @property
+    def report(self) -> dict:
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        with self._lock:
+            fetched, failed, retried = self._fetched, self._failed, self._retried
+        return {'requested': len(self._items_hash_names),
+                'fetched': fetched,
+                'failed': failed,
+                'retries': retried,
+                'elapsed': elapsed,
+                'prices_per_minute': fetched / elapsed * 60 if elapsed else 0.0}
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/offer_watcher.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 13:10:26
+#
+# @DESCRIPTION: 增量轮询交易报价，只在报价有变化时产生事件
+
+
+import asyncio
+import enum
+import logging
+import time
+import threading
+from collections import OrderedDict, namedtuple
+from typing import AsyncIterator, Callable, Dict, List
+from steampy.models import TradeOfferState
+from steampy.utils import merge_items_with_descriptions_from_offers
+
+
+logger = logging.getLogger(__name__)
+
+
+"""
+@description: 交易报价事件类型
+-------
+@param:
+-------
+@return:
+"""
+class TradeOfferEventType(enum.Enum):
+    NEW = "new"
+    CHANGED = "changed"
+    ACCEPTED = "accepted"
+    CANCELLED = "cancelled"
+
+
+# offer 为报价内容，previous_state 为上一次轮询时的状态（新报价为 None）
+TradeOfferEvent = namedtuple('TradeOfferEvent', ['type', 'offer', 'previous_state'])
+
+
+# 报价不会再变化的状态
+FINAL_STATES = (TradeOfferState.Accepted,
+                TradeOfferState.Countered,
+                TradeOfferState.Expired,
+                TradeOfferState.Canceled,
+                TradeOfferState.Declined,
+                TradeOfferState.InvalidItems,
+                TradeOfferState.CanceledBySecondaryFactor,
+                TradeOfferState.Invalid)
+
+
+"""
+@description: 交易报价监视器，用 GetTradeOffersSummary 判断是否有变化，
+              有变化时只请求活跃的报价和 time_historical_cutoff 之后状态变化过的报价，
+              与本地保存的状态表对比后产生事件
+-------
+@param:
+-------
+@return:
+"""
+class TradeOfferWatcher:
+
+    # 最多记住的已删除报价数，超过时忘记最早删除的
+    MAX_PRUNED = 10000
+
+    """
+    @description: 初始化
+    -------
+    @param: client: SteamClient
+            interval: 轮询间隔秒数
+            use_summary: 是否先请求报价摘要，摘要没有变化时跳过报价列表的请求
+            full_refresh_every: 摘要没有变化时，每隔多少次轮询仍然请求一次报价列表
+            merge: 是否将报价中的物品与描述合并
+            max_backoff: 轮询连续出错时，重试间隔从 interval 开始翻倍，最多为这个秒数
+    -------
+    @return:
+    """
+    def __init__(self,
+                 client,
+                 interval: float = 60,
+                 get_sent_offers: bool = True,
+                 get_received_offers: bool = True,
+                 use_summary: bool = True,
+                 full_refresh_every: int = 10,
+                 merge: bool = True,
+                 max_backoff: float = 900) -> None:
+        self._client = client
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._get_sent_offers = get_sent_offers
+        self._get_received_offers = get_received_offers
+        self._use_summary = use_summary
+        self._full_refresh_every = full_refresh_every
+        self._merge = merge
+        # 报价 ID -> 状态
+        self._states = {}
+        # 报价 ID -> 最后更新时间
+        self._time_updated = {}
+        # 已经从状态表中删除的已结束报价，再次出现时忽略
+        self._pruned = OrderedDict()
+        self._callbacks = {event_type: [] for event_type in TradeOfferEventType}
+        self._time_historical_cutoff = None
+        self._last_summary = None
+        self._skipped_polls = 0
+        self._lock = threading.Lock()
+
+    """
+    @description: 当前还没有结束的报价的状态
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @property
+    def offer_states(self) -> Dict[str, TradeOfferState]:
+        return {offer_id: state for offer_id, state in self._states.items()
+                if state not in FINAL_STATES}
+
+    """
+    @description: 注册事件回调，回调参数为 TradeOfferEvent
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def on(self,
+           event_type: TradeOfferEventType,
+           callback: Callable[[TradeOfferEvent], None]) -> None:
+        self._callbacks[event_type].append(callback)
+
+    """
+    @description: 轮询一次，返回并分发这次轮询产生的事件，
+                  回调抛出的异常会被记录，该报价的事件在下一次轮询时重新产生
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def poll(self) -> List[TradeOfferEvent]:
+        with self._lock:
+            try:
+                if not self._has_changes():
+                    return []
+                response = self._fetch_offers()
+            except Exception:
+                # 摘要已经记录但报价列表没有取到，下一次不能因为摘要相同而跳过
+                self._last_summary = None
+                raise
+            events = self._update_states(response)
+        failed_events = [event for event in events if not self._dispatch(event)]
+        if failed_events:
+            with self._lock:
+                for event in failed_events:
+                    self._retry_later(event)
+        return events
+
+    """
+    @description: 阻塞地一直轮询，轮询出错时记录异常并在退避后重试
+    -------
+    @param: stop_event: 设置后停止轮询
+    -------
+    @return:
+    """
+    def run(self, stop_event: threading.Event = None) -> None:
+        stop_event = stop_event or threading.Event()
+        failures = 0
+        while not stop_event.is_set():
+            _, failures = self._poll_safely(failures)
+            stop_event.wait(self._delay(failures))
+
+    """
+    @description: 以异步迭代器的方式一直轮询，请求在线程池中执行，出错时同 run
+    -------
+    @param:
+    -------
+    @return: <AsyncIterator[TradeOfferEvent]>
+    """
+    async def events(self) -> AsyncIterator[TradeOfferEvent]:
+        loop = asyncio.get_running_loop()
+        failures = 0
+        while True:
+            events, failures = await loop.run_in_executor(None, self._poll_safely, failures)
+            for event in events:
+                yield event
+            await asyncio.sleep(self._delay(failures))
+
+    """
+    @description: 轮询一次，出错时记录异常
+    -------
+    @param: failures: 之前连续出错的次数
+    -------
+    @return: <tuple> 事件列表和新的连续出错次数
+    """
+    def _poll_safely(self, failures: int) -> tuple:
+        try:
+            return self.poll(), 0
+        except Exception:
+            logger.exception("Polling trade offers failed (%d in a row)", failures + 1)
+            return [], failures + 1
+
+    def _delay(self, failures: int) -> float:
+        if not failures:
+            return self.interval
+        return min(self.max_backoff, self.interval * 2 ** (failures - 1))
+
+    """
+    @description: 调用事件的所有回调，一个回调出错不影响其他回调和事件
+    -------
+    @param:
+    -------
+    @return: <bool> 所有回调是否都成功
+    """
+    def _dispatch(self, event: TradeOfferEvent) -> bool:
+        succeeded = True
+        for callback in self._callbacks[event.type]:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Trade offer %s callback failed for offer %s",
+                                 event.type.value, event.offer.get('tradeofferid'))
+                succeeded = False
+        return succeeded
+
+    """
+    @description: 恢复报价在事件之前的状态，并让下一次轮询请求报价列表，
+                  Steam 再次返回这个报价时会重新产生事件
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def _retry_later(self, event: TradeOfferEvent) -> None:
+        offer_id = event.offer['tradeofferid']
+        state = self._states.get(offer_id)
+        if state is not None and state != TradeOfferState(event.offer['trade_offer_state']):
+            # 回调执行期间报价已经有了新的状态
+            return
+        self._pruned.pop(offer_id, None)
+        if event.previous_state is None:
+            self._states.pop(offer_id, None)
+            self._time_updated.pop(offer_id, None)
+        else:
+            self._states[offer_id] = event.previous_state
+            self._time_updated.setdefault(offer_id, int(event.offer.get('time_updated', 0)))
+        self._last_summary = None
+
+    def _has_changes(self) -> bool:
+        if not self._use_summary:
+            return True
+        summary = self._client.get_trade_offers_summary().get('response')
+        # 摘要中的计数可能恰好抵消，所以隔一段时间仍然完整请求一次
+        if self._time_historical_cutoff is not None \
+                and summary == self._last_summary \
+                and self._skipped_polls + 1 < self._full_refresh_every:
+            self._skipped_polls += 1
+            return False
+        self._last_summary = summary
+        self._skipped_polls = 0
+        return True
+
+    def _fetch_offers(self) -> dict:
+        if self._time_historical_cutoff is None:
+            self._time_historical_cutoff = int(time.time())
+        params = {'key': self._client._api_key,
+                  'get_sent_offers': int(self._get_sent_offers),
+                  'get_received_offers': int(self._get_received_offers),
+                  'get_descriptions': int(self._merge),
+                  'language': 'english',
+                  'active_only': 1,
+                  'historical_only': 0,
+                  'time_historical_cutoff': self._time_historical_cutoff}
+        response = self._client.api_call('GET', 'IEconService', 'GetTradeOffers', 'v1', params).json()
+        response.setdefault('response', {})
+        if self._merge:
+            response = merge_items_with_descriptions_from_offers(response)
+        return response
+
+    def _update_states(self, response: dict) -> List[TradeOfferEvent]:
+        events = []
+        offers = response['response'].get('trade_offers_received', []) \
+            + response['response'].get('trade_offers_sent', [])
+        # 这次请求使用的截止时间
+        cutoff = self._time_historical_cutoff
+        for offer in offers:
+            offer_id = offer['tradeofferid']
+            if offer_id in self._pruned:
+                continue
+            state = TradeOfferState(offer['trade_offer_state'])
+            previous_state = self._states.get(offer_id)
+            time_updated = int(offer.get('time_updated', 0))
+            # 使用 Steam 服务器的时间作为下一次的截止时间，避免本地时钟误差
+            self._time_historical_cutoff = max(self._time_historical_cutoff, time_updated)
+            self._states[offer_id] = state
+            self._time_updated[offer_id] = time_updated
+            if state == previous_state:
+                continue
+            if state == TradeOfferState.Accepted:
+                # 从未见过且在截止时间之前就已接受的报价不需要通知
+                if previous_state is None and time_updated < cutoff:
+                    continue
+                event_type = TradeOfferEventType.ACCEPTED
+            elif state in FINAL_STATES:
+                # 从未见过的已结束报价不需要通知
+                if previous_state is None:
+                    continue
+                event_type = TradeOfferEventType.CANCELLED
+            elif previous_state is None:
+                event_type = TradeOfferEventType.NEW
+            else:
+                event_type = TradeOfferEventType.CHANGED
+            events.append(TradeOfferEvent(event_type, offer, previous_state))
+        # 已结束且早于截止时间的报价不会再被返回，从状态表中删除
+        for offer_id in [offer_id for offer_id, state in self._states.items()
+                         if state in FINAL_STATES
+                         and self._time_updated[offer_id] < self._time_historical_cutoff]:
+            del self._states[offer_id]
+            del self._time_updated[offer_id]
+            self._pruned[offer_id] = None
+        while len(self._pruned) > self.MAX_PRUNED:
+            self._pruned.popitem(last=False)
+        return events
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/pool.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 15:20:44
+#
+# @DESCRIPTION: 多账号管理，所有账号共享连接池和限流器，并在线程池中调度各账号的任务
+
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator
+from requests.adapters import HTTPAdapter
+from steampy.client import SteamClient
+from steampy.rate_limit import RateLimiter
+
+
+"""
+@description: 一个账号排队中的任务，running 为 True 时已经有一个线程在执行这个账号的任务
+-------
+@param:
+-------
+@return:
+"""
+class _AccountQueue:
+
+    __slots__ = ('client', 'tasks', 'running')
+
+    def __init__(self, client: SteamClient) -> None:
+        self.client = client
+        # (future, func, args, kwargs)
+        self.tasks = deque()
+        self.running = False
+
+
+"""
+@description: 账号池，所有账号的会话挂载同一个 HTTPAdapter，
+              连接在账号之间复用，整个进程的连接数不会超过 pool_connections * pool_maxsize
+-------
+@param:
+-------
+@return:
+"""
+class SteamClientPool:
+
+    """
+    @description: 初始化
+    -------
+    @param: rate_limiter: 所有账号共享的限流器，为 None 时不限流
+            pool_connections: 缓存连接池的主机数
+            pool_maxsize: 每个主机的最大连接数
+            pool_block: 连接用完时是否等待空闲连接，为 False 时会临时新建连接
+            max_workers: 执行账号任务的线程数
+            http_adapter: 代替默认连接池的 HTTPAdapter，设置后忽略 pool_connections、pool_maxsize 和 pool_block
+            client_kwargs: 其他传给每个 SteamClient 的参数，例如 market_cache
+    -------
+    @return:
+    """
+    def __init__(self,
+                 rate_limiter: RateLimiter = None,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 32,
+                 pool_block: bool = True,
+                 max_workers: int = 16,
+                 http_adapter: HTTPAdapter = None,
+                 **client_kwargs) -> None:
+        self.rate_limiter = rate_limiter
+        if http_adapter is None:
+            http_adapter = HTTPAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       pool_block=pool_block)
+        self.http_adapter = http_adapter
+        self._client_kwargs = client_kwargs
+        self._clients = {}
+        # 同一个账号的任务排队依次执行，同一时间每个账号最多占用一个线程，不同账号的任务并发执行
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._clients
+
+    def __iter__(self) -> Iterator[SteamClient]:
+        return iter(list(self._clients.values()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    """
+    @description: 添加账号，返回共享连接池和限流器的 SteamClient
+    -------
+    @param: kwargs: 覆盖初始化时 client_kwargs 的参数
+    -------
+    @return:
+    """
+    def add_client(self,
+                   api_key: str,
+                   username: str,
+                   password: str = None,
+                   steam_guard: str = None,
+                   **kwargs) -> SteamClient:
+        client_kwargs = dict(self._client_kwargs)
+        client_kwargs.update(kwargs)
+        client = SteamClient(api_key, username, password, steam_guard,
+                             rate_limiter=self.rate_limiter,
+                             http_adapter=self.http_adapter,
+                             **client_kwargs)
+        with self._lock:
+            if username in self._clients:
+                raise ValueError('Client already added: %s' % username)
+            self._clients[username] = client
+            self._queues[username] = _AccountQueue(client)
+        return client
+
+    def get_client(self, username: str) -> SteamClient:
+        return self._clients[username]
+
+    def remove_client(self, username: str) -> SteamClient:
+        with self._lock:
+            self._queues.pop(username)
+            return self._clients.pop(username)
+
+    """
+    @description: 在线程池中执行 func(client, *args, **kwargs)，同一个账号的任务按提交顺序依次执行，
+                  在任务中可以继续提交同一个账号的任务，但不能等待它完成
+    -------
+    @param:
+    -------
+    @return: <Future> 线程池已经关闭时为带有 RuntimeError 的 Future
+    """
+    def submit(self, username: str, func: Callable[..., Any], *args, **kwargs) -> Future:
+        account_queue = self._queues[username]
+        future = Future()
+        with self._lock:
+            account_queue.tasks.append((future, func, args, kwargs))
+            if account_queue.running:
+                return future
+            account_queue.running = True
+        try:
+            self._executor.submit(self._run_next, account_queue)
+        except RuntimeError as e:
+            # 线程池已经关闭，队列中的任务都不会再执行
+            with self._lock:
+                tasks = list(account_queue.tasks)
+                account_queue.tasks.clear()
+                account_queue.running = False
+            for task_future, _, _, _ in tasks:
+                if task_future.set_running_or_notify_cancel():
+                    task_future.set_exception(e)
+        return future
+
+    """
+    @description: 执行账号队列中的下一个任务，之后如果还有任务，重新排到线程池队列的末尾，
+                  这样一个账号的大量任务不会让其他账号一直等待
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def _run_next(self, account_queue: _AccountQueue) -> None:
+        while True:
+            with self._lock:
+                future, func, args, kwargs = account_queue.tasks.popleft()
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = func(account_queue.client, *args, **kwargs)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self._lock:
+                if not account_queue.tasks:
+                    account_queue.running = False
+                    return
+            try:
+                self._executor.submit(self._run_next, account_queue)
+                return
+            except RuntimeError:
+                # 线程池正在关闭，不能再提交，在当前线程中继续执行
+                continue
+
+    """
+    @description: 对多个账号并发执行 func(client)，并等待全部完成
+    -------
+    @param: usernames: 为 None 时对所有账号执行
+    -------
+    @return: <dict> 账号 -> 返回值，出错的账号对应抛出的异常
+    """
+    def map(self,
+            func: Callable[[SteamClient], Any],
+            usernames: Iterable[str] = None) -> Dict[str, Any]:
+        usernames = list(self._clients) if usernames is None else list(usernames)
+        futures = {username: self.submit(username, func) for username in usernames}
+        results = {}
+        for username, future in futures.items():
+            try:
+                results[username] = future.result()
+            except Exception as e:
+                results[username] = e
+        return results
+
+    """
+    @description: 登录所有还没有登录的账号
+    -------
+    @param:
+    -------
+    @return: <dict> 账号 -> None，登录失败的账号对应抛出的异常
+    """
+    def login_all(self) -> Dict[str, Any]:
+        def login(client: SteamClient) -> None:
+            if not client.was_login_executed:
+                client.login(client.username, client._password, client.steam_guard)
+
+        return self.map(login)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.http_adapter.close()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/price_history.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 16:22:09
+#
+# @DESCRIPTION: 基于 NumPy 数组的历史价格分析，需要安装 numpy（pip install steampy[analytics]）
+
+
+from typing import Dict, Iterable, Mapping, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 历史价格中的月份缩写
+MONTHS = {'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+          'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'}
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+"""
+@description: 把 "Jul 02 2014 01: +0" 格式的日期转换为 UTC 秒级时间戳数组
+-------
+@param:
+-------
+@return:
+"""
+def parse_dates(dates: Iterable[str]) -> 'np.ndarray':
+    _require_numpy()
+    # 不同物品的日期大多相同，每个不同的日期只转换一次
+    codes = {}
+    indexes = np.fromiter((codes.setdefault(date, len(codes)) for date in dates), dtype=np.int64)
+    iso_dates = ['%s-%s-%sT%s' % (date[7:11], MONTHS[date[:3]], date[4:6], date[12:14]) for date in codes]
+    timestamps = np.array(iso_dates, dtype='datetime64[h]').astype('datetime64[s]').astype(np.int64)
+    return timestamps[indexes]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError('numpy is required to use price history analytics, '
+                          'install it with: pip install steampy[analytics]')
+
+
+"""
+@description: 一个物品的历史价格，timestamps 为 UTC 秒级时间戳，prices 为价格，volumes 为成交量，
+              三个数组按时间顺序一一对应
+-------
+@param:
+-------
+@return:
+"""
+class PriceHistory:
+
+    def __init__(self,
+                 timestamps: 'np.ndarray',
+                 prices: 'np.ndarray',
+                 volumes: 'np.ndarray',
+                 market_hash_name: str = None) -> None:
+        _require_numpy()
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.int64)
+        self.market_hash_name = market_hash_name
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __repr__(self) -> str:
+        return 'PriceHistory(%s, %d points)' % (self.market_hash_name, len(self))
+
+    """
+    @description: 从 fetch_price_history 的返回值创建
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @classmethod
+    def from_response(cls, response: dict, market_hash_name: str = None) -> 'PriceHistory':
+        prices = response.get('prices') or []
+        return cls(parse_dates([price[0] for price in prices]),
+                   [price[1] for price in prices],
+                   [price[2] for price in prices],
+                   market_hash_name)
+
+    """
+    @description: 批量创建，所有物品的日期一次性转换
+    -------
+    @param: responses: market_hash_name -> fetch_price_history 的返回值
+    -------
+    @return: <dict> market_hash_name -> PriceHistory
+    """
+    @classmethod
+    def from_responses(cls, responses: Mapping[str, dict]) -> Dict[str, 'PriceHistory']:
+        _require_numpy()
+        names = list(responses)
+        price_lists = [responses[name].get('prices') or [] for name in names]
+        rows = [price for prices in price_lists for price in prices]
+        timestamps = parse_dates([row[0] for row in rows])
+        prices = np.array([row[1] for row in rows], dtype=np.float64)
+        volumes = np.array([row[2] for row in rows], dtype=np.int64)
+        offsets = np.cumsum([0] + [len(prices_list) for prices_list in price_lists])
+        return {name: cls(timestamps[start:end], prices[start:end], volumes[start:end], name)
+                for name, start, end in zip(names, offsets[:-1], offsets[1:])}
+
+    @property
+    def dates(self) -> 'np.ndarray':
+        return self.timestamps.astype('datetime64[s]')
+
+    """
+    @description: 截取 [start, end) 时间范围内的记录
+    -------
+    @param: start, end: 秒级时间戳，为 None 时不限制
+    -------
+    @return:
+    """
+    def between(self, start: float = None, end: float = None) -> 'PriceHistory':
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.timestamps >= start
+        if end is not None:
+            mask &= self.timestamps < end
+        return PriceHistory(self.timestamps[mask], self.prices[mask], self.volumes[mask], self.market_hash_name)
+
+    """
+    @description: 按固定时间间隔重新采样，价格为区间内的成交量加权均价，成交量为区间内的总和
+    -------
+    @param: period: 区间秒数，例如 DAY
+    -------
+    @return:
+    """
+    def resample(self, period: int = DAY) -> 'PriceHistory':
+        if not len(self):
+            return PriceHistory([], [], [], self.market_hash_name)
+        buckets, inverse = np.unique(self.timestamps // period, return_inverse=True)
+        volumes = np.bincount(inverse, weights=self.volumes)
+        turnover = np.bincount(inverse, weights=self.prices * self.volumes)
+        # 成交量为 0 的区间使用价格的算术平均
+        counts = np.bincount(inverse)
+        mean_prices = np.bincount(inverse, weights=self.prices) / counts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            prices = np.where(volumes > 0, turnover / volumes, mean_prices)
+        return PriceHistory(buckets * period, prices, volumes.astype(np.int64), self.market_hash_name)
+
+    """
+    @description: 成交量加权均价
+    -------
+    @param: start, end: 秒级时间戳，为 None 时不限制
+    -------
+    @return:
+    """
+    def vwap(self, start: float = None, end: float = None) -> Optional[float]:
+        history = self.between(start, end) if start is not None or end is not None else self
+        total_volume = history.volumes.sum()
+        if not total_volume:
+            return None
+        return float(np.dot(history.prices, history.volumes) / total_volume)
+
+    """
+    @description: 滚动中位数，结果的第 i 个值为 prices[i - window + 1 : i + 1] 的中位数，前 window - 1 个值为 nan
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def rolling_median(self, window: int) -> 'np.ndarray':
+        result = np.full(len(self), np.nan)
+        if window <= len(self):
+            windows = np.lib.stride_tricks.sliding_window_view(self.prices, window)
+            result[window - 1:] = np.median(windows, axis=1)
+        return result
+
+    """
+    @description: 对数收益率的标准差
+    -------
+    @param: period: 先按这个间隔重新采样，为 None 时直接使用原始记录
+    -------
+    @return:
+    """
+    def volatility(self, period: int = None) -> Optional[float]:
+        history = self.resample(period) if period else self
+        prices = history.prices[history.prices > 0]
+        if len(prices) < 3:
+            return None
+        return float(np.std(np.diff(np.log(prices)), ddof=1))
+
+    """
+    @description: 成交量加权的价格分位数
+    -------
+    @param: q: 0 到 100 之间的分位数或分位数数组
+    -------
+    @return:
+    """
+    def percentile(self, q: Union[float, Iterable[float]]) -> Union[float, 'np.ndarray', None]:
+        total_volume = self.volumes.sum()
+        if not total_volume:
+            return None
+        order = np.argsort(self.prices, kind='stable')
+        cumulative_volumes = np.cumsum(self.volumes[order])
+        targets = np.asarray(q, dtype=np.float64) / 100 * total_volume
+        indexes = np.searchsorted(cumulative_volumes, targets, side='left')
+        result = self.prices[order][np.minimum(indexes, len(order) - 1)]
+        return float(result) if np.ndim(result) == 0 else result
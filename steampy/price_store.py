@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/price_store.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 16:58:40
+#
+# @DESCRIPTION: 按列保存市场价格的本地存储，每个物品一个定长记录文件，读取时内存映射不复制数据，
+#               需要安装 numpy（pip install steampy[analytics]）
+
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from steampy.models import GameOptions
+from steampy.price_history import PriceHistory, _require_numpy, np
+
+
+# 价格中的数字和分隔符，例如 "$1,234.56"、"1.234,56€"、"1 234,56 pуб."、"CHF 1'234.50"
+_PRICE_PATTERN = re.compile(r"\d[\d.,' \u00a0]*")
+
+
+if np is not None:
+    # fetch_price_history 的记录
+    HISTORY_DTYPE = np.dtype([('timestamp', '<i8'), ('price', '<f8'), ('volume', '<i8')])
+    # fetch_price 的记录，没有的价格为 nan，没有的成交量为 -1
+    PRICE_DTYPE = np.dtype([('timestamp', '<i8'), ('lowest_price', '<f8'), ('median_price', '<f8'), ('volume', '<i8')])
+
+
+"""
+@description: 价格存储，目录中的 index.json 记录物品到文件编号的映射，
+              <编号>.history 和 <编号>.prices 为按时间追加的定长记录
+-------
+@param:
+-------
+@return:
+"""
+class PriceStore:
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, directory: str) -> None:
+        _require_numpy()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = {}
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        if os.path.isfile(index_path):
+            with open(index_path, 'r') as f:
+                self._index = {tuple(key.split('/', 1)): file_id for key, file_id in json.load(f).items()}
+
+    @staticmethod
+    def _key(game: GameOptions, market_hash_name: str) -> Tuple[str, str]:
+        return game.app_id, market_hash_name
+
+    def __contains__(self, key: Tuple[GameOptions, str]) -> bool:
+        return self._key(*key) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    """
+    @description: 已保存的物品
+    -------
+    @param:
+    -------
+    @return: <list> (app_id, market_hash_name)
+    """
+    def items(self) -> List[Tuple[str, str]]:
+        return list(self._index)
+
+    def _save_index(self) -> None:
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump({'/'.join(key): file_id for key, file_id in self._index.items()}, f)
+        os.replace(index_path + '.tmp', index_path)
+
+    def _path(self, game: GameOptions, market_hash_name: str, suffix: str, create: bool = False) -> Optional[str]:
+        key = self._key(game, market_hash_name)
+        file_id = self._index.get(key)
+        if file_id is None:
+            if not create:
+                return None
+            file_id = len(self._index)
+            self._index[key] = file_id
+            self._save_index()
+        return os.path.join(self.directory, '%d.%s' % (file_id, suffix))
+
+    @staticmethod
+    def _load(path: Optional[str], dtype: 'np.dtype') -> 'np.ndarray':
+        if path is None or not os.path.isfile(path):
+            return np.zeros(0, dtype=dtype)
+        # 进程中途退出时文件末尾可能有不完整的记录，忽略它
+        count = os.path.getsize(path) // dtype.itemsize
+        if not count:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+    @staticmethod
+    def _append(path: str, records: 'np.ndarray') -> None:
+        with open(path, 'ab') as f:
+            # 截掉不完整的记录后再追加
+            size = f.seek(0, os.SEEK_END)
+            if size % records.dtype.itemsize:
+                f.truncate(size - size % records.dtype.itemsize)
+            f.write(records.tobytes())
+
+    """
+    @description: 追加历史价格，只写入比已保存的最后一条记录更新的记录
+    -------
+    @param: history: fetch_price_history 的返回值或 PriceHistory
+    -------
+    @return: <int> 新写入的记录数
+    """
+    def append_history(self,
+                       game: GameOptions,
+                       market_hash_name: str,
+                       history: Union[dict, PriceHistory]) -> int:
+        if isinstance(history, dict):
+            history = PriceHistory.from_response(history, market_hash_name)
+        with self._lock:
+            last_timestamp = self.last_history_timestamp(game, market_hash_name)
+            mask = history.timestamps > last_timestamp if last_timestamp is not None else slice(None)
+            records = np.zeros(len(history.timestamps[mask]), dtype=HISTORY_DTYPE)
+            if not len(records):
+                return 0
+            records['timestamp'] = history.timestamps[mask]
+            records['price'] = history.prices[mask]
+            records['volume'] = history.volumes[mask]
+            self._append(self._path(game, market_hash_name, 'history', create=True), records)
+            return len(records)
+
+    """
+    @description: 追加一次 fetch_price 的结果
+    -------
+    @param: timestamp: 获取价格的时间，为 None 时使用当前时间
+    -------
+    @return:
+    """
+    def append_price(self,
+                     game: GameOptions,
+                     market_hash_name: str,
+                     price: dict,
+                     timestamp: float = None) -> None:
+        record = np.zeros(1, dtype=PRICE_DTYPE)
+        record['timestamp'] = int(time.time() if timestamp is None else timestamp)
+        record['lowest_price'] = self._parse_price(price.get('lowest_price'))
+        record['median_price'] = self._parse_price(price.get('median_price'))
+        record['volume'] = int(price['volume'].replace(',', '')) if price.get('volume') else -1
+        with self._lock:
+            self._append(self._path(game, market_hash_name, 'prices', create=True), record)
+
+    """
+    @description: 解析各货币格式的价格，最后一个分隔符后只有一到两位数字时是小数点，其他分隔符都是千位分隔符
+    -------
+    @param:
+    -------
+    @return: <float> 无法解析时为 nan
+    """
+    @staticmethod
+    def _parse_price(price: Optional[str]) -> float:
+        match = _PRICE_PATTERN.search(price or '')
+        if match is None:
+            return float('nan')
+        number = match.group().strip(" '\u00a0")
+        separator_index = max(number.rfind('.'), number.rfind(','))
+        fraction_part = number[separator_index + 1:]
+        if separator_index >= 0 and 0 < len(fraction_part) <= 2 and fraction_part.isdigit():
+            integer_part = number[:separator_index]
+        else:
+            # 没有小数部分，例如 "¥ 1,234" 或 "1,--€"
+            integer_part, fraction_part = number, ''
+        integer_part = re.sub(r'\D', '', integer_part)
+        return float('%s.%s' % (integer_part or '0', fraction_part or '0'))
+
+    def last_history_timestamp(self, game: GameOptions, market_hash_name: str) -> Optional[int]:
+        records = self._load(self._path(game, market_hash_name, 'history'), HISTORY_DTYPE)
+        return int(records['timestamp'][-1]) if len(records) else None
+
+    """
+    @description: 读取历史价格，返回的数组直接映射文件，不复制数据
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def load_history(self, game: GameOptions, market_hash_name: str) -> PriceHistory:
+        records = self._load(self._path(game, market_hash_name, 'history'), HISTORY_DTYPE)
+        return PriceHistory(records['timestamp'], records['price'], records['volume'], market_hash_name)
+
+    """
+    @description: 读取多个物品的历史价格
+    -------
+    @param: market_hash_names: 为 None 时读取这个游戏的所有物品
+    -------
+    @return: <dict> market_hash_name -> PriceHistory
+    """
+    def load_histories(self,
+                       game: GameOptions,
+                       market_hash_names: Iterable[str] = None) -> Dict[str, PriceHistory]:
+        if market_hash_names is None:
+            market_hash_names = [name for app_id, name in self._index if app_id == game.app_id]
+        return {name: self.load_history(game, name) for name in market_hash_names}
+
+    """
+    @description: 读取 fetch_price 的记录，返回 PRICE_DTYPE 结构的数组
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def load_prices(self, game: GameOptions, market_hash_name: str) -> 'np.ndarray':
+        return self._load(self._path(game, market_hash_name, 'prices'), PRICE_DTYPE)
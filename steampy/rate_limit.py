@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/rate_limit.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 11:02:15
+#
+# @DESCRIPTION: 按接口类别限制请求频率的令牌桶限流器
+
+
+import asyncio
+import email.utils
+import threading
+import time
+import urllib.parse as urlparse
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, Optional
+from steampy.models import SteamUrl
+
+
+# 每 period 秒最多 requests 次请求，burst 为允许的突发请求数（默认等于 requests）
+RateLimit = namedtuple('RateLimit', ['requests', 'period', 'burst'])
+RateLimit.__new__.__defaults__ = (None,)
+
+
+"""
+@description: 令牌桶，令牌不足时预约后面的令牌并返回需要等待的时间，
+              这样等待中的请求会按先来后到的顺序依次发出
+-------
+@param:
+-------
+@return:
+"""
+class TokenBucket:
+
+    def __init__(self, limit: RateLimit) -> None:
+        self.rate = limit.requests / limit.period
+        self.capacity = limit.burst or limit.requests
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        # 被 429 限制时，在这个时间之前不发出任何请求
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    """
+    @description: 取走一个令牌
+    -------
+    @param:
+    -------
+    @return: <float> 发出请求前需要等待的秒数
+    """
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    """
+    @description: 不取走令牌，只计算下一个令牌可用前需要等待的秒数
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def delay(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            return wait
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until,
+                                      time.monotonic() + seconds)
+
+
+"""
+@description: 按接口类别（社区市场、Web API、交易确认、库存）限流，
+              同一个限流器可以被多个会话共享（例如同一个 IP 下的多个账号）
+-------
+@param:
+-------
+@return:
+"""
+class RateLimiter:
+
+    # 接口类别
+    MARKET_PRICE = 'market_price'
+    MARKET = 'market'
+    WEB_API = 'web_api'
+    MOBILECONF = 'mobileconf'
+    INVENTORY = 'inventory'
+
+    DEFAULT_LIMITS = {
+        MARKET_PRICE: RateLimit(20, 60),
+        MARKET: RateLimit(60, 60),
+        WEB_API: RateLimit(100000, 86400, 50),
+        MOBILECONF: RateLimit(60, 60, 10),
+        INVENTORY: RateLimit(30, 60, 10),
+    }
+
+    """
+    @description: 初始化
+    -------
+    @param: limits: 覆盖默认值的各类别限制，值为 None 时该类别不限流
+            backoff_base: 没有 Retry-After 时的第一次退避秒数，连续 429 时翻倍
+            backoff_max: 退避秒数上限
+    -------
+    @return:
+    """
+    def __init__(self,
+                 limits: Dict[str, Optional[RateLimit]] = None,
+                 backoff_base: float = 10.0,
+                 backoff_max: float = 300.0) -> None:
+        merged_limits = dict(self.DEFAULT_LIMITS)
+        merged_limits.update(limits or {})
+        self._buckets = {family: TokenBucket(limit)
+                         for family, limit in merged_limits.items()
+                         if limit is not None}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._stats = {family: self._empty_stats() for family in self._buckets}
+        self._consecutive_429 = {family: 0 for family in self._buckets}
+        # 每个线程已经在事件循环中取走令牌的类别，见 prepaid
+        self._local = threading.local()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {'requests': 0,
+                'throttled': 0,
+                'wait_time': 0.0,
+                'queue_depth': 0,
+                'max_queue_depth': 0,
+                'too_many_requests': 0}
+
+    """
+    @description: 根据 URL 判断接口类别，不需要限流时返回 None
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def classify(self, url: str) -> Optional[str]:
+        parsed_url = urlparse.urlparse(url)
+        if parsed_url.netloc == urlparse.urlparse(SteamUrl.API_URL).netloc:
+            family = self.WEB_API
+        elif parsed_url.path.startswith(('/market/priceoverview', '/market/pricehistory')):
+            family = self.MARKET_PRICE
+        elif parsed_url.path.startswith('/market'):
+            family = self.MARKET
+        elif parsed_url.path.startswith('/mobileconf'):
+            family = self.MOBILECONF
+        elif parsed_url.path.startswith('/inventory/'):
+            family = self.INVENTORY
+        else:
+            return None
+        return family if family in self._buckets else None
+
+    """
+    @description: 阻塞直到可以发出请求
+    -------
+    @param:
+    -------
+    @return: <float> 实际等待的秒数
+    """
+    def acquire(self, url: str) -> float:
+        family = self.classify(url)
+        if family is None:
+            return 0.0
+        if getattr(self._local, 'prepaid', None) == family:
+            # 令牌已经由 acquire_async 取走，只抵扣一次请求
+            self._local.prepaid = None
+            return 0.0
+        wait = self._reserve(family)
+        if wait <= 0:
+            return 0.0
+        try:
+            time.sleep(wait)
+        finally:
+            self._finish_wait(family)
+        return wait
+
+    """
+    @description: 在事件循环中取走一个令牌并等待，不会占用线程，
+                  之后在 prepaid 上下文中发出的同类别请求不会再取令牌
+    -------
+    @param:
+    -------
+    @return: <float> 实际等待的秒数
+    """
+    async def acquire_async(self, url: str) -> float:
+        family = self.classify(url)
+        if family is None:
+            return 0.0
+        wait = self._reserve(family)
+        if wait <= 0:
+            return 0.0
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            self._finish_wait(family)
+        return wait
+
+    """
+    @description: 当前线程在上下文中对 url 类别的第一次 acquire 直接通过，
+                  用于发出已经通过 acquire_async 取得令牌的请求，429 后的重试仍然正常取令牌
+    -------
+    @param:
+    -------
+    @return: <上下文管理器>
+    """
+    @contextmanager
+    def prepaid(self, url: str):
+        self._local.prepaid = self.classify(url)
+        try:
+            yield
+        finally:
+            self._local.prepaid = None
+
+    def _reserve(self, family: str) -> float:
+        wait = self._buckets[family].reserve()
+        stats = self._stats[family]
+        with self._lock:
+            stats['requests'] += 1
+            if wait <= 0:
+                return 0.0
+            stats['throttled'] += 1
+            stats['wait_time'] += wait
+            stats['queue_depth'] += 1
+            stats['max_queue_depth'] = max(stats['max_queue_depth'],
+                                           stats['queue_depth'])
+        return wait
+
+    def _finish_wait(self, family: str) -> None:
+        with self._lock:
+            self._stats[family]['queue_depth'] -= 1
+
+    """
+    @description: 收到 429 后暂停该类别的所有请求
+    -------
+    @param: retry_after: 服务器返回的 Retry-After 秒数，没有时按指数退避
+    -------
+    @return: <float> 暂停的秒数
+    """
+    def backoff(self, url: str, retry_after: float = None) -> float:
+        family = self.classify(url)
+        if family is None:
+            return 0.0
+        with self._lock:
+            self._stats[family]['too_many_requests'] += 1
+            attempt = self._consecutive_429[family]
+            self._consecutive_429[family] = attempt + 1
+        if retry_after is None:
+            retry_after = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        self._buckets[family].block_for(retry_after)
+        return retry_after
+
+    def record_success(self, url: str) -> None:
+        family = self.classify(url)
+        if family is not None and self._consecutive_429[family]:
+            with self._lock:
+                self._consecutive_429[family] = 0
+
+    """
+    @description: 各类别的统计数据（请求数、被限流次数、总等待秒数、当前和最大排队数、429 次数）
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def metrics(self) -> Dict[str, dict]:
+        with self._lock:
+            return {family: dict(stats) for family, stats in self._stats.items()}
+
+
+"""
+@description: 解析 Retry-After 响应头（秒数或 HTTP 日期）
+-------
+@param:
+-------
+@return:
+"""
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date is None:
+        return None
+    return max(0.0, retry_date.timestamp() - time.time())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/session.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 11:20:47
+#
+# @DESCRIPTION: SteamClient、SteamMarket、SteamChat 和交易确认器共用的会话 Session
+
+
+from contextlib import nullcontext
+from typing import Iterable
+import requests
+from requests.adapters import HTTPAdapter
+from steampy.instrumentation import ParseTimer, RequestEvent, RequestHook, endpoint_name
+from steampy.rate_limit import RateLimiter, parse_retry_after
+
+
+# 没有钩子时 parsing 返回的空上下文
+_NULL_CONTEXT = nullcontext()
+
+
+"""
+@description: Steam 会话类，所有请求都经过 send 方法，在这里统一限流和调用埋点钩子
+-------
+@param:
+-------
+@return:
+"""
+class SteamSession(requests.Session):
+
+    # 收到 429 后会自动重试的请求方法，POST 等请求重试可能会重复执行操作
+    RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    """
+    @description: 初始化
+    -------
+    @param: rate_limiter: 限流器，为 None 时不限流
+            max_retries: GET 请求收到 429 后最多自动重试的次数
+            http_adapter: 代替默认连接池的 HTTPAdapter，可以被多个会话共享
+            request_hooks: 埋点钩子（RequestHook），为空时不统计
+    -------
+    @return:
+    """
+    def __init__(self,
+                 rate_limiter: RateLimiter = None,
+                 max_retries: int = 2,
+                 http_adapter: HTTPAdapter = None,
+                 request_hooks: Iterable[RequestHook] = None) -> None:
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        # 添加或删除时替换整个元组，发请求的线程不需要加锁
+        self.request_hooks = tuple(request_hooks or ())
+        if http_adapter is not None:
+            self.mount('https://', http_adapter)
+            self.mount('http://', http_adapter)
+
+    def add_request_hook(self, hook: RequestHook) -> None:
+        self.request_hooks = self.request_hooks + (hook,)
+
+    def remove_request_hook(self, hook: RequestHook) -> None:
+        self.request_hooks = tuple(h for h in self.request_hooks if h is not hook)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        hooks = self.request_hooks
+        if not hooks:
+            return self._send(request, None, **kwargs)
+        event = RequestEvent(request)
+        try:
+            response = self._send(request, event, **kwargs)
+        except Exception as e:
+            event.finish(None, e)
+            self._emit(hooks, event)
+            raise
+        event.finish(response)
+        self._emit(hooks, event)
+        # 统计 response.json() 的解析耗时
+        response.json = _TimedJson(response.json, hooks, event.endpoint)
+        return response
+
+    def _send(self, request: requests.PreparedRequest, event: RequestEvent = None, **kwargs) -> requests.Response:
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None:
+            return super().send(request, **kwargs)
+        retries = 0
+        while True:
+            wait_time = rate_limiter.acquire(request.url)
+            if event is not None:
+                event.wait_time += wait_time
+                event.retries = retries
+            response = super().send(request, **kwargs)
+            if response.status_code != 429:
+                rate_limiter.record_success(request.url)
+                return response
+            rate_limiter.backoff(request.url,
+                                 parse_retry_after(response.headers.get('Retry-After')))
+            if request.method not in self.RETRY_METHODS or retries >= self.max_retries:
+                return response
+            response.close()
+            retries += 1
+
+    """
+    @description: 调用所有钩子，钩子抛出的异常不影响请求
+    -------
+    @param:
+    -------
+    @return:
+    """
+    @staticmethod
+    def _emit(hooks: tuple, event: RequestEvent) -> None:
+        for hook in hooks:
+            try:
+                hook.on_request(event)
+            except Exception:
+                pass
+
+    """
+    @description: 统计一段解析代码的耗时，用于 HTML 等不经过 response.json() 的响应，没有钩子时几乎没有开销
+    -------
+    @param: url: 响应对应的请求地址
+    -------
+    @return: <上下文管理器>
+    """
+    def parsing(self, url: str):
+        hooks = self.request_hooks
+        if not hooks:
+            return _NULL_CONTEXT
+        return ParseTimer(hooks, endpoint_name(url))
+
+
+"""
+@description: 统计一段解析代码的耗时，session 不是 SteamSession（例如外部传入的 requests.Session）时不统计
+-------
+@param:
+-------
+@return: <上下文管理器>
+"""
+def parsing(session: requests.Session, url: str):
+    if isinstance(session, SteamSession):
+        return session.parsing(url)
+    return _NULL_CONTEXT
+
+
+class _TimedJson:
+
+    __slots__ = ('_json', '_hooks', '_endpoint')
+
+    def __init__(self, json_method, hooks: tuple, endpoint: str) -> None:
+        self._json = json_method
+        self._hooks = hooks
+        self._endpoint = endpoint
+
+    def __call__(self, **kwargs):
+        with ParseTimer(self._hooks, self._endpoint):
+            return self._json(**kwargs)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/session_store.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 14:41:18
+#
+# @DESCRIPTION: 保存登录后的 Cookie，程序重启后恢复会话而不需要重新登录
+
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from requests.cookies import RequestsCookieJar, create_cookie
+
+
+"""
+@description: 会话存储接口，自定义存储（例如 Redis）实现 load、save 和 delete 即可，
+              保存的内容包含登录 Cookie，需要和密码一样妥善保管
+-------
+@param:
+-------
+@return:
+"""
+class SessionStore(ABC):
+
+    """
+    @description: 读取账号保存的会话，没有时返回 None
+    -------
+    @param:
+    -------
+    @return: <dict> {'cookies': [...], 'saved_at': 时间戳}
+    """
+    @abstractmethod
+    def load(self, username: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def save(self, username: str, state: dict) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, username: str) -> None:
+        pass
+
+
+"""
+@description: 文件会话存储，每个账号一个 JSON 文件，文件权限为只有当前用户可读写
+-------
+@param:
+-------
+@return:
+"""
+class FileSessionStore(SessionStore):
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, username: str) -> str:
+        return os.path.join(self.directory, '%s.json' % username)
+
+    def load(self, username: str) -> Optional[dict]:
+        try:
+            with open(self._path(username), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, username: str, state: dict) -> None:
+        path = self._path(username)
+        temp_path = path + '.tmp'
+        file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, 'w') as f:
+            json.dump(state, f)
+        # 先写临时文件再替换，进程中途退出时不会留下不完整的文件
+        os.replace(temp_path, path)
+
+    def delete(self, username: str) -> None:
+        try:
+            os.remove(self._path(username))
+        except FileNotFoundError:
+            pass
+
+
+"""
+@description: SQLite 会话存储，多个进程可以共享同一个数据库文件
+-------
+@param:
+-------
+@return:
+"""
+class SQLiteSessionStore(SessionStore):
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS sessions ('
+                                 'username TEXT PRIMARY KEY, state TEXT, saved_at REAL)')
+
+    def load(self, username: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute('SELECT state FROM sessions WHERE username = ?',
+                                           (username,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def save(self, username: str, state: dict) -> None:
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)',
+                                     (username, json.dumps(state), state.get('saved_at', time.time())))
+
+    def delete(self, username: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM sessions WHERE username = ?', (username,))
+
+
+"""
+@description: 把 Cookie 转换为可以 JSON 序列化的列表
+-------
+@param:
+-------
+@return:
+"""
+def dump_cookies(cookie_jar: RequestsCookieJar) -> List[dict]:
+    return [{'name': cookie.name,
+             'value': cookie.value,
+             'domain': cookie.domain,
+             'path': cookie.path,
+             'secure': cookie.secure,
+             'expires': cookie.expires,
+             'rest': cookie._rest}
+            for cookie in cookie_jar]
+
+
+"""
+@description: 把 dump_cookies 保存的 Cookie 放回 Cookie Jar，已经过期的 Cookie 会被跳过
+-------
+@param:
+-------
+@return:
+"""
+def load_cookies(cookie_jar: RequestsCookieJar, cookies: List[dict]) -> None:
+    now = time.time()
+    for cookie in cookies:
+        if cookie.get('expires') is not None and cookie['expires'] <= now:
+            continue
+        cookie_jar.set_cookie(create_cookie(**cookie))
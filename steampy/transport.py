@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding:UTF-8 -*-
+#
+# @AUTHOR: Rabbir
+# @FILE: /root/Github/steampy/steampy/transport.py
+# @DATE: 2026/10/18 Sun
+# @TIME: 18:32:16
+#
+# @DESCRIPTION: 录制和回放 HTTP 响应的连接池，通过 SteamClient 的 http_adapter 参数挂载，
+#               回放时不需要账号也不访问网络，用于离线测试和性能测试
+
+
+import base64
+import http.client
+import io
+import json
+import random
+import threading
+import time
+import urllib.parse as urlparse
+from typing import Iterable, List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+from steampy.exceptions import FixtureNotFound
+
+
+# 每次请求都会变化或包含密钥的参数，不参与请求的匹配，也不写入录制文件
+IGNORED_PARAMS = ('key', 'k', 't', 'donotcache', 'sessionid', 'password', 'rsatimestamp', 'twofactorcode', '_')
+
+# 响应体保存的是解压后的内容，回放时不能再带这些头
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+"""
+@description: 生成用于匹配的请求标识：方法、不带参数的地址和排序后的参数（查询参数加表单参数）
+-------
+@param: ignored_params: 不参与匹配的参数
+-------
+@return:
+"""
+def request_key(method: str,
+                url: str,
+                body: Optional[bytes] = None,
+                ignored_params: Iterable[str] = IGNORED_PARAMS) -> str:
+    parsed_url = urlparse.urlsplit(url)
+    params = urlparse.parse_qsl(parsed_url.query, keep_blank_values=True)
+    if body:
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        params += urlparse.parse_qsl(body, keep_blank_values=True)
+    ignored_params = set(ignored_params)
+    params = sorted((name, value) for name, value in params if name not in ignored_params)
+    key = '%s %s://%s%s' % (method.upper(), parsed_url.scheme, parsed_url.netloc, parsed_url.path)
+    if params:
+        key += '?' + urlparse.urlencode(params)
+    return key
+
+
+"""
+@description: 录制文件，每行一个 JSON 记录一次请求和它的响应，
+              同一个请求录制多次时按录制顺序回放
+-------
+@param: path: 文件路径，为 None 时只保存在内存中
+-------
+@return:
+"""
+class Cassette:
+
+    def __init__(self, path: str = None, ignored_params: Iterable[str] = IGNORED_PARAMS) -> None:
+        self.path = path
+        self.ignored_params = tuple(ignored_params)
+        # 请求标识 -> 响应记录列表
+        self._interactions = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            interaction = json.loads(line)
+                            self._interactions.setdefault(interaction['key'], []).append(interaction)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return sum(len(interactions) for interactions in self._interactions.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._interactions
+
+    def keys(self) -> List[str]:
+        return list(self._interactions)
+
+    def get(self, key: str) -> List[dict]:
+        return self._interactions.get(key, [])
+
+    """
+    @description: 添加一条响应记录，用于手动构造测试数据
+    -------
+    @param: params: 查询参数
+            data: 表单参数
+            headers: (名称, 值) 列表，同名的头可以出现多次（例如 Set-Cookie）
+    -------
+    @return:
+    """
+    def add(self,
+            method: str,
+            url: str,
+            body: Union[str, bytes] = b'',
+            status: int = 200,
+            headers: Iterable[Tuple[str, str]] = (),
+            params: dict = None,
+            data: dict = None,
+            reason: str = None) -> dict:
+        if params:
+            url += ('&' if '?' in url else '?') + urlparse.urlencode(params, doseq=True)
+        encoded_data = urlparse.urlencode(data, doseq=True) if data else None
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        interaction = {'key': request_key(method, url, encoded_data, self.ignored_params),
+                       'status': status,
+                       'reason': reason if reason is not None else http.client.responses.get(status, ''),
+                       'headers': [[name, value] for name, value in headers
+                                   if name.lower() not in _DROPPED_HEADERS],
+                       'body': base64.b64encode(body).decode('ascii')}
+        self._add(interaction)
+        return interaction
+
+    """
+    @description: 添加一次真实请求的响应
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def add_response(self, request: requests.PreparedRequest, response: requests.Response) -> dict:
+        raw_headers = response.raw.headers if response.raw is not None else response.headers
+        headers = [[name, value] for name, value in raw_headers.items()
+                   if name.lower() not in _DROPPED_HEADERS]
+        interaction = {'key': request_key(request.method, request.url, request.body, self.ignored_params),
+                       'status': response.status_code,
+                       'reason': response.reason,
+                       'headers': headers,
+                       'body': base64.b64encode(response.content).decode('ascii')}
+        self._add(interaction)
+        return interaction
+
+    def _add(self, interaction: dict) -> None:
+        with self._lock:
+            self._interactions.setdefault(interaction['key'], []).append(interaction)
+            if self.path is not None:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(interaction) + '\n')
+
+
+"""
+@description: 录制用的连接池，请求照常发出，同时把响应写入录制文件，
+              录制文件中有登录后的 Cookie，需要和密码一样妥善保管
+-------
+@param: cassette: 录制文件或它的路径
+        adapter: 实际发送请求的连接池，为 None 时使用默认的 HTTPAdapter
+-------
+@return:
+"""
+class RecordingAdapter(HTTPAdapter):
+
+    def __init__(self, cassette: Union[str, Cassette], adapter: HTTPAdapter = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+        self._adapter = adapter if adapter is not None else HTTPAdapter(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = self._adapter.send(request, **kwargs)
+        # 读取响应体后响应仍然可以正常使用
+        self.cassette.add_response(request, response)
+        return response
+
+    def close(self) -> None:
+        self._adapter.close()
+        super().close()
+
+
+"""
+@description: 回放用的连接池，按请求标识从录制文件中返回响应，不访问网络
+-------
+@param: cassette: 录制文件或它的路径
+        latency: 每次响应前等待的秒数，用于模拟网络延迟
+        jitter: 在 latency 上随机增加 0 到 jitter 秒
+        repeat: 同一个请求的记录用完后是否重复返回最后一条，为 False 时抛出 FixtureNotFound
+-------
+@return:
+"""
+class ReplayAdapter(HTTPAdapter):
+
+    def __init__(self,
+                 cassette: Union[str, Cassette],
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 repeat: bool = True) -> None:
+        super().__init__()
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+        self.latency = latency
+        self.jitter = jitter
+        self.repeat = repeat
+        # 请求标识 -> 下一条要回放的记录序号
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        interaction = self._next_interaction(request_key(request.method, request.url, request.body,
+                                                         self.cassette.ignored_params))
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        return self.build_response(request, _build_raw_response(interaction))
+
+    def _next_interaction(self, key: str) -> dict:
+        interactions = self.cassette.get(key)
+        with self._lock:
+            position = self._positions.get(key, 0)
+            if position >= len(interactions):
+                if not interactions or not self.repeat:
+                    raise FixtureNotFound('No recorded response for %s' % key)
+                position = len(interactions) - 1
+            self._positions[key] = position + 1
+        return interactions[position]
+
+    """
+    @description: 从头开始回放
+    -------
+    @param:
+    -------
+    @return:
+    """
+    def rewind(self) -> None:
+        with self._lock:
+            self._positions.clear()
+
+
+class _OriginalResponse:
+    # requests 从这里读取 Set-Cookie 写入会话的 Cookie
+
+    def __init__(self, headers: http.client.HTTPMessage) -> None:
+        self.msg = headers
+
+    def isclosed(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def _build_raw_response(interaction: dict) -> HTTPResponse:
+    body = base64.b64decode(interaction['body'])
+    headers = http.client.HTTPMessage()
+    for name, value in interaction['headers']:
+        headers[name] = value
+    headers['Content-Length'] = str(len(body))
+    return HTTPResponse(body=io.BytesIO(body),
+                        headers=list(headers.items()),
+                        status=interaction['status'],
+                        reason=interaction['reason'],
+                        preload_content=False,
+                        decode_content=False,
+                        original_response=_OriginalResponse(headers))
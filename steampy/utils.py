@@ -1,4 +1,5 @@
 import decimal
+import html as html_lib
 import os
 
 import copy
@@ -12,6 +13,30 @@ from bs4 import BeautifulSoup, Tag
 
 from steampy.models import GameOptions
 
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+except ImportError:
+    lxml_etree = lxml_html = None
+
+LISTINGS_PARSERS = ('bs4', 'lxml', 'regex')
+_listings_parser = 'bs4'
+
+
+def set_listings_parser(name: str) -> None:
+    """Select the backend used to parse market listings: 'bs4', 'lxml', 'regex' or 'auto' (lxml when installed)."""
+    global _listings_parser
+    if name == 'auto':
+        name = 'lxml' if lxml_html is not None else 'regex'
+    if name not in LISTINGS_PARSERS:
+        raise ValueError('Unknown listings parser: %s' % name)
+    if name == 'lxml' and lxml_html is None:
+        raise ImportError('lxml is required to use lxml listings parser')
+    _listings_parser = name
+
+
+def get_listings_parser() -> str:
+    return _listings_parser
+
 
 def text_between(text: str, begin: str, end: str) -> str:
     start = text.index(begin) + len(begin)
@@ -97,6 +122,10 @@ def merge_items(items: List[dict], descriptions: dict, **kwargs) -> dict:
 
 
 def get_market_listings_from_html(html: str) -> dict:
+    if _listings_parser == 'regex':
+        return _get_market_listings_from_html_regex(html)
+    if _listings_parser == 'lxml':
+        return _get_market_listings_from_html_lxml(html)
     document = BeautifulSoup(html, "html.parser")
     nodes = document.select("div[id=myListings]")[0].findAll("div", {"class": "market_home_listing_table"})
     sell_listings_dict = {}
@@ -131,6 +160,10 @@ def get_sell_listings_from_node(node: Tag) -> dict:
 
 
 def get_market_sell_listings_from_api(html: str) -> dict:
+    if _listings_parser == 'regex':
+        return {"sell_listings": _get_sell_listings_regex(html)}
+    if _listings_parser == 'lxml':
+        return {"sell_listings": _get_sell_listings_lxml(_lxml_document(html))}
     document = BeautifulSoup(html, "html.parser")
     sell_listings_dict = get_sell_listings_from_node(document)
     return {"sell_listings": sell_listings_dict}
@@ -151,10 +184,173 @@ def get_buy_orders_from_node(node: Tag) -> dict:
     return buy_orders_dict
 
 
+# The regex parser only reads the markup Steam renders for market listings: it matches tags by their attributes and
+# finds the end of an element by counting nested tags of the same name.
+_TAG_PATTERNS = {tag: re.compile(r'<(/?)%s\b[^>]*>' % tag, re.IGNORECASE) for tag in ('div', 'span', 'a')}
+_MARKUP_PATTERN = re.compile(r'<!--.*?-->|<[^>]*>', re.DOTALL)
+_MY_LISTINGS_PATTERN = re.compile(r'<div\b[^>]*\sid\s*=\s*["\']myListings["\'][^>]*>')
+_LISTING_TABLE_PATTERN = re.compile(
+    r'<div\b(?=[^>]*\sclass\s*=\s*["\'][^"\']*(?<![\w-])market_home_listing_table(?![\w-]))[^>]*>')
+_SELL_LISTING_PATTERN = re.compile(r'<div\b[^>]*\sid\s*=\s*["\']([^"\']*mylisting_\d+[^"\']*)["\'][^>]*>')
+_BUY_ORDER_PATTERN = re.compile(r'<div\b[^>]*\sid\s*=\s*["\']([^"\']*mybuyorder_\d+[^"\']*)["\'][^>]*>')
+_TITLE_SPAN_PATTERN = re.compile(r'<span\b(?=[^>]*\stitle(?![\w-]))[^>]*>')
+_PRICE_SPAN_PATTERN = re.compile(r'<span\b(?=[^>]*\sclass\s*=\s*(["\'])market_listing_price\1)[^>]*>')
+_LISTED_DATE_PATTERN = re.compile(
+    r'<div\b(?=[^>]*\sclass\s*=\s*["\'][^"\']*(?<![\w-])market_listing_listed_date(?![\w-]))[^>]*>')
+_LINK_PATTERN = re.compile(r'<a\b[^>]*>', re.IGNORECASE)
+_LISTING_ASSETS_ADDRESS_PATTERN = re.compile(
+    "CreateItemHoverFromContainer\\( [\\w]+, 'mylisting_([\\d]+)_[\\w]+', ([\\d]+), '([\\d]+)', '([\\d]+)', [\\d]+ \\);")
+
+
+def _element_end(html: str, tag: str, open_tag_end: int, end: int) -> int:
+    depth = 1
+    for match in _TAG_PATTERNS[tag].finditer(html, open_tag_end, end):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return match.start()
+    return end
+
+
+def _iter_elements(pattern, tag: str, html: str, start: int = 0, end: int = None):
+    end = len(html) if end is None else end
+    position = start
+    while True:
+        match = pattern.search(html, position, end)
+        if match is None:
+            return
+        inner_end = _element_end(html, tag, match.end(), end)
+        yield match, match.end(), inner_end
+        position = match.end()
+
+
+def _first_element_text(pattern, tag: str, html: str, start: int, end: int) -> str:
+    for _, inner_start, inner_end in _iter_elements(pattern, tag, html, start, end):
+        return _markup_text(html[inner_start:inner_end])
+    raise IndexError('list index out of range')
+
+
+def _markup_text(markup: str) -> str:
+    return html_lib.unescape(_MARKUP_PATTERN.sub('', markup))
+
+
+def _get_market_listings_from_html_regex(html: str) -> dict:
+    my_listings = _MY_LISTINGS_PATTERN.search(html)
+    if my_listings is None:
+        raise IndexError('list index out of range')
+    start, end = my_listings.end(), _element_end(html, 'div', my_listings.end(), len(html))
+    sell_listings_dict = {}
+    buy_orders_dict = {}
+    for _, inner_start, inner_end in _iter_elements(_LISTING_TABLE_PATTERN, 'div', html, start, end):
+        text = _markup_text(html[inner_start:inner_end])
+        if "My sell listings" in text:
+            sell_listings_dict = _get_sell_listings_regex(html, inner_start, inner_end)
+        elif "My listings awaiting confirmation" in text:
+            sell_listings_awaiting_conf = _get_sell_listings_regex(html, inner_start, inner_end)
+            for listing in sell_listings_awaiting_conf.values():
+                listing["need_confirmation"] = True
+            sell_listings_dict.update(sell_listings_awaiting_conf)
+        elif "My buy orders" in text:
+            buy_orders_dict = _get_buy_orders_regex(html, inner_start, inner_end)
+    return {"buy_orders": buy_orders_dict, "sell_listings": sell_listings_dict}
+
+
+def _get_sell_listings_regex(html: str, start: int = 0, end: int = None) -> dict:
+    sell_listings_dict = {}
+    for match, inner_start, inner_end in _iter_elements(_SELL_LISTING_PATTERN, 'div', html, start, end):
+        spans = [_markup_text(html[span_start:span_end]) for _, span_start, span_end
+                 in _iter_elements(_TITLE_SPAN_PATTERN, 'span', html, inner_start, inner_end)]
+        listing = {
+            "listing_id": html_lib.unescape(match.group(1)).replace("mylisting_", ""),
+            "buyer_pay": spans[0].strip(),
+            "you_receive": spans[1].strip()[1:-1],
+            "created_on": _first_element_text(_LISTED_DATE_PATTERN, 'div', html, inner_start, inner_end).strip(),
+            "need_confirmation": False
+        }
+        sell_listings_dict[listing["listing_id"]] = listing
+    return sell_listings_dict
+
+
+def _get_buy_orders_regex(html: str, start: int = 0, end: int = None) -> dict:
+    buy_orders_dict = {}
+    for match, inner_start, inner_end in _iter_elements(_BUY_ORDER_PATTERN, 'div', html, start, end):
+        qnt_price_raw = _first_element_text(_PRICE_SPAN_PATTERN, 'span', html, inner_start, inner_end).split("@")
+        order = {
+            "order_id": html_lib.unescape(match.group(1)).replace("mybuyorder_", ""),
+            "quantity": int(qnt_price_raw[0].strip()),
+            "price": qnt_price_raw[1].strip(),
+            "item_name": _first_element_text(_LINK_PATTERN, 'a', html, inner_start, inner_end)
+        }
+        buy_orders_dict[order["order_id"]] = order
+    return buy_orders_dict
+
+
+if lxml_etree is not None:
+    _LXML_NAMESPACES = {'re': 'http://exslt.org/regular-expressions'}
+    _LXML_CLASS_XPATH = './/div[contains(concat(" ", normalize-space(@class), " "), " %s ")]'
+    _LXML_MY_LISTINGS = lxml_etree.XPath('//div[@id="myListings"]')
+    _LXML_LISTING_TABLES = lxml_etree.XPath(_LXML_CLASS_XPATH % 'market_home_listing_table')
+    _LXML_SELL_LISTINGS = lxml_etree.XPath('.//div[re:test(@id, "mylisting_\\d+")]', namespaces=_LXML_NAMESPACES)
+    _LXML_BUY_ORDERS = lxml_etree.XPath('.//div[re:test(@id, "mybuyorder_\\d+")]', namespaces=_LXML_NAMESPACES)
+    _LXML_TITLE_SPANS = lxml_etree.XPath('.//span[@title]')
+    _LXML_PRICE_SPANS = lxml_etree.XPath('.//span[@class="market_listing_price"]')
+    _LXML_LISTED_DATES = lxml_etree.XPath(_LXML_CLASS_XPATH % 'market_listing_listed_date')
+    _LXML_LINKS = lxml_etree.XPath('.//a')
+
+
+def _lxml_document(html: str):
+    return lxml_html.document_fromstring('<html><body>%s</body></html>' % html)
+
+
+def _get_market_listings_from_html_lxml(html: str) -> dict:
+    nodes = _LXML_LISTING_TABLES(_LXML_MY_LISTINGS(_lxml_document(html))[0])
+    sell_listings_dict = {}
+    buy_orders_dict = {}
+    for node in nodes:
+        text = node.text_content()
+        if "My sell listings" in text:
+            sell_listings_dict = _get_sell_listings_lxml(node)
+        elif "My listings awaiting confirmation" in text:
+            sell_listings_awaiting_conf = _get_sell_listings_lxml(node)
+            for listing in sell_listings_awaiting_conf.values():
+                listing["need_confirmation"] = True
+            sell_listings_dict.update(sell_listings_awaiting_conf)
+        elif "My buy orders" in text:
+            buy_orders_dict = _get_buy_orders_lxml(node)
+    return {"buy_orders": buy_orders_dict, "sell_listings": sell_listings_dict}
+
+
+def _get_sell_listings_lxml(node) -> dict:
+    sell_listings_dict = {}
+    for listing_raw in _LXML_SELL_LISTINGS(node):
+        spans = _LXML_TITLE_SPANS(listing_raw)
+        listing = {
+            "listing_id": listing_raw.get("id").replace("mylisting_", ""),
+            "buyer_pay": spans[0].text_content().strip(),
+            "you_receive": spans[1].text_content().strip()[1:-1],
+            "created_on": _LXML_LISTED_DATES(listing_raw)[0].text_content().strip(),
+            "need_confirmation": False
+        }
+        sell_listings_dict[listing["listing_id"]] = listing
+    return sell_listings_dict
+
+
+def _get_buy_orders_lxml(node) -> dict:
+    buy_orders_dict = {}
+    for order in _LXML_BUY_ORDERS(node):
+        qnt_price_raw = _LXML_PRICE_SPANS(order)[0].text_content().split("@")
+        order = {
+            "order_id": order.get("id").replace("mybuyorder_", ""),
+            "quantity": int(qnt_price_raw[0].strip()),
+            "price": qnt_price_raw[1].strip(),
+            "item_name": _LXML_LINKS(order)[0].text_content()
+        }
+        buy_orders_dict[order["order_id"]] = order
+    return buy_orders_dict
+
+
 def get_listing_id_to_assets_address_from_html(html: str) -> dict:
     listing_id_to_assets_address = {}
-    regex = "CreateItemHoverFromContainer\( [\w]+, 'mylisting_([\d]+)_[\w]+', ([\d]+), '([\d]+)', '([\d]+)', [\d]+ \);"
-    for match in re.findall(regex, html):
+    for match in _LISTING_ASSETS_ADDRESS_PATTERN.findall(html):
         listing_id_to_assets_address[match[0]] = [str(match[1]), match[2], match[3]]
     return listing_id_to_assets_address
 
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+from steampy.async_client import AsyncConfirmationExecutor, AsyncSteamClient, AsyncSteamMarket
+from steampy.cache import ResponseCache
+from steampy.market import SteamMarket
+from steampy.models import Currency, GameOptions, SteamUrl
+from steampy.rate_limit import RateLimit, RateLimiter
+
+PRICE = {'success': True, 'lowest_price': '$1.00', 'volume': '10'}
+
+
+def price_market(rate_limiter: RateLimiter = None) -> SteamMarket:
+    # like SteamSession, the session takes a token from its limiter for every request
+    session = mock.Mock(rate_limiter=rate_limiter, thread_waits=[])
+    response = mock.Mock(status_code=200, **{'json.return_value': PRICE})
+
+    def get(url, **kwargs):
+        if rate_limiter is not None:
+            session.thread_waits.append(rate_limiter.acquire(url))
+        return response
+
+    session.get.side_effect = get
+    return SteamMarket(session, ResponseCache())
+
+
+def closing_pages(pages: list, closed: threading.Event):
+    try:
+        yield from pages
+    finally:
+        closed.set()
+
+
+class TestAsyncSteamMarket(TestCase):
+
+    def test_fetch_price_takes_token_in_event_loop(self):
+        rate_limiter = RateLimiter({RateLimiter.MARKET_PRICE: RateLimit(100, 1, 1)})
+        market = price_market(rate_limiter)
+        # the only token is taken, so the next request has to wait
+        rate_limiter.acquire(SteamUrl.COMMUNITY_URL + '/market/priceoverview/')
+        price = asyncio.run(AsyncSteamMarket(market).fetch_price('Case', GameOptions.CS, Currency.USD))
+        self.assertEqual(price, PRICE)
+        self.assertEqual(market._session.thread_waits, [0.0])
+        metrics = rate_limiter.metrics()[RateLimiter.MARKET_PRICE]
+        self.assertEqual((metrics['requests'], metrics['throttled']), (2, 1))
+
+    def test_cached_price_skips_rate_limit(self):
+        rate_limiter = RateLimiter()
+        market = price_market(rate_limiter)
+        market.cache.set(ResponseCache.PRICE_OVERVIEW, PRICE, GameOptions.CS.app_id, 'Case', Currency.USD.value, 'PL')
+        price = asyncio.run(AsyncSteamMarket(market).fetch_price('Case', GameOptions.CS, Currency.USD))
+        self.assertEqual(price, PRICE)
+        self.assertEqual(rate_limiter.metrics()[RateLimiter.MARKET_PRICE]['requests'], 0)
+        market._session.get.assert_not_called()
+
+    def test_fetch_prices(self):
+        market = price_market()
+
+        async def collect():
+            return [result async for result in AsyncSteamMarket(market).fetch_prices(['a', 'b', 'a'],
+                                                                                      GameOptions.CS)]
+
+        results = asyncio.run(collect())
+        self.assertEqual(sorted(result.market_hash_name for result in results), ['a', 'b'])
+        self.assertTrue(all(result.price == PRICE for result in results))
+
+    def test_fetch_prices_early_exit_closes_stream(self):
+        market = price_market()
+        closed = threading.Event()
+        market.fetch_prices = mock.Mock(return_value=closing_pages(['a', 'b'], closed))
+
+        async def first():
+            async for result in AsyncSteamMarket(market).fetch_prices(['a', 'b'], GameOptions.CS):
+                return result
+
+        self.assertEqual(asyncio.run(first()), 'a')
+        self.assertTrue(closed.is_set())
+
+
+class TestAsyncSteamClient(TestCase):
+
+    def test_methods_run_in_executor(self):
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='steam') as executor:
+            client = AsyncSteamClient('key', executor=executor)
+            client.client.get_trade_offers_summary = mock.Mock(
+                side_effect=lambda: {'thread': threading.current_thread().name})
+            summary = asyncio.run(client.get_trade_offers_summary())
+        self.assertTrue(summary['thread'].startswith('steam'))
+
+    def test_iter_inventory(self):
+        client = AsyncSteamClient('key')
+        client.client.iter_inventory = mock.Mock(return_value=iter([{'1': {}}, {'2': {}}]))
+
+        async def collect():
+            return [page async for page in client.iter_inventory('76561198000000001', GameOptions.CS)]
+
+        self.assertEqual(asyncio.run(collect()), [{'1': {}}, {'2': {}}])
+
+    def test_cancelled_iter_inventory_closes_generator(self):
+        client = AsyncSteamClient('key')
+        closed = threading.Event()
+        release = threading.Event()
+
+        def pages():
+            try:
+                yield {'1': {}}
+                release.wait(5)
+                yield {'2': {}}
+            finally:
+                closed.set()
+
+        client.client.iter_inventory = mock.Mock(return_value=pages())
+
+        async def cancel_on_second_page():
+            seen = []
+
+            async def collect():
+                async for page in client.iter_inventory('76561198000000001', GameOptions.CS):
+                    seen.append(page)
+
+            task = asyncio.ensure_future(collect())
+            while not seen:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            task.cancel()
+            release.set()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return seen
+
+        self.assertEqual(asyncio.run(cancel_on_second_page()), [{'1': {}}])
+        self.assertTrue(closed.is_set())
+
+    def test_confirmation_executor_shares_session(self):
+        client = AsyncSteamClient('key')
+        client.client.steam_guard = {'steamid': '76561198000000001', 'identity_secret': 'c2VjcmV0'}
+        client.client._confirmation_index = mock.Mock()
+        executor = client.get_confirmation_executor()
+        self.assertIsInstance(executor, AsyncConfirmationExecutor)
+        self.assertIs(executor._wrapped._session, client.client._session)
+        self.assertIs(executor._wrapped._index, client.client._confirmation_index)
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from steampy.cache import CacheBackend, MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+
+
+class TestCache(TestCase):
+
+    def test_memory_backend_ttl(self):
+        backend = MemoryCacheBackend()
+        backend.set('key', {'success': True}, 0.05)
+        self.assertEqual(backend.get('key'), {'success': True})
+        time.sleep(0.06)
+        self.assertIsNone(backend.get('key'))
+
+    def test_memory_backend_lru(self):
+        backend = MemoryCacheBackend(max_size=2)
+        backend.set('a', 1, 60)
+        backend.set('b', 2, 60)
+        backend.get('a')
+        backend.set('c', 3, 60)
+        self.assertEqual(backend.get('a'), 1)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(len(backend), 2)
+
+    def test_memory_backend_returns_copies(self):
+        backend = MemoryCacheBackend()
+        value = {'prices': [1]}
+        backend.set('key', value, 60)
+        value['prices'].append(2)
+        backend.get('key')['prices'].append(3)
+        self.assertEqual(backend.get('key'), {'prices': [1]})
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class GetOnlyBackend(CacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyBackend()
+
+    def test_sqlite_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            backend = SQLiteCacheBackend(path, max_size=2)
+            backend.set('a', {'lowest_price': '$1.00'}, 60)
+            backend.set('b', 2, 60)
+            backend.set('c', 3, 60)
+            self.assertIsNone(backend.get('a'))
+            self.assertEqual(SQLiteCacheBackend(path).get('c'), 3)
+            backend.set('d', 4, -1)
+            self.assertIsNone(backend.get('d'))
+
+    def test_response_cache_stats(self):
+        cache = ResponseCache(ttls={ResponseCache.PRICE_HISTORY: 0})
+        self.assertIsNone(cache.get(ResponseCache.PRICE_OVERVIEW, '730', 'AK-47', 1, 'PL'))
+        cache.set(ResponseCache.PRICE_OVERVIEW, {'success': True}, '730', 'AK-47', 1, 'PL')
+        self.assertEqual(cache.get(ResponseCache.PRICE_OVERVIEW, '730', 'AK-47', 1, 'PL'), {'success': True})
+        self.assertIsNone(cache.get(ResponseCache.PRICE_OVERVIEW, '730', 'AK-47', 3, 'PL'))
+        cache.set(ResponseCache.PRICE_HISTORY, {'success': True}, '730', 'AK-47')
+        self.assertIsNone(cache.get(ResponseCache.PRICE_HISTORY, '730', 'AK-47'))
+        self.assertEqual(cache.stats()[ResponseCache.PRICE_OVERVIEW], {'hits': 1, 'misses': 2})
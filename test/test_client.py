@@ -72,6 +72,25 @@ class TestSteamClient(TestCase):
         inventory = client.get_partner_inventory(partner_id, game)
         self.assertIsNotNone(inventory)
 
+    def test_iter_inventory(self):
+        client = SteamClient(self.credentials.api_key)
+        client.login(self.credentials.login, self.credentials.password, self.steam_guard_file)
+        steam_id = client.steam_guard['steamid']
+        inventory = client.get_my_inventory(GameOptions.CS)
+        items = {}
+        for page in client.iter_inventory(steam_id, GameOptions.CS, page_size=100):
+            self.assertLessEqual(len(page), 100)
+            items.update(page)
+        self.assertEqual(set(items.keys()), set(inventory.keys()))
+
+    def test_fetch_inventory(self):
+        client = SteamClient(self.credentials.api_key)
+        client.login(self.credentials.login, self.credentials.password, self.steam_guard_file)
+        steam_id = client.steam_guard['steamid']
+        inventory = client.get_my_inventory(GameOptions.CS)
+        compact_inventory = client.fetch_inventory(steam_id, GameOptions.CS, page_size=100)
+        self.assertEqual(dict(compact_inventory.as_dict()), inventory)
+
     def test_get_trade_offers_summary(self):
         client = SteamClient(self.credentials.api_key)
         summary = client.get_trade_offers_summary()
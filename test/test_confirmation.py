@@ -0,0 +1,188 @@
+import base64
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from steampy import guard
+from steampy.confirmation import ConfirmationExecutor, ConfirmationIndex
+
+STEAM_ID = '76561198000000001'
+IDENTITY_SECRET = base64.b64encode(b'abcdefghijklmnoprstu').decode('ascii')
+
+
+class FakeConfirmationSession:
+    # pending confirmations are (confirmation id, trade offer id) pairs or (confirmation id, id, type, typed) tuples,
+    # the id is a trade offer id for type '2' and an asset id for type '3' (sell listing),
+    # untyped confirmations have no data-type in the list like on the old page
+
+    def __init__(self, confirmations: list) -> None:
+        self.confirmations = [confirmation if len(confirmation) == 4 else confirmation + ('2', True)
+                              for confirmation in confirmations]
+        self.get = mock.Mock(side_effect=self._get)
+        self.post = mock.Mock(return_value=mock.Mock(**{'json.return_value': {'success': True}}))
+
+    def _get(self, url, params=None, headers=None):
+        if url.endswith('/conf'):
+            entries = ''.join('<div class="mobileconf_list_entry" id="conf%s" data-confid="%s" data-key="key%s"%s>'
+                              '</div>' % (confirmation_id, confirmation_id, confirmation_id,
+                                          ' data-type="%s"' % data_type if typed else '')
+                              for confirmation_id, _, data_type, typed in self.confirmations)
+            if not entries:
+                return mock.Mock(text='<div id="mobileconf_empty"></div>', url=url)
+            return mock.Mock(text='<div id="mobileconf_list">%s</div>' % entries, url=url)
+        if url.endswith('/ajaxop'):
+            return mock.Mock(**{'json.return_value': {'success': True}})
+        confirmation_id = url.rsplit('/', 1)[1]
+        _, resolved_id, data_type, _ = [confirmation for confirmation in self.confirmations
+                                     if confirmation[0] == confirmation_id][0]
+        if data_type == '3':
+            html = ('<script></script><script></script>'
+                    '<script>BuildHover( \'confiteminfo\', {"id": "%s"}, UserYou );</script>' % resolved_id)
+        else:
+            html = '<div class="tradeoffer" id="tradeofferid_%s"></div>' % resolved_id
+        return mock.Mock(**{'json.return_value': {'success': True, 'html': html}})
+
+    def conf_requests(self) -> int:
+        return len([call for call in self.get.call_args_list if call[0][0].endswith('/conf')])
+
+    def details_requests(self) -> int:
+        return len([call for call in self.get.call_args_list if '/details/' in call[0][0]])
+
+
+def confirmation_executor(session: FakeConfirmationSession, **kwargs) -> ConfirmationExecutor:
+    return ConfirmationExecutor(IDENTITY_SECRET, STEAM_ID, session, **kwargs)
+
+
+class TestConfirmationIndex(TestCase):
+
+    def test_set_and_get(self):
+        index = ConfirmationIndex()
+        index.set('1', trade_offer_id='100')
+        self.assertIn('1', index)
+        self.assertEqual(index.get('1')[ConfirmationIndex.TRADE_OFFER_ID], '100')
+        self.assertIsNone(index.get('1')[ConfirmationIndex.ASSET_ID])
+        self.assertIsNone(index.get('2'))
+
+    def test_prune(self):
+        index = ConfirmationIndex()
+        index.set('1', trade_offer_id='100')
+        index.set('2', asset_id='200')
+        index.prune(['2', '3'])
+        self.assertNotIn('1', index)
+        self.assertIn('2', index)
+        self.assertEqual(len(index), 1)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.json')
+            index = ConfirmationIndex(path)
+            index.set('1', asset_id='200')
+            index.save()
+            loaded_index = ConfirmationIndex(path)
+            self.assertEqual(loaded_index.get('1')[ConfirmationIndex.ASSET_ID], '200')
+            self.assertEqual(os.listdir(directory), ['index.json'])
+
+    def test_unreadable_file_is_empty_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.json')
+            with open(path, 'w') as f:
+                f.write('{"1": {"trade_offer_id": "1')
+            with self.assertLogs('steampy.confirmation', 'WARNING'):
+                index = ConfirmationIndex(path)
+            self.assertEqual(len(index), 0)
+            index.set('2', trade_offer_id='200')
+            index.save()
+            self.assertIn('2', ConfirmationIndex(path))
+
+    def test_pruned_index_is_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.json')
+            index = ConfirmationIndex(path)
+            index.set('1', trade_offer_id='100')
+            index.set('2', trade_offer_id='200')
+            index.save()
+            confirmation_executor(FakeConfirmationSession([('2', '200')]), index=index).confirm_trade_offers([])
+            self.assertEqual((len(index), len(ConfirmationIndex(path))), (1, 1))
+
+
+class TestConfirmationExecutor(TestCase):
+
+    def test_details_keys_are_signed_for_current_time_only(self):
+        session = FakeConfirmationSession([('1', '100'), ('2', '200'), ('3', '300')])
+        signer = guard.GuardSigner(IDENTITY_SECRET, STEAM_ID)
+        executor = confirmation_executor(session, signer=signer)
+        with mock.patch('steampy.guard.get_time', return_value=1470838334):
+            executor.confirm_trade_offers(['100', '200', '300'])
+        self.assertEqual(sorted(tag for _, tag in signer._keys),
+                         ['allow', 'conf', 'details1', 'details2', 'details3'])
+
+    def test_confirm_trade_offers(self):
+        session = FakeConfirmationSession([('1', '100'), ('2', '200'), ('3', '300')])
+        response = confirmation_executor(session).confirm_trade_offers(['300', '100', '999'])
+        self.assertEqual(session.conf_requests(), 1)
+        self.assertEqual(session.details_requests(), 3)
+        self.assertEqual(response['confirmed'], ['300', '100'])
+        self.assertEqual(response['not_found'], ['999'])
+        session.post.assert_called_once()
+        url = session.post.call_args[0][0]
+        data = session.post.call_args[1]['data']
+        self.assertTrue(url.endswith('/mobileconf/multiajaxop'))
+        self.assertEqual((data['op'], data['tag']), ('allow', 'allow'))
+        self.assertEqual(data['cid[]'], ['3', '1'])
+        self.assertEqual(data['ck[]'], ['key3', 'key1'])
+
+    def test_confirm_sell_listings_skips_trades(self):
+        session = FakeConfirmationSession([('1', '100'), ('2', '5000', '3', True), ('3', '6000', '3', True)])
+        response = confirmation_executor(session).confirm_sell_listings(['6000', '7000'])
+        self.assertEqual(session.conf_requests(), 1)
+        self.assertEqual(session.details_requests(), 2)
+        self.assertEqual((response['confirmed'], response['not_found']), (['6000'], ['7000']))
+        self.assertEqual(session.post.call_args[1]['data']['cid[]'], ['3'])
+
+    def test_confirm_all_sell_listings(self):
+        session = FakeConfirmationSession([('1', '100'), ('2', '5000', '3', True),
+                                           ('3', '6000', '3', False), ('4', '400', '2', False)])
+        response = confirmation_executor(session).confirm_all_sell_listings()
+        # only the untyped confirmations need their details pages
+        self.assertEqual(session.details_requests(), 2)
+        self.assertEqual(response['confirmed'], ['2', '3'])
+        data = session.post.call_args[1]['data']
+        self.assertEqual((data['cid[]'], data['ck[]']), (['2', '3'], ['key2', 'key3']))
+
+    def test_nothing_to_confirm_sends_no_request(self):
+        session = FakeConfirmationSession([('1', '100')])
+        response = confirmation_executor(session).confirm_trade_offers(['999'])
+        session.post.assert_not_called()
+        self.assertEqual((response['confirmed'], response['not_found']), ([], ['999']))
+
+    def test_rejected_batch_is_reported_as_failed(self):
+        session = FakeConfirmationSession([('1', '100'), ('2', '200')])
+        session.post.return_value.json.return_value = {'success': False}
+        response = confirmation_executor(session).confirm_trade_offers(['100', '101'])
+        self.assertFalse(response['success'])
+        self.assertEqual((response['confirmed'], response['failed'], response['not_found']), ([], ['100'], ['101']))
+        session = FakeConfirmationSession([('1', '5000', '3', True)])
+        session.post.return_value.json.return_value = {'success': False}
+        response = confirmation_executor(session).confirm_all_sell_listings()
+        self.assertEqual((response['confirmed'], response['failed']), ([], ['1']))
+
+    def test_second_confirmation_uses_index(self):
+        session = FakeConfirmationSession([('1', '100'), ('2', '200'), ('3', '300')])
+        index = ConfirmationIndex()
+        confirmation_executor(session, index=index).confirm_trade_offers(['100'])
+        self.assertEqual(session.details_requests(), 3)
+        session.get.reset_mock()
+        response = confirmation_executor(session, index=index).confirm_trade_offers(['200', '300'])
+        self.assertEqual(session.details_requests(), 0)
+        self.assertEqual(response['confirmed'], ['200', '300'])
+        session.get.reset_mock()
+        confirmation_executor(session, index=index).send_trade_allow_request('300')
+        self.assertEqual(session.details_requests(), 0)
+
+    def test_empty_list_prunes_index(self):
+        session = FakeConfirmationSession([])
+        index = ConfirmationIndex()
+        index.set('1', trade_offer_id='100')
+        self.assertEqual(confirmation_executor(session, index=index).confirm_trade_offers(['100'])['not_found'],
+                         ['100'])
+        self.assertEqual(len(index), 0)
@@ -1,5 +1,6 @@
 import base64
-from unittest import TestCase
+import requests
+from unittest import TestCase, mock
 
 from steampy import guard
 from steampy.confirmation import Tag
@@ -26,3 +27,112 @@ class TestGuard(TestCase):
         steam_id = "12341234123412345"
         device_id = guard.generate_device_id(steam_id)
         self.assertEquals(device_id, "android:677cf5aa-3300-7807-d1e2-c408142742e2")
+
+    def test_confirmation_key_default_timestamp_is_current(self):
+        with mock.patch('time.time', return_value=1470838334):
+            confirmation_key = guard.generate_confirmation_key(self.identity_secret, Tag.CONF.value)
+        self.assertEqual(confirmation_key, b'pWqjnkcwqni+t/n+5xXaEa0SGeA=')
+
+
+class TestGuardSigner(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.shared_secret = base64.b64encode('1234567890abcdefghij'.encode('utf-8'))
+        cls.identity_secret = base64.b64encode('abcdefghijklmnoprstu'.encode('utf-8'))
+        cls.signer = guard.GuardSigner(cls.identity_secret, '12341234123412345', cls.shared_secret)
+
+    def test_matches_module_functions(self):
+        self.assertEqual(self.signer.one_time_code(1469184207), 'P2QJN')
+        self.assertEqual(self.signer.confirmation_key(Tag.CONF.value, 1470838334), b'pWqjnkcwqni+t/n+5xXaEa0SGeA=')
+        self.assertEqual(self.signer.device_id, 'android:677cf5aa-3300-7807-d1e2-c408142742e2')
+
+    def test_confirmation_keys(self):
+        tags = [Tag.CONF.value, Tag.ALLOW.value, 'details123']
+        keys = self.signer.confirmation_keys(tags, 1470838334)
+        for tag in tags:
+            self.assertEqual(keys[tag], guard.generate_confirmation_key(self.identity_secret, tag, 1470838334))
+
+    def test_precompute(self):
+        signer = guard.GuardSigner(self.identity_secret, '12341234123412345')
+        signer.precompute(['details1', 'details2'], start=1470838334, window=10)
+        with mock.patch.object(signer, '_derive') as derive:
+            key = signer.confirmation_key('details2', 1470838343)
+        derive.assert_not_called()
+        self.assertEqual(key, guard.generate_confirmation_key(self.identity_secret, 'details2', 1470838343))
+
+    def test_max_cached(self):
+        signer = guard.GuardSigner(self.identity_secret, '12341234123412345', max_cached=5)
+        signer.precompute([Tag.CONF.value], start=1470838334, window=10)
+        self.assertEqual(len(signer._keys), 5)
+
+    def test_confirmation_params(self):
+        params = self.signer.confirmation_params(Tag.CONF.value, 1470838334)
+        self.assertEqual(params, {'p': 'android:677cf5aa-3300-7807-d1e2-c408142742e2',
+                                  'a': '12341234123412345',
+                                  'k': b'pWqjnkcwqni+t/n+5xXaEa0SGeA=',
+                                  't': 1470838334,
+                                  'm': 'android',
+                                  'tag': 'conf'})
+
+    def test_one_time_code_requires_shared_secret(self):
+        with self.assertRaises(ValueError):
+            guard.GuardSigner(self.identity_secret, '12341234123412345').one_time_code()
+
+
+class TestTimeSync(TestCase):
+
+    @staticmethod
+    def time_sync(server_time: int, **kwargs) -> guard.TimeSync:
+        session = mock.Mock()
+        session.post.return_value.json.return_value = {'response': {'server_time': str(server_time)}}
+        return guard.TimeSync(session, **kwargs)
+
+    def tearDown(self):
+        guard.set_time_sync(None)
+
+    def test_offset(self):
+        time_sync = self.time_sync(1470838334 + 100)
+        with mock.patch('time.time', return_value=1470838334):
+            self.assertEqual(time_sync.time(), 1470838434)
+        self.assertEqual(time_sync.offset, 100)
+
+    def test_syncs_once_per_interval(self):
+        time_sync = self.time_sync(1470838334, refresh_interval=3600)
+        time_sync.time()
+        time_sync.time()
+        self.assertEqual(time_sync._session.post.call_count, 1)
+        time_sync._synced_at -= 3600
+        time_sync.time()
+        self.assertEqual(time_sync._session.post.call_count, 2)
+
+    def test_failed_refresh_keeps_offset(self):
+        time_sync = self.time_sync(1470838334 + 100)
+        with mock.patch('time.time', return_value=1470838334):
+            time_sync.time()
+            time_sync._synced_at -= 3600
+            time_sync._session.post.side_effect = requests.ConnectionError
+            self.assertEqual(time_sync.time(), 1470838434)
+
+    def test_failed_first_sync_waits_before_retry(self):
+        time_sync = self.time_sync(1470838334 + 100)
+        time_sync._session.post.side_effect = requests.ConnectionError
+        with mock.patch('time.time', return_value=1470838334):
+            for _ in range(5):
+                self.assertEqual(time_sync.time(), 1470838334)
+        self.assertEqual(time_sync._session.post.call_count, 1)
+        self.assertIsNone(time_sync.offset)
+        time_sync._synced_at -= guard.TimeSync.RETRY_INTERVAL
+        time_sync._session.post.side_effect = None
+        with mock.patch('time.time', return_value=1470838334):
+            self.assertEqual(time_sync.time(), 1470838434)
+        self.assertEqual(time_sync._session.post.call_count, 2)
+
+    def test_guard_functions_use_time_sync(self):
+        identity_secret = base64.b64encode('abcdefghijklmnoprstu'.encode('utf-8'))
+        guard.set_time_sync(self.time_sync(1470838334))
+        with mock.patch('time.time', return_value=1470838234):
+            confirmation_key = guard.generate_confirmation_key(identity_secret, Tag.CONF.value)
+            params = guard.GuardSigner(identity_secret, '12341234123412345').confirmation_params(Tag.CONF.value)
+        self.assertEqual(confirmation_key, b'pWqjnkcwqni+t/n+5xXaEa0SGeA=')
+        self.assertEqual(params['t'], 1470838334)
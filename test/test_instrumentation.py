@@ -0,0 +1,134 @@
+from unittest import TestCase, mock
+
+from steampy.instrumentation import OpenTelemetryHook, PrometheusMetrics, RequestHook, endpoint_name
+from steampy.rate_limit import RateLimiter
+from steampy.session import SteamSession, parsing
+from steampy.transport import Cassette, ReplayAdapter
+
+LISTING_URL = 'https://steamcommunity.com/market/removelisting/12345'
+API_URL = 'https://api.steampowered.com/IEconService/GetTradeOffers/v1'
+
+
+def instrumented_session(cassette: Cassette, *hooks, rate_limiter: RateLimiter = None) -> SteamSession:
+    return SteamSession(rate_limiter, http_adapter=ReplayAdapter(cassette), request_hooks=hooks)
+
+
+class RecordingHook(RequestHook):
+
+    def __init__(self):
+        self.events = []
+        self.parses = []
+
+    def on_request(self, event):
+        self.events.append(event)
+
+    def on_parse(self, endpoint, started_at, duration):
+        self.parses.append((endpoint, duration))
+
+
+class TestInstrumentation(TestCase):
+
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name(LISTING_URL + '?sessionid=abc'),
+                         'steamcommunity.com/market/removelisting/{id}')
+        self.assertEqual(endpoint_name('https://steamcommunity.com/inventory/76561198000000001/730/2?count=5000'),
+                         'steamcommunity.com/inventory/{id}/{id}/{id}')
+        self.assertEqual(endpoint_name(API_URL + '?key=secret'), 'api.steampowered.com/IEconService/GetTradeOffers/v1')
+        self.assertEqual(endpoint_name('https://steamcommunity.com'), 'steamcommunity.com/')
+
+    def test_request_event(self):
+        cassette = Cassette()
+        cassette.add('POST', LISTING_URL, '{"success": 1}', data={'sessionid': 'abc'})
+        hook = RecordingHook()
+        session = instrumented_session(cassette, hook)
+        response = session.post(LISTING_URL, data={'sessionid': 'abc'})
+        self.assertEqual(len(hook.events), 1)
+        event = hook.events[0]
+        self.assertEqual((event.method, event.endpoint, event.status_code), ('POST', endpoint_name(LISTING_URL), 200))
+        self.assertEqual((event.bytes_sent, event.bytes_received, event.retries), (13, 14, 0))
+        self.assertGreaterEqual(event.duration, 0)
+        self.assertEqual(hook.parses, [])
+        self.assertEqual(response.json(), {'success': 1})
+        self.assertEqual([endpoint for endpoint, _ in hook.parses], [endpoint_name(LISTING_URL)])
+        with parsing(session, LISTING_URL):
+            pass
+        self.assertEqual(len(hook.parses), 2)
+
+    def test_retries_and_errors(self):
+        cassette = Cassette()
+        cassette.add('GET', API_URL, '', status=429, headers=[('Retry-After', '0')])
+        cassette.add('GET', API_URL, '{}')
+        hook = RecordingHook()
+        session = instrumented_session(cassette, hook, rate_limiter=RateLimiter(backoff_base=0))
+        session.get(API_URL)
+        self.assertEqual((hook.events[0].status_code, hook.events[0].retries), (200, 1))
+        with self.assertRaises(Exception):
+            session.get(API_URL + '/missing')
+        self.assertEqual(hook.events[1].status_code, None)
+        self.assertEqual(type(hook.events[1].error).__name__, 'FixtureNotFound')
+
+    def test_failing_hook_does_not_break_request(self):
+        cassette = Cassette()
+        cassette.add('GET', API_URL, '{}')
+        hook = mock.Mock(spec=RequestHook)
+        hook.on_request.side_effect = RuntimeError
+        hook.on_parse.side_effect = RuntimeError
+        session = instrumented_session(cassette, hook)
+        self.assertEqual(session.get(API_URL).json(), {})
+        hook.on_request.assert_called_once()
+        hook.on_parse.assert_called_once()
+
+    def test_add_and_remove_hook(self):
+        cassette = Cassette()
+        cassette.add('GET', API_URL, '{}')
+        hook = RecordingHook()
+        session = instrumented_session(cassette)
+        session.add_request_hook(hook)
+        session.get(API_URL)
+        session.remove_request_hook(hook)
+        session.get(API_URL)
+        self.assertEqual(len(hook.events), 1)
+        self.assertEqual(session.request_hooks, ())
+
+    def test_prometheus_metrics(self):
+        cassette = Cassette()
+        cassette.add('GET', API_URL, '{"response": {}}')
+        cassette.add('POST', LISTING_URL, '{"success": 1}', status=500, data={'sessionid': 'abc'})
+        metrics = PrometheusMetrics(buckets=(0.5, 10.0))
+        session = instrumented_session(cassette, metrics)
+        session.get(API_URL).json()
+        session.get(API_URL)
+        session.post(LISTING_URL, data={'sessionid': 'abc'})
+        text = metrics.render()
+        self.assertIn('# TYPE steampy_requests_total counter', text)
+        self.assertIn('steampy_requests_total{endpoint="api.steampowered.com/IEconService/GetTradeOffers/v1",'
+                      'method="GET",status="200"} 2', text)
+        self.assertIn('steampy_requests_total{endpoint="steamcommunity.com/market/removelisting/{id}",'
+                      'method="POST",status="500"} 1', text)
+        self.assertIn('steampy_response_bytes_received_total{endpoint="api.steampowered.com/IEconService/'
+                      'GetTradeOffers/v1"} 32', text)
+        self.assertIn('steampy_request_duration_seconds_bucket{endpoint="steamcommunity.com/market/removelisting/'
+                      '{id}",le="10.0"} 1', text)
+        self.assertIn('steampy_request_duration_seconds_bucket{endpoint="steamcommunity.com/market/removelisting/'
+                      '{id}",le="+Inf"} 1', text)
+        self.assertIn('steampy_parse_duration_seconds_count{endpoint="api.steampowered.com/IEconService/'
+                      'GetTradeOffers/v1"} 1', text)
+        self.assertTrue(text.endswith('\n'))
+
+    def test_open_telemetry_hook(self):
+        cassette = Cassette()
+        cassette.add('GET', API_URL, '{}', params={'key': 'secret'})
+        tracer = mock.Mock()
+        session = instrumented_session(cassette, OpenTelemetryHook(tracer))
+        session.get(API_URL, params={'key': 'secret'}).json()
+        names = [call[0][0] for call in tracer.start_span.call_args_list]
+        self.assertEqual(names, ['GET ' + endpoint_name(API_URL), 'parse ' + endpoint_name(API_URL)])
+        attributes = tracer.start_span.call_args_list[0][1]['attributes']
+        self.assertEqual(attributes['http.url'], API_URL)
+        self.assertEqual(attributes['http.status_code'], 200)
+        span = tracer.start_span.return_value
+        self.assertEqual(span.end.call_count, 2)
+
+    def test_no_hooks(self):
+        session = SteamSession()
+        self.assertIs(session.parsing(API_URL), parsing(mock.Mock(), API_URL))
@@ -0,0 +1,118 @@
+from unittest import TestCase, mock
+
+from steampy.client import SteamClient
+from steampy.exceptions import ApiException
+from steampy.inventory import Inventory
+from steampy.models import GameOptions
+from steampy.utils import merge_items_with_descriptions_from_inventory
+
+
+def description(classid: str, name: str, tradable: int = 1, marketable: int = 1) -> dict:
+    return {'appid': 730, 'classid': classid, 'instanceid': '0', 'market_hash_name': name,
+            'tradable': tradable, 'marketable': marketable, 'tags': [{'category': 'Type', 'name': 'Container'}]}
+
+
+INVENTORY_RESPONSE = {
+    'success': 1,
+    'assets': [{'appid': 730, 'contextid': '2', 'assetid': str(1000 + i), 'classid': '1', 'instanceid': '0',
+                'amount': '1'} for i in range(5)]
+              + [{'appid': 730, 'contextid': '2', 'assetid': '2000', 'classid': '2', 'instanceid': '0', 'amount': '1'},
+                 {'appid': 730, 'contextid': '2', 'assetid': '3000', 'classid': '3', 'instanceid': '0', 'amount': '3'}],
+    'descriptions': [description('1', 'Chroma 2 Case'),
+                     description('2', 'AK-47 | Redline (Field-Tested)', tradable=0),
+                     description('3', 'Sticker | Crown (Foil)', marketable=0)],
+}
+
+
+class TestInventory(TestCase):
+
+    def test_dict_view_matches_merge_items(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        merged = merge_items_with_descriptions_from_inventory(INVENTORY_RESPONSE, GameOptions.CS)
+        self.assertEqual(dict(inventory.as_dict()), merged)
+        self.assertEqual(len(inventory), 7)
+
+    def test_items_share_descriptions(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        cases = inventory.by_market_hash_name('Chroma 2 Case')
+        self.assertEqual([item.assetid for item in cases], ['1000', '1001', '1002', '1003', '1004'])
+        self.assertIs(cases[0].description, cases[1].description)
+        self.assertEqual(len(inventory._descriptions), 3)
+
+    def test_indexes(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        self.assertIn('2000', inventory)
+        self.assertEqual(inventory.get('3000').amount, 3)
+        self.assertIsNone(inventory.get('missing'))
+        self.assertNotIn('2000', [item.assetid for item in inventory.tradable()])
+        self.assertNotIn('3000', [item.assetid for item in inventory.marketable()])
+        self.assertEqual([item.assetid for item in inventory.by_classid('2')], ['2000'])
+        self.assertEqual(len(inventory.by_game(GameOptions.CS)), 7)
+        self.assertEqual(inventory.count_by_market_hash_name()['Sticker | Crown (Foil)'], 3)
+
+    def test_add_response_replaces_duplicate_assets(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        inventory.add_response({'assets': [{'assetid': '2000', 'contextid': '2', 'classid': '3', 'instanceid': '0',
+                                            'amount': '1'}],
+                                'descriptions': [description('3', 'Sticker | Crown (Foil)', marketable=0)]},
+                               GameOptions.CS)
+        self.assertEqual(len(inventory), 7)
+        self.assertEqual(inventory.by_classid('2'), [])
+        self.assertEqual(inventory.get('2000').market_hash_name, 'Sticker | Crown (Foil)')
+        self.assertEqual(len(inventory._descriptions), 3)
+        self.assertEqual(inventory.count_by_market_hash_name()['Sticker | Crown (Foil)'], 4)
+        self.assertNotIn('AK-47 | Redline (Field-Tested)', inventory.count_by_market_hash_name())
+
+    def test_refresh_reuses_rows(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        for _ in range(3):
+            inventory.add_response(INVENTORY_RESPONSE, GameOptions.CS)
+        self.assertEqual((len(inventory), len(inventory._asset_ids)), (7, 7))
+        self.assertEqual(len(inventory.tradable()), 6)
+        self.assertEqual(len(inventory.by_market_hash_name('Chroma 2 Case')), 5)
+
+    def test_same_asset_id_in_different_games(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        inventory.add_response({'assets': [{'assetid': '2000', 'contextid': '2', 'classid': '9', 'instanceid': '0',
+                                            'amount': '1'}],
+                                'descriptions': [dict(description('9', 'Treasure'), appid=570)]},
+                               GameOptions.DOTA2)
+        self.assertEqual(len(inventory), 8)
+        self.assertEqual(inventory.get('2000', GameOptions.CS).market_hash_name, 'AK-47 | Redline (Field-Tested)')
+        self.assertEqual(inventory.get('2000', GameOptions.DOTA2).market_hash_name, 'Treasure')
+        self.assertEqual(inventory.get('2000').appid, '730')
+        self.assertEqual([item.assetid for item in inventory.by_classid('2')], ['2000'])
+        self.assertEqual(len(inventory.by_game(GameOptions.DOTA2)), 1)
+
+    def test_same_classid_in_different_games(self):
+        inventory = Inventory.from_response(INVENTORY_RESPONSE, GameOptions.CS)
+        inventory.add_response({'assets': [{'assetid': '9000', 'contextid': '2', 'classid': '2', 'instanceid': '0',
+                                            'amount': '1'}],
+                                'descriptions': [dict(description('2', 'Treasure'), appid=570)]},
+                               GameOptions.DOTA2)
+        self.assertEqual([item.assetid for item in inventory.by_classid('2', GameOptions.CS)], ['2000'])
+        self.assertEqual([item.assetid for item in inventory.by_classid('2', GameOptions.DOTA2)], ['9000'])
+        self.assertEqual([item.assetid for item in inventory.by_classid('2')], ['2000', '9000'])
+
+
+class TestSnapshotInventories(TestCase):
+
+    def test_snapshot_merges_games_and_records_errors(self):
+        client = SteamClient('key')
+        client.was_login_executed = True
+        dota_response = {'success': 1,
+                         'assets': [{'contextid': '2', 'assetid': '9000', 'classid': '9', 'instanceid': '0',
+                                     'amount': '1'}],
+                         'descriptions': [dict(description('9', 'Treasure'), appid=570)]}
+        responses = {'730': INVENTORY_RESPONSE, '570': dota_response, '440': None}
+
+        def get(url, params=None):
+            return mock.Mock(**{'json.return_value': responses[url.split('/')[-2]]})
+
+        client._session.get = mock.Mock(side_effect=get)
+        snapshot = client.snapshot_inventories('76561198318883215', [GameOptions.CS, GameOptions.DOTA2, GameOptions.TF2])
+        self.assertEqual(len(snapshot.inventory), 8)
+        self.assertEqual([item.assetid for item in snapshot.inventory.by_game(GameOptions.DOTA2)], ['9000'])
+        self.assertEqual(set(snapshot.timings), {GameOptions.CS, GameOptions.DOTA2, GameOptions.TF2})
+        self.assertEqual(list(snapshot.errors), [GameOptions.TF2])
+        self.assertIsInstance(snapshot.errors[GameOptions.TF2], ApiException)
@@ -32,6 +32,15 @@ class TestMarket(TestCase):
         client.login(self.credentials.login, self.credentials.password, self.steam_guard_file)
         self.assertRaises(TooManyRequests, request_loop)
 
+    def test_fetch_prices(self):
+        client = SteamClient(self.credentials.api_key)
+        items = ['M4A1-S | Cyrex (Factory New)', 'AK-47 | Redline (Field-Tested)', 'M4A1-S | Cyrex (Factory New)']
+        stream = client.market.fetch_prices(items, GameOptions.CS)
+        results = {result.market_hash_name: result for result in stream}
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(result.price['success'] for result in results.values()))
+        self.assertEqual(stream.report['fetched'], 2)
+
     def test_get_price_history(self):
         with SteamClient(self.credentials.api_key, self.credentials.login,
                          self.credentials.password, self.steam_guard_file) as client:
@@ -49,6 +58,17 @@ class TestMarket(TestCase):
         self.assertTrue(len(listings.get("sell_listings")) == 1)
         self.assertIsInstance(next(iter(listings.get("sell_listings").values())).get("description"), dict)
 
+    def test_iter_my_market_listings(self):
+        client = SteamClient(self.credentials.api_key)
+        client.login(self.credentials.login, self.credentials.password, self.steam_guard_file)
+        listings = client.market.get_my_market_listings()
+        pages = list(client.market.iter_my_market_listings())
+        self.assertEqual(pages[0]["buy_orders"], listings["buy_orders"])
+        sell_listings = {}
+        for page in pages:
+            sell_listings.update(page["sell_listings"])
+        self.assertEqual(set(sell_listings.keys()), set(listings["sell_listings"].keys()))
+
     def test_create_and_remove_sell_listing(self):
         client = SteamClient(self.credentials.api_key)
         client.login(self.credentials.login, self.credentials.password, self.steam_guard_file)
@@ -0,0 +1,188 @@
+import threading
+from unittest import TestCase, mock
+
+from requests import ConnectionError
+
+from steampy.exceptions import ApiException, TooManyRequests
+from steampy.market import SteamMarket
+from steampy.models import GameOptions
+from steampy.rate_limit import RateLimiter
+
+
+def json_response(value: dict) -> mock.Mock:
+    return mock.Mock(status_code=200, **{'json.return_value': value})
+
+
+def logged_in_market() -> SteamMarket:
+    market = SteamMarket(mock.Mock())
+    market._set_login_executed({'steamid': '76561198318883215', 'identity_secret': 'c2VjcmV0'}, 'sessionid')
+    return market
+
+
+class TestCreateSellOrders(TestCase):
+
+    def test_confirms_all_listings_in_one_pass(self):
+        market = logged_in_market()
+
+        def post(url, data, headers=None):
+            if data['assetid'] == 'bad':
+                return json_response({'success': False, 'message': 'The item is no longer in your inventory'})
+            return json_response({'success': True, 'needs_mobile_confirmation': data['assetid'] != 'no_conf'})
+
+        market._session.post = mock.Mock(side_effect=post)
+        market._confirm_sell_listings = mock.Mock(return_value={'success': True, 'confirmed': ['1', '2'],
+                                                                'not_found': ['3']})
+        items = [(asset_id, GameOptions.CS, '100') for asset_id in ('1', '2', '3', 'bad', 'no_conf')]
+        results = market.create_sell_orders(items)
+        market._confirm_sell_listings.assert_called_once_with(['1', '2', '3'])
+        self.assertEqual([result.assetid for result in results], ['1', '2', '3', 'bad', 'no_conf'])
+        self.assertEqual([result.confirmed for result in results], [True, True, False, False, False])
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[2].error, ApiException)
+        self.assertIsInstance(results[3].error, ApiException)
+        self.assertIsNone(results[4].error)
+
+    def test_rejected_confirmation_sets_error(self):
+        market = logged_in_market()
+        market._session.post = mock.Mock(return_value=json_response({'success': True,
+                                                                     'needs_mobile_confirmation': True}))
+        market._confirm_sell_listings = mock.Mock(return_value={'success': False, 'confirmed': ['1', '2']})
+        results = market.create_sell_orders([('1', GameOptions.CS, '100'), ('2', GameOptions.CS, '100')])
+        self.assertEqual([result.confirmed for result in results], [False, False])
+        self.assertTrue(all(isinstance(result.error, ApiException) for result in results))
+
+    def test_confirmation_can_be_skipped(self):
+        market = logged_in_market()
+        market._session.post = mock.Mock(return_value=json_response({'success': True,
+                                                                     'needs_mobile_confirmation': True}))
+        market._confirm_sell_listings = mock.Mock()
+        results = market.create_sell_orders([('1', GameOptions.CS, '100')], confirm=False)
+        market._confirm_sell_listings.assert_not_called()
+        self.assertEqual((results[0].confirmed, results[0].error), (False, None))
+
+
+class TestCancelOrders(TestCase):
+
+    def test_cancel_sell_orders_retries_transient_failures(self):
+        market = logged_in_market()
+        statuses = {'1': [200], '2': [502, 200], '3': [400], '4': [503, 503, 503]}
+
+        def post(url, data=None, headers=None):
+            return mock.Mock(status_code=statuses[url.rsplit('/', 1)[1]].pop(0))
+
+        market._session.post = mock.Mock(side_effect=post)
+        results = market.cancel_sell_orders(['1', '2', '3', '4', '1'], retry_delay=0)
+        self.assertEqual(list(results), ['1', '2', '3', '4'])
+        self.assertEqual((results['1'].error, results['1'].attempts), (None, 1))
+        self.assertEqual((results['2'].error, results['2'].attempts), (None, 2))
+        self.assertIsInstance(results['3'].error, ApiException)
+        self.assertEqual(results['3'].attempts, 1)
+        self.assertIsInstance(results['4'].error, ApiException)
+        self.assertEqual(results['4'].attempts, 3)
+
+    def test_cancel_buy_orders(self):
+        market = logged_in_market()
+
+        def post(url, data, headers=None):
+            return json_response({'success': 1 if data['buy_orderid'] == '10' else 8})
+
+        market._session.post = mock.Mock(side_effect=post)
+        results = market.cancel_buy_orders(['10', '11'])
+        self.assertIsNone(results['10'].error)
+        self.assertIsInstance(results['11'].error, ApiException)
+
+    def test_cancel_all_listings_with_filter(self):
+        market = logged_in_market()
+        market.get_my_market_listings = mock.Mock(return_value={
+            'sell_listings': {'1': {'listing_id': '1', 'need_confirmation': True},
+                              '2': {'listing_id': '2', 'need_confirmation': False}},
+            'buy_orders': {'10': {'order_id': '10', 'quantity': 1}}})
+        market._session.post = mock.Mock(return_value=json_response({'success': 1}))
+        results = market.cancel_all_listings(filter=lambda listing: listing.get('need_confirmation', True))
+        self.assertEqual(list(results['sell_listings']), ['1'])
+        self.assertEqual(list(results['buy_orders']), ['10'])
+
+
+def price_session(responses: dict) -> mock.Mock:
+    # responses maps market_hash_name to the list of status codes (or exceptions) returned by consecutive requests
+    def get(url, params=None):
+        response = responses[params['market_hash_name']].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return mock.Mock(status_code=response, headers={},
+                         **{'json.return_value': {'success': True, 'lowest_price': params['market_hash_name']}})
+
+    return mock.Mock(rate_limiter=None, get=mock.Mock(side_effect=get))
+
+
+class TestFetchPrices(TestCase):
+
+    def test_duplicates_are_fetched_once(self):
+        session = price_session({'a': [200], 'b': [200]})
+        market = SteamMarket(session)
+        results = list(market.fetch_prices(['a', 'b', 'a'], GameOptions.CS))
+        self.assertEqual(sorted(result.market_hash_name for result in results), ['a', 'b'])
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_retries_and_report(self):
+        session = price_session({'a': [429, 200], 'b': [ConnectionError(), ConnectionError()], 'c': [200]})
+        market = SteamMarket(session)
+        stream = market.fetch_prices(['a', 'b', 'c'], GameOptions.CS, retries=1, retry_delay=0)
+        with mock.patch.object(RateLimiter, 'backoff', return_value=0.0) as backoff:
+            results = {result.market_hash_name: result for result in stream}
+        backoff.assert_called_once()
+        self.assertEqual(results['a'].price['lowest_price'], 'a')
+        self.assertIsNone(results['a'].error)
+        self.assertIsNone(results['b'].price)
+        self.assertIsNotNone(results['b'].error)
+        report = stream.report
+        self.assertEqual((report['requested'], report['fetched'], report['failed'], report['retries']), (3, 2, 1, 2))
+        self.assertGreaterEqual(report['elapsed'], 0)
+
+    def test_session_without_rate_limiter_gets_price_limit(self):
+        market = SteamMarket(price_session({'a': [200]}))
+        stream = market.fetch_prices(['a'], GameOptions.CS)
+        self.assertEqual(len(stream._rate_limiters), 1)
+        limiter = stream._rate_limiters[0]
+        self.assertEqual(limiter.classify('https://steamcommunity.com/market/priceoverview/'), RateLimiter.MARKET_PRICE)
+        self.assertIsNone(limiter.classify('https://steamcommunity.com/market/mylistings'))
+        self.assertEqual(market.fetch_prices(['a'], GameOptions.CS, sessions=[mock.Mock()])._rate_limiters, [None])
+        # a new stream keeps using the same limiter instead of starting with a full burst
+        self.assertIs(market.fetch_prices(['a'], GameOptions.CS)._rate_limiters[0], limiter)
+
+    def test_too_many_requests_not_retried_for_session_limiter(self):
+        session = price_session({'a': [429, 200]})
+        session.rate_limiter = RateLimiter()
+        results = list(SteamMarket(session).fetch_prices(['a'], GameOptions.CS, retry_delay=0))
+        self.assertIsInstance(results[0].error, TooManyRequests)
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_unexpected_error_and_close_do_not_block(self):
+        names = ['item%d' % i for i in range(10)]
+        responses = {name: [200] for name in names}
+        responses['item0'] = [KeyError('item0')]
+        session = price_session(responses)
+        closed = threading.Event()
+        get = session.get.side_effect
+
+        def blocking_get(url, params=None):
+            if params['market_hash_name'] == 'item1':
+                closed.wait(5)
+            return get(url, params)
+
+        session.get.side_effect = blocking_get
+        stream = SteamMarket(session).fetch_prices(names, GameOptions.CS)
+        results = []
+
+        def consume():
+            for result in stream:
+                results.append(result)
+                stream.close()
+                closed.set()
+
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        consumer.join(5)
+        self.assertFalse(consumer.is_alive())
+        self.assertIsInstance(results[0].error, KeyError)
+        self.assertEqual([result.market_hash_name for result in results], ['item0', 'item1'])
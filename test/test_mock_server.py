@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from benchmarks.load_test import percentile, run_load, steam_guard_for
+from benchmarks.mock_server import MockSteamServer, steam_id_for
+from steampy.client import SteamClient
+from steampy.models import GameOptions
+
+
+class TestMockServer(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockSteamServer(inventory_items=250, offers_per_account=3).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def logged_in_client(self, username: str) -> SteamClient:
+        client = SteamClient('key-' + username, http_adapter=self.server.adapter())
+        client.login(username, 'password', steam_guard_for(username))
+        return client
+
+    def test_login(self):
+        client = self.logged_in_client('login')
+        self.assertTrue(client.was_login_executed)
+        self.assertEqual(client.steam_guard['steamid'], steam_id_for('login'))
+        self.assertTrue(client.is_session_alive(max_age=0))
+
+    def test_accept_trade_offer_with_confirmation(self):
+        client = self.logged_in_client('trader')
+        offers = client.get_trade_offers()['response']['trade_offers_received']
+        self.assertEqual(len(offers), 3)
+        response = client.accept_trade_offer(offers[0]['tradeofferid'])
+        self.assertTrue(response['success'])
+        offer_ids = [offer['tradeofferid'] for offer in client.get_trade_offers()['response']['trade_offers_received']]
+        self.assertNotIn(offers[0]['tradeofferid'], offer_ids)
+        self.assertEqual(len(offer_ids), 3)
+
+    def test_inventory_pages(self):
+        client = self.logged_in_client('inventory')
+        inventory = client.fetch_inventory(client.steam_guard['steamid'], GameOptions.CS, page_size=100)
+        self.assertEqual(len(inventory), 250)
+
+    def test_market(self):
+        client = self.logged_in_client('market')
+        self.assertEqual(client.market.fetch_price('Case 1', GameOptions.CS)['lowest_price'], '$1.23')
+        self.assertEqual(len(client.market.get_my_market_listings()['sell_listings']), 55)
+
+    def test_rate_limit_injection(self):
+        with MockSteamServer(rate_limit_rate=1.0) as server:
+            client = SteamClient('key', http_adapter=server.adapter())
+            response = client._session.get('https://steamcommunity.com/market/priceoverview/')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(server.rate_limited, 1)
+
+    def test_run_load(self):
+        with MockSteamServer(offers_per_account=2, require_two_factor=False) as server:
+            report = run_load(server, accounts=3, duration=0.1, max_workers=3, accept_per_round=1)
+        self.assertEqual(report['login']['count'], 3)
+        self.assertEqual(report['login']['errors'], {})
+        self.assertGreaterEqual(report['accept_trade_offer']['count'], 3)
+        self.assertEqual(report['accept_trade_offer']['errors'], {})
+        self.assertGreater(report['_summary']['requests'], 0)
+
+    def test_percentile(self):
+        values = [i / 100 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.5)
+        self.assertEqual(percentile(values, 99), 0.99)
+        self.assertEqual(percentile([], 50), 0.0)
@@ -0,0 +1,147 @@
+import threading
+from unittest import TestCase
+
+from steampy.models import TradeOfferState
+from steampy.offer_watcher import TradeOfferWatcher, TradeOfferEventType
+
+
+class FakeResponse:
+    def __init__(self, response_dict: dict) -> None:
+        self._response_dict = response_dict
+
+    def json(self) -> dict:
+        return self._response_dict
+
+
+class FakeClient:
+    _api_key = 'key'
+
+    def __init__(self) -> None:
+        self.summary = {'pending_received_count': 0}
+        self.offers = []
+        self.offers_requests = 0
+
+    def get_trade_offers_summary(self) -> dict:
+        return {'response': dict(self.summary)}
+
+    def api_call(self, request_method, interface, api_method, version, params=None) -> FakeResponse:
+        self.offers_requests += 1
+        return FakeResponse({'response': {'trade_offers_received': [dict(offer) for offer in self.offers]}})
+
+
+def offer(offer_id: str, state: TradeOfferState, time_updated: int = 0) -> dict:
+    return {'tradeofferid': offer_id, 'trade_offer_state': state.value, 'time_updated': time_updated}
+
+
+class TestTradeOfferWatcher(TestCase):
+
+    def test_events(self):
+        client = FakeClient()
+        watcher = TradeOfferWatcher(client, merge=False)
+        accepted = []
+        watcher.on(TradeOfferEventType.ACCEPTED, accepted.append)
+        client.offers = [offer('1', TradeOfferState.Active), offer('2', TradeOfferState.Active)]
+        events = watcher.poll()
+        self.assertEqual([event.type for event in events], [TradeOfferEventType.NEW] * 2)
+        now = watcher._time_historical_cutoff
+        client.summary = {'pending_received_count': 2}
+        client.offers = [offer('1', TradeOfferState.Accepted, now + 5),
+                         offer('2', TradeOfferState.StateInEscrow, now + 5),
+                         offer('3', TradeOfferState.Declined, now + 5)]
+        events = watcher.poll()
+        self.assertEqual([(event.type, event.offer['tradeofferid']) for event in events],
+                         [(TradeOfferEventType.ACCEPTED, '1'), (TradeOfferEventType.CHANGED, '2')])
+        self.assertEqual(events[0].previous_state, TradeOfferState.Active)
+        self.assertEqual(len(accepted), 1)
+        self.assertEqual(watcher.offer_states, {'2': TradeOfferState.StateInEscrow})
+        client.offers = [offer('1', TradeOfferState.Accepted, now + 5), offer('2', TradeOfferState.Canceled, now + 6)]
+        client.summary = {'pending_received_count': 1}
+        self.assertEqual([event.type for event in watcher.poll()], [TradeOfferEventType.CANCELLED])
+        self.assertEqual(watcher.offer_states, {})
+
+    def test_pruned_and_old_accepted_offers_are_not_reported(self):
+        client = FakeClient()
+        watcher = TradeOfferWatcher(client, merge=False)
+        client.offers = [offer('1', TradeOfferState.Active)]
+        watcher.poll()
+        now = watcher._time_historical_cutoff
+        client.summary = {'pending_received_count': 1}
+        client.offers = [offer('1', TradeOfferState.Accepted, now + 1), offer('2', TradeOfferState.Active, now + 10)]
+        self.assertEqual([event.type for event in watcher.poll()],
+                         [TradeOfferEventType.ACCEPTED, TradeOfferEventType.NEW])
+        # offer 1 is older than the new cutoff and pruned, Steam may still return it
+        self.assertNotIn('1', watcher._states)
+        client.summary = {'pending_received_count': 2}
+        client.offers = [offer('1', TradeOfferState.Accepted, now + 1), offer('3', TradeOfferState.Accepted, now - 100)]
+        self.assertEqual(watcher.poll(), [])
+
+    def test_failing_callback_does_not_drop_events(self):
+        client = FakeClient()
+        watcher = TradeOfferWatcher(client, merge=False)
+        watcher.poll()
+        now = watcher._time_historical_cutoff
+        received = []
+
+        def accept(event):
+            received.append(event.offer['tradeofferid'])
+            if event.offer['tradeofferid'] == '1' and received.count('1') == 1:
+                raise ConnectionError
+
+        watcher.on(TradeOfferEventType.NEW, accept)
+        client.summary = {'pending_received_count': 2}
+        client.offers = [offer('1', TradeOfferState.Active, now + 1), offer('2', TradeOfferState.Active, now + 2)]
+        with self.assertLogs('steampy.offer_watcher', 'ERROR'):
+            self.assertEqual(len(watcher.poll()), 2)
+        self.assertEqual(received, ['1', '2'])
+        # the failed event is emitted again on the next poll although the summary did not change
+        self.assertEqual([event.offer['tradeofferid'] for event in watcher.poll()], ['1'])
+        self.assertEqual(received, ['1', '2', '1'])
+        self.assertEqual(watcher.poll(), [])
+
+    def test_run_survives_poll_errors(self):
+        client = FakeClient()
+        watcher = TradeOfferWatcher(client, interval=0, merge=False)
+        summaries = [ConnectionError(), {'response': {}}]
+
+        def get_trade_offers_summary():
+            summary = summaries.pop(0) if summaries else {'response': {'pending_received_count': 1}}
+            if isinstance(summary, Exception):
+                raise summary
+            return summary
+
+        client.get_trade_offers_summary = get_trade_offers_summary
+        stop_event = threading.Event()
+        watcher.on(TradeOfferEventType.NEW, lambda event: stop_event.set())
+        client.offers = [offer('1', TradeOfferState.Active, 1)]
+        with self.assertLogs('steampy.offer_watcher', 'ERROR'):
+            watcher.run(stop_event)
+        self.assertTrue(stop_event.is_set())
+        self.assertEqual((watcher._delay(0), watcher._delay(1)), (0, 0))
+        watcher.interval = 60
+        self.assertEqual([watcher._delay(failures) for failures in (0, 1, 2, 5, 10)], [60, 60, 120, 900, 900])
+
+    def test_pruned_offers_are_capped(self):
+        client = FakeClient()
+        watcher = TradeOfferWatcher(client, merge=False)
+        watcher.MAX_PRUNED = 2
+        watcher.poll()
+        now = watcher._time_historical_cutoff
+        for offer_id in range(5):
+            client.summary = {'pending_received_count': offer_id}
+            client.offers = [offer(str(offer_id), TradeOfferState.Active, now + offer_id)]
+            watcher.poll()
+            client.summary = {'pending_received_count': offer_id + 100}
+            client.offers = [offer(str(offer_id), TradeOfferState.Declined, now + offer_id)]
+            watcher.poll()
+        self.assertEqual(list(watcher._pruned), ['2', '3'])
+
+    def test_skip_when_summary_unchanged(self):
+        client = FakeClient()
+        watcher = TradeOfferWatcher(client, merge=False, full_refresh_every=3)
+        watcher.poll()
+        watcher.poll()
+        watcher.poll()
+        watcher.poll()
+        self.assertEqual(client.offers_requests, 2)
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(client.offers_requests, 2)
@@ -0,0 +1,110 @@
+import threading
+import time
+from unittest import TestCase, mock
+
+from requests.adapters import HTTPAdapter
+
+from steampy.pool import SteamClientPool
+from steampy.rate_limit import RateLimiter
+
+
+class TestSteamClientPool(TestCase):
+
+    def test_clients_share_connection_pool_and_rate_limiter(self):
+        rate_limiter = RateLimiter()
+        with SteamClientPool(rate_limiter=rate_limiter) as pool:
+            first = pool.add_client('key', 'first')
+            second = pool.add_client('key', 'second')
+            for client in (first, second):
+                self.assertIs(client._session.get_adapter('https://api.steampowered.com/'), pool.http_adapter)
+                self.assertIs(client._session.get_adapter('https://steamcommunity.com/'), pool.http_adapter)
+                self.assertIs(client._session.rate_limiter, rate_limiter)
+            self.assertIsNot(first._session.cookies, second._session.cookies)
+            self.assertEqual(len(pool), 2)
+            with self.assertRaises(ValueError):
+                pool.add_client('key', 'first')
+
+    def test_custom_http_adapter(self):
+        adapter = HTTPAdapter()
+        with SteamClientPool(http_adapter=adapter) as pool:
+            client = pool.add_client('key', 'first')
+            self.assertIs(pool.http_adapter, adapter)
+            self.assertIs(client._session.get_adapter('https://steamcommunity.com/'), adapter)
+
+    def test_api_call_uses_client_session(self):
+        with SteamClientPool() as pool:
+            client = pool.add_client('key', 'bot')
+            client._session.get = mock.Mock(return_value=mock.Mock(text='{}'))
+            client.api_call('GET', 'IEconService', 'GetTradeOffersSummary', 'v1', {'key': 'key'})
+            client._session.get.assert_called_once_with(
+                'https://api.steampowered.com/IEconService/GetTradeOffersSummary/v1', params={'key': 'key'})
+
+    def test_map_collects_results_and_errors(self):
+        with SteamClientPool() as pool:
+            pool.add_client('key', 'ok')
+            pool.add_client('key', 'broken')
+
+            def func(client):
+                if client.username == 'broken':
+                    raise ValueError(client.username)
+                return client.username
+
+            results = pool.map(func)
+            self.assertEqual(results['ok'], 'ok')
+            self.assertIsInstance(results['broken'], ValueError)
+
+    def test_tasks_of_one_account_run_one_at_a_time(self):
+        with SteamClientPool(max_workers=4) as pool:
+            pool.add_client('key', 'bot')
+            running = []
+            overlaps = []
+            lock = threading.Lock()
+
+            def func(client):
+                with lock:
+                    running.append(client)
+                    overlaps.append(len(running))
+                time.sleep(0.01)
+                with lock:
+                    running.remove(client)
+
+            futures = [pool.submit('bot', func) for _ in range(4)]
+            for future in futures:
+                future.result()
+            self.assertEqual(max(overlaps), 1)
+
+    def test_busy_account_does_not_starve_others(self):
+        with SteamClientPool(max_workers=2) as pool:
+            pool.add_client('key', 'busy')
+            pool.add_client('key', 'other')
+            release = threading.Event()
+            busy = [pool.submit('busy', lambda client: release.wait(5)) for _ in range(10)]
+            # with a lock per account the busy tasks took both workers
+            self.assertEqual(pool.submit('other', lambda client: client.username).result(timeout=5), 'other')
+            release.set()
+            for future in busy:
+                future.result(timeout=5)
+
+    def test_submit_from_task_of_same_account(self):
+        with SteamClientPool(max_workers=1) as pool:
+            pool.add_client('key', 'bot')
+            order = []
+
+            def first(client):
+                order.append('first')
+                return pool.submit('bot', lambda client: order.append('second'))
+
+            inner = pool.submit('bot', first).result(timeout=5)
+            inner.result(timeout=5)
+            self.assertEqual(order, ['first', 'second'])
+
+    def test_submit_after_close_fails_future(self):
+        pool = SteamClientPool(max_workers=1)
+        pool.add_client('key', 'bot')
+        pool.close()
+        for _ in range(2):
+            future = pool.submit('bot', lambda client: client.username)
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+        self.assertFalse(pool._queues['bot'].running)
+        self.assertEqual(len(pool._queues['bot'].tasks), 0)
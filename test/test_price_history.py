@@ -0,0 +1,55 @@
+from unittest import TestCase, skipUnless
+
+from steampy import price_history
+from steampy.price_history import DAY, HOUR, PriceHistory, parse_dates
+
+RESPONSE = {'success': True, 'price_prefix': '$', 'price_suffix': '',
+            'prices': [['Jul 02 2014 01: +0', 10.0, '1'],
+                       ['Jul 02 2014 02: +0', 20.0, '3'],
+                       ['Jul 03 2014 01: +0', 30.0, '2'],
+                       ['Jul 04 2014 01: +0', 15.0, '4'],
+                       ['Jul 05 2014 01: +0', 25.0, '0']]}
+
+
+@skipUnless(price_history.np is not None, 'numpy is not installed')
+class TestPriceHistory(TestCase):
+
+    def test_parse_dates(self):
+        self.assertEqual(list(parse_dates(['Jul 02 2014 01: +0', 'Dec 31 2020 23: +0'])), [1404262800, 1609455600])
+
+    def test_from_response(self):
+        history = PriceHistory.from_response(RESPONSE, 'Chroma 2 Case')
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history.volumes.tolist(), [1, 3, 2, 4, 0])
+        self.assertEqual(str(history.dates[0]), '2014-07-02T01:00:00')
+
+    def test_from_responses_matches_from_response(self):
+        histories = PriceHistory.from_responses({'a': RESPONSE, 'empty': {'success': True, 'prices': []},
+                                                 'b': {'prices': RESPONSE['prices'][:2]}})
+        self.assertEqual(histories['a'].prices.tolist(), PriceHistory.from_response(RESPONSE).prices.tolist())
+        self.assertEqual(len(histories['empty']), 0)
+        self.assertEqual(histories['b'].timestamps.tolist(), histories['a'].timestamps[:2].tolist())
+
+    def test_resample_and_vwap(self):
+        history = PriceHistory.from_response(RESPONSE)
+        daily = history.resample(DAY)
+        self.assertEqual(len(daily), 4)
+        self.assertEqual(daily.prices.tolist(), [17.5, 30.0, 15.0, 25.0])
+        self.assertEqual(daily.volumes.tolist(), [4, 2, 4, 0])
+        self.assertAlmostEqual(history.vwap(), (10 + 60 + 60 + 60) / 10)
+        self.assertAlmostEqual(history.vwap(end=history.timestamps[0] + HOUR), 10.0)
+
+    def test_rolling_median(self):
+        medians = PriceHistory.from_response(RESPONSE).rolling_median(3)
+        self.assertEqual(medians[2:].tolist(), [20.0, 20.0, 25.0])
+        self.assertTrue(all(value != value for value in medians[:2]))
+
+    def test_percentile_is_volume_weighted(self):
+        history = PriceHistory.from_response(RESPONSE)
+        self.assertEqual(history.percentile(50), 15.0)
+        self.assertEqual(history.percentile([0, 100]).tolist(), [10.0, 30.0])
+
+    def test_volatility(self):
+        history = PriceHistory.from_response(RESPONSE)
+        self.assertGreater(history.volatility(), 0)
+        self.assertIsNone(history.between(end=history.timestamps[1] + 1).volatility())
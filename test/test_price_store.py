@@ -0,0 +1,81 @@
+import math
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+
+from steampy import price_history
+from steampy.models import GameOptions
+from steampy.price_history import PriceHistory
+
+if price_history.np is not None:
+    from steampy.price_store import PriceStore
+
+NAME = 'Chroma 2 Case'
+RESPONSE = {'success': True,
+            'prices': [['Jul 02 2014 01: +0', 10.0, '1'],
+                       ['Jul 02 2014 02: +0', 20.0, '3'],
+                       ['Jul 03 2014 01: +0', 30.0, '2']]}
+
+
+@skipUnless(price_history.np is not None, 'numpy is not installed')
+class TestPriceStore(TestCase):
+
+    def test_append_history_only_writes_new_points(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = PriceStore(directory)
+            self.assertEqual(store.append_history(GameOptions.CS, NAME, {'prices': RESPONSE['prices'][:2]}), 2)
+            self.assertEqual(store.append_history(GameOptions.CS, NAME, RESPONSE), 1)
+            self.assertEqual(store.append_history(GameOptions.CS, NAME, RESPONSE), 0)
+            history = PriceStore(directory).load_history(GameOptions.CS, NAME)
+            expected = PriceHistory.from_response(RESPONSE)
+            self.assertEqual(history.timestamps.tolist(), expected.timestamps.tolist())
+            self.assertEqual(history.prices.tolist(), [10.0, 20.0, 30.0])
+            self.assertEqual(history.volumes.tolist(), [1, 3, 2])
+
+    def test_load_history_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = PriceStore(directory)
+            store.append_history(GameOptions.CS, NAME, RESPONSE)
+            history = store.load_history(GameOptions.CS, NAME)
+            self.assertIsInstance(history.prices.base, price_history.np.memmap)
+
+    def test_load_histories_and_missing_items(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = PriceStore(directory)
+            store.append_history(GameOptions.CS, NAME, RESPONSE)
+            store.append_history(GameOptions.CS, 'AWP | Asiimov (Field-Tested)', RESPONSE)
+            store.append_history(GameOptions.DOTA2, 'Treasure', RESPONSE)
+            self.assertEqual(set(store.load_histories(GameOptions.CS)), {NAME, 'AWP | Asiimov (Field-Tested)'})
+            self.assertEqual(len(store.load_history(GameOptions.TF2, NAME)), 0)
+            self.assertIn((GameOptions.DOTA2, 'Treasure'), store)
+            self.assertEqual(len(store), 3)
+
+    def test_append_price(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = PriceStore(directory)
+            store.append_price(GameOptions.CS, NAME, {'success': True, 'lowest_price': '$1.05',
+                                                      'volume': '1,234', 'median_price': '$1.00'}, timestamp=100)
+            store.append_price(GameOptions.CS, NAME, {'success': True, 'lowest_price': '$1.10'}, timestamp=200)
+            prices = store.load_prices(GameOptions.CS, NAME)
+            self.assertEqual(prices['timestamp'].tolist(), [100, 200])
+            self.assertEqual(prices['lowest_price'].tolist(), [1.05, 1.10])
+            self.assertEqual(prices['volume'].tolist(), [1234, -1])
+            self.assertTrue(math.isnan(prices['median_price'][1]))
+
+    def test_append_price_above_thousand(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = PriceStore(directory)
+            for timestamp, price in enumerate(['$1,234.56', '1.234,56€', '1 234,56 pуб.', '¥ 1,234', '1,--€']):
+                store.append_price(GameOptions.CS, NAME, {'success': True, 'lowest_price': price}, timestamp=timestamp)
+            prices = store.load_prices(GameOptions.CS, NAME)
+            self.assertEqual(prices['lowest_price'].tolist(), [1234.56, 1234.56, 1234.56, 1234.0, 1.0])
+
+    def test_incomplete_record_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = PriceStore(directory)
+            store.append_history(GameOptions.CS, NAME, {'prices': RESPONSE['prices'][:1]})
+            with open(os.path.join(directory, '0.history'), 'ab') as f:
+                f.write(b'\x00' * 5)
+            self.assertEqual(len(store.load_history(GameOptions.CS, NAME)), 1)
+            store.append_history(GameOptions.CS, NAME, RESPONSE)
+            self.assertEqual(store.load_history(GameOptions.CS, NAME).prices.tolist(), [10.0, 20.0, 30.0])
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from steampy.models import SteamUrl
+from steampy.rate_limit import RateLimit, RateLimiter, TokenBucket, parse_retry_after
+
+
+class TestRateLimit(TestCase):
+
+    def test_token_bucket_burst_then_wait(self):
+        bucket = TokenBucket(RateLimit(10, 1, 2))
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_token_bucket_block_for(self):
+        bucket = TokenBucket(RateLimit(10, 1))
+        bucket.block_for(5)
+        self.assertAlmostEqual(bucket.delay(), 5, places=1)
+        self.assertAlmostEqual(bucket.reserve(), 5, places=1)
+
+    def test_classify(self):
+        rate_limiter = RateLimiter()
+        self.assertEqual(rate_limiter.classify(SteamUrl.COMMUNITY_URL + '/market/priceoverview/'),
+                         RateLimiter.MARKET_PRICE)
+        self.assertEqual(rate_limiter.classify(SteamUrl.COMMUNITY_URL + '/market/mylistings/'), RateLimiter.MARKET)
+        self.assertEqual(rate_limiter.classify(SteamUrl.COMMUNITY_URL + '/mobileconf/conf'), RateLimiter.MOBILECONF)
+        self.assertEqual(rate_limiter.classify(SteamUrl.COMMUNITY_URL + '/inventory/76561198318883215/730/2'),
+                         RateLimiter.INVENTORY)
+        self.assertEqual(rate_limiter.classify(SteamUrl.API_URL + '/IEconService/GetTradeOffers/v1'),
+                         RateLimiter.WEB_API)
+        self.assertIsNone(rate_limiter.classify(SteamUrl.COMMUNITY_URL + '/tradeoffer/1'))
+
+    def test_disabled_family(self):
+        rate_limiter = RateLimiter({RateLimiter.MARKET: None})
+        self.assertIsNone(rate_limiter.classify(SteamUrl.COMMUNITY_URL + '/market/mylistings/'))
+
+    def test_acquire_and_metrics(self):
+        rate_limiter = RateLimiter({RateLimiter.MOBILECONF: RateLimit(100, 1, 1)})
+        url = SteamUrl.COMMUNITY_URL + '/mobileconf/conf'
+        start = time.monotonic()
+        rate_limiter.acquire(url)
+        rate_limiter.acquire(url)
+        self.assertGreaterEqual(time.monotonic() - start, 0.009)
+        metrics = rate_limiter.metrics()[RateLimiter.MOBILECONF]
+        self.assertEqual(metrics['requests'], 2)
+        self.assertEqual(metrics['throttled'], 1)
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_acquire_async_prepays_one_request(self):
+        rate_limiter = RateLimiter({RateLimiter.MOBILECONF: RateLimit(100, 1, 1)})
+        url = SteamUrl.COMMUNITY_URL + '/mobileconf/conf'
+        asyncio.run(rate_limiter.acquire_async(url))
+        with rate_limiter.prepaid(url):
+            self.assertEqual(rate_limiter.acquire(url), 0.0)
+            self.assertGreater(rate_limiter.acquire(url), 0)
+        metrics = rate_limiter.metrics()[RateLimiter.MOBILECONF]
+        self.assertEqual((metrics['requests'], metrics['throttled'], metrics['queue_depth']), (2, 1, 0))
+
+    def test_backoff(self):
+        rate_limiter = RateLimiter(backoff_base=1, backoff_max=3)
+        url = SteamUrl.COMMUNITY_URL + '/market/priceoverview/'
+        self.assertEqual(rate_limiter.backoff(url, 7), 7)
+        self.assertEqual(rate_limiter.backoff(url), 2)
+        self.assertEqual(rate_limiter.backoff(url), 3)
+        rate_limiter.record_success(url)
+        self.assertEqual(rate_limiter.backoff(url), 1)
+        self.assertEqual(rate_limiter.metrics()[RateLimiter.MARKET_PRICE]['too_many_requests'], 4)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
@@ -0,0 +1,141 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase, mock
+
+from requests.cookies import RequestsCookieJar
+
+from steampy.client import SteamClient
+from steampy.session_store import FileSessionStore, SessionStore, SQLiteSessionStore, dump_cookies, load_cookies
+
+STEAM_GUARD = json.dumps({'steamid': '76561198318883215', 'shared_secret': 'c2VjcmV0', 'identity_secret': 'c2VjcmV0'})
+
+
+class FakeResponse:
+    def __init__(self, location: str) -> None:
+        self.status_code = 302
+        self.headers = {'Location': location}
+
+    def close(self) -> None:
+        pass
+
+
+ALIVE = FakeResponse('https://steamcommunity.com/id/bot/')
+DEAD = FakeResponse('https://steamcommunity.com/login/home/?goto=%2Fmy%2F')
+
+
+class TestSessionStore(TestCase):
+
+    def test_dump_and_load_cookies(self):
+        jar = RequestsCookieJar()
+        jar.set('sessionid', 'abc', domain='steamcommunity.com')
+        jar.set('steamLoginSecure', 'token', domain='steamcommunity.com', secure=True, rest={'HttpOnly': None})
+        jar.set('expired', 'x', domain='steamcommunity.com', expires=int(time.time()) - 10)
+        restored = RequestsCookieJar()
+        load_cookies(restored, json.loads(json.dumps(dump_cookies(jar))))
+        self.assertEqual(restored.get_dict(), {'sessionid': 'abc', 'steamLoginSecure': 'token'})
+        self.assertTrue(next(cookie for cookie in restored if cookie.name == 'steamLoginSecure').secure)
+
+    def test_file_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileSessionStore(directory)
+            self.assertIsNone(store.load('bot'))
+            store.save('bot', {'cookies': [], 'saved_at': 1})
+            self.assertEqual(FileSessionStore(directory).load('bot'), {'cookies': [], 'saved_at': 1})
+            self.assertEqual(os.stat(os.path.join(directory, 'bot.json')).st_mode & 0o777, 0o600)
+            store.delete('bot')
+            store.delete('bot')
+            self.assertIsNone(store.load('bot'))
+
+    def test_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sessions.sqlite')
+            store = SQLiteSessionStore(path)
+            store.save('bot', {'cookies': [], 'saved_at': 1})
+            self.assertEqual(SQLiteSessionStore(path).load('bot'), {'cookies': [], 'saved_at': 1})
+            store.delete('bot')
+            self.assertIsNone(store.load('bot'))
+
+    def test_incomplete_store_cannot_be_created(self):
+        class LoadOnlyStore(SessionStore):
+            def load(self, username):
+                return None
+
+        with self.assertRaises(TypeError):
+            LoadOnlyStore()
+
+    def test_login_restores_saved_session(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileSessionStore(directory)
+            jar = RequestsCookieJar()
+            jar.set('sessionid', 'abc', domain='steamcommunity.com')
+            store.save('bot', {'cookies': dump_cookies(jar), 'saved_at': time.time()})
+            client = SteamClient('key', session_store=store)
+            client._session.get = mock.Mock(return_value=ALIVE)
+            with mock.patch('steampy.client.LoginExecutor') as login_executor:
+                client.login('bot', 'password', STEAM_GUARD)
+            login_executor.assert_not_called()
+            self.assertTrue(client.was_login_executed)
+            self.assertEqual(client.market._session_id, 'abc')
+
+    def test_login_falls_back_when_saved_session_is_dead(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileSessionStore(directory)
+            jar = RequestsCookieJar()
+            jar.set('sessionid', 'expired', domain='steamcommunity.com')
+            store.save('bot', {'cookies': dump_cookies(jar), 'saved_at': time.time()})
+            client = SteamClient('key', session_store=store)
+            client._session.get = mock.Mock(return_value=DEAD)
+
+            def login(*args, **kwargs):
+                client._session.cookies.set('sessionid', 'fresh', domain='steamcommunity.com')
+                return mock.Mock()
+
+            with mock.patch('steampy.client.LoginExecutor', side_effect=login) as login_executor:
+                client.login('bot', 'password', STEAM_GUARD)
+            login_executor.assert_called_once()
+            self.assertEqual(store.load('bot')['cookies'][0]['value'], 'fresh')
+
+
+class TestSessionAlive(TestCase):
+
+    def logged_in_client(self, **kwargs) -> SteamClient:
+        client = SteamClient('key', **kwargs)
+        client._session.cookies.set('sessionid', 'abc', domain='steamcommunity.com')
+        with mock.patch('steampy.client.LoginExecutor'):
+            client.login('bot', 'password', STEAM_GUARD)
+        return client
+
+    def test_is_session_alive_uses_cached_result(self):
+        client = self.logged_in_client(session_alive_ttl=60)
+        client._session.get = mock.Mock(return_value=DEAD)
+        self.assertTrue(client.is_session_alive())
+        client._session.get.assert_not_called()
+        self.assertFalse(client.is_session_alive(max_age=0))
+        client._session.get.assert_called_once_with('https://steamcommunity.com/my/', allow_redirects=False,
+                                                    stream=True)
+        self.assertFalse(client.is_session_alive())
+        client._session.get.assert_called_once()
+
+    def test_logout_always_checks_session(self):
+        client = self.logged_in_client(session_alive_ttl=60)
+        client._session.post = mock.Mock()
+        client._session.get = mock.Mock(return_value=ALIVE)
+        with self.assertRaises(Exception):
+            client.logout()
+        client._session.get = mock.Mock(return_value=DEAD)
+        client.logout()
+        self.assertFalse(client.was_login_executed)
+
+    def test_keep_alive_relogins_when_session_is_dead(self):
+        client = self.logged_in_client()
+        client._session.get = mock.Mock(return_value=DEAD)
+        relogged_in = threading.Event()
+        client.relogin = mock.Mock(side_effect=lambda: relogged_in.set())
+        client.start_keep_alive(interval=0.01)
+        try:
+            self.assertTrue(relogged_in.wait(1))
+        finally:
+            client.stop_keep_alive()
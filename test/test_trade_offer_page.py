@@ -0,0 +1,80 @@
+from unittest import TestCase, mock
+
+from steampy.client import SteamClient
+from steampy.exceptions import SevenDaysHoldException
+
+TRADE_OFFER_PAGE = '''
+<script>
+    var g_ulTradePartnerSteamID = '76561198318883215';
+    var g_daysMyEscrow = 0;
+    var g_daysTheirEscrow = 15;
+</script>
+'''
+
+
+def logged_in_client() -> SteamClient:
+    client = SteamClient('key')
+    client.was_login_executed = True
+    client.steam_guard = {'steamid': '76561198000000000', 'identity_secret': 'c2VjcmV0'}
+    client._session.cookies.set('sessionid', 'abc', domain='steamcommunity.com')
+    return client
+
+
+def active_offer(**offer) -> dict:
+    return {'response': {'offer': dict(offer, tradeofferid='1', trade_offer_state=2)}}
+
+
+class TestTradeOfferPage(TestCase):
+
+    def test_accept_uses_account_id_from_offer(self):
+        client = logged_in_client()
+        client.get_trade_offer = mock.Mock(return_value=active_offer(accountid_other=358617488))
+        client._session.get = mock.Mock(return_value=mock.Mock(text=TRADE_OFFER_PAGE))
+        client._session.post = mock.Mock(return_value=mock.Mock(**{'json.return_value': {'tradeid': '2'}}))
+        client.accept_trade_offer('1')
+        self.assertEqual(client._session.post.call_args[1]['data']['partner'], '76561198318883216')
+
+    def test_new_device_hold_with_account_id_from_offer(self):
+        client = logged_in_client()
+        client.get_trade_offer = mock.Mock(return_value=active_offer(accountid_other=358617487))
+        client._session.get = mock.Mock(return_value=mock.Mock(
+            text='You have logged in from a new device. In order to protect the items in your inventory'))
+        client._session.post = mock.Mock()
+        with self.assertRaises(SevenDaysHoldException):
+            client.accept_trade_offer('1')
+        client._session.post.assert_not_called()
+
+    def test_accept_loads_offer_page_once(self):
+        client = logged_in_client()
+        client.get_trade_offer = mock.Mock(return_value=active_offer())
+        client._session.get = mock.Mock(return_value=mock.Mock(text=TRADE_OFFER_PAGE))
+        client._session.post = mock.Mock(return_value=mock.Mock(**{'json.return_value': {'tradeid': '2'}}))
+        client.accept_trade_offer('1')
+        client.accept_trade_offer('1')
+        client._session.get.assert_called_once()
+        self.assertEqual(client._session.post.call_args[1]['data']['partner'], '76561198318883215')
+
+    def test_new_device_hold(self):
+        client = logged_in_client()
+        client.get_trade_offer = mock.Mock(return_value=active_offer())
+        client._session.get = mock.Mock(return_value=mock.Mock(
+            text='You have logged in from a new device. In order to protect the items in your inventory'))
+        with self.assertRaises(SevenDaysHoldException):
+            client.accept_trade_offer('1')
+
+    def test_escrow_duration_is_cached(self):
+        client = logged_in_client()
+        client._session.get = mock.Mock(return_value=mock.Mock(text=TRADE_OFFER_PAGE))
+        url = 'https://steamcommunity.com/tradeoffer/new/?partner=358617487&token=abc'
+        self.assertEqual(client.get_escrow_duration(url), 15)
+        self.assertEqual(client.get_escrow_duration(url), 15)
+        client._session.get.assert_called_once()
+
+    def test_page_without_facts_is_not_cached(self):
+        client = logged_in_client()
+        client._session.get = mock.Mock(side_effect=[mock.Mock(text='<html>Sign In</html>'),
+                                                     mock.Mock(text=TRADE_OFFER_PAGE)])
+        url = 'https://steamcommunity.com/tradeoffer/new/?partner=358617487&token=abc'
+        with self.assertRaises(ValueError):
+            client.get_escrow_duration(url)
+        self.assertEqual(client.get_escrow_duration(url), 15)
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from benchmarks import fixtures
+from steampy.client import SteamClient
+from steampy.confirmation import ConfirmationExecutor
+from steampy.exceptions import FixtureNotFound
+from steampy.models import GameOptions
+from steampy.session import SteamSession
+from steampy.transport import Cassette, RecordingAdapter, ReplayAdapter, request_key
+
+MARKET_URL = 'https://steamcommunity.com/market/'
+
+
+def market_cassette(path: str = None) -> Cassette:
+    cassette = Cassette(path)
+    cassette.add('GET', MARKET_URL, '<html>first</html>',
+                 headers=[('Set-Cookie', 'sessionid=abc; Path=/'),
+                          ('Set-Cookie', 'steamLoginSecure=secure; Path=/'),
+                          ('Content-Type', 'text/html; charset=utf-8')])
+    cassette.add('GET', MARKET_URL, '<html>second</html>')
+    cassette.add('POST', MARKET_URL + 'removelisting/1', '{"success": 1}', data={'sessionid': 'abc'})
+    return cassette
+
+
+class TestTransport(TestCase):
+
+    def test_request_key_ignores_volatile_params(self):
+        key = request_key('get', 'https://steamcommunity.com/mobileconf/conf?p=1&a=2&k=key&t=1&tag=conf')
+        self.assertEqual(key, 'GET https://steamcommunity.com/mobileconf/conf?a=2&p=1&tag=conf')
+        self.assertEqual(request_key('POST', MARKET_URL, b'b=2&a=1&donotcache=123'),
+                         request_key('POST', MARKET_URL + '?a=1', 'b=2'))
+
+    def test_replay(self):
+        session = SteamSession(http_adapter=ReplayAdapter(market_cassette()))
+        response = session.get(MARKET_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, '<html>first</html>')
+        self.assertEqual(session.cookies.get_dict(), {'sessionid': 'abc', 'steamLoginSecure': 'secure'})
+        self.assertEqual(session.get(MARKET_URL).text, '<html>second</html>')
+        self.assertEqual(session.get(MARKET_URL).text, '<html>second</html>')
+        self.assertEqual(session.post(MARKET_URL + 'removelisting/1', data={'sessionid': 'xyz'}).json(),
+                         {'success': 1})
+
+    def test_replay_missing(self):
+        session = SteamSession(http_adapter=ReplayAdapter(market_cassette(), repeat=False))
+        session.get(MARKET_URL)
+        session.get(MARKET_URL)
+        with self.assertRaises(FixtureNotFound):
+            session.get(MARKET_URL)
+        with self.assertRaises(FixtureNotFound):
+            session.get(MARKET_URL + 'other')
+
+    def test_latency(self):
+        session = SteamSession(http_adapter=ReplayAdapter(market_cassette(), latency=0.2, jitter=0.1))
+        with mock.patch('time.sleep') as sleep:
+            session.get(MARKET_URL)
+        delay = sleep.call_args[0][0]
+        self.assertTrue(0.2 <= delay <= 0.3)
+
+    def test_record_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'market.jsonl')
+            session = SteamSession(http_adapter=RecordingAdapter(path, adapter=ReplayAdapter(market_cassette())))
+            self.assertEqual(session.get(MARKET_URL).text, '<html>first</html>')
+            self.assertEqual(session.get(MARKET_URL).text, '<html>second</html>')
+            with open(path, 'r') as f:
+                self.assertEqual(len(f.readlines()), 2)
+            replay_session = SteamSession(http_adapter=ReplayAdapter(path))
+            self.assertEqual(replay_session.get(MARKET_URL).text, '<html>first</html>')
+            self.assertEqual(replay_session.cookies.get('sessionid'), 'abc')
+            self.assertEqual(replay_session.get(MARKET_URL).text, '<html>second</html>')
+
+    def test_client_against_fixtures(self):
+        cassette = fixtures.steam_cassette(inventory_items=20, sell_listings=10, trade_offers=3)
+        client = SteamClient('key', http_adapter=ReplayAdapter(cassette))
+        client.login(fixtures.USERNAME, 'password', json.dumps(fixtures.STEAM_GUARD))
+        self.assertEqual(len(client.get_my_inventory(GameOptions.CS)), 20)
+        self.assertEqual(len(client.market.get_my_market_listings()['sell_listings']), 11)
+        offers = client.get_trade_offers()['response']['trade_offers_received']
+        self.assertEqual(len(offers), 3)
+        offer_ids = [offer['tradeofferid'] for offer in offers]
+        executor = ConfirmationExecutor(fixtures.STEAM_GUARD['identity_secret'], fixtures.STEAM_ID, client._session)
+        response = executor.confirm_trade_offers(offer_ids)
+        self.assertTrue(response['success'])
+        self.assertEqual(response['confirmed'], offer_ids)
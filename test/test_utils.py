@@ -56,4 +56,106 @@ class TestUtils(TestCase):
     def test_get_key_value_from_url_case_insensitive(self):
         url = 'https://steamcommunity.com/tradeoffer/new/?Partner=aaa&Token=bbb'
         self.assertEqual(utils.get_key_value_from_url(url, 'partner', case_sensitive=False), 'aaa')
-        self.assertEqual(utils.get_key_value_from_url(url, 'token', case_sensitive=False), 'bbb')
\ No newline at end of file
+        self.assertEqual(utils.get_key_value_from_url(url, 'token', case_sensitive=False), 'bbb')
+
+    def test_listings_parsers_return_same_listings(self):
+        expected = utils.get_market_listings_from_html(MARKET_LISTINGS_HTML)
+        self.assertEqual(expected['sell_listings']['3185447744373414153'],
+                         {'listing_id': '3185447744373414153', 'buyer_pay': '$0.05', 'you_receive': '$0.04',
+                          'created_on': '14 Oct', 'need_confirmation': False})
+        self.assertTrue(expected['sell_listings']['3185447744373414999']['need_confirmation'])
+        self.assertEqual(expected['buy_orders']['5107925021'],
+                         {'order_id': '5107925021', 'quantity': 2, 'price': '$1.03', 'item_name': 'Chroma 2 Case & Key'})
+        parsers = ['regex'] + (['lxml'] if utils.lxml_html is not None else [])
+        try:
+            for parser in parsers:
+                utils.set_listings_parser(parser)
+                self.assertEqual(utils.get_market_listings_from_html(MARKET_LISTINGS_HTML), expected, parser)
+        finally:
+            utils.set_listings_parser('bs4')
+
+    def test_listings_parsers_return_same_listings_from_api(self):
+        results_html = utils.text_between(MARKET_LISTINGS_HTML, '<div class="my_listing_section market_home_listing_table">',
+                                          '<div class="my_listing_section market_content_block')
+        expected = utils.get_market_sell_listings_from_api(results_html)
+        self.assertEqual(len(expected['sell_listings']), 2)
+        parsers = ['regex'] + (['lxml'] if utils.lxml_html is not None else [])
+        try:
+            for parser in parsers:
+                utils.set_listings_parser(parser)
+                self.assertEqual(utils.get_market_sell_listings_from_api(results_html), expected, parser)
+        finally:
+            utils.set_listings_parser('bs4')
+
+    def test_set_listings_parser_rejects_unknown_parser(self):
+        with self.assertRaises(ValueError):
+            utils.set_listings_parser('html5lib')
+        self.assertEqual(utils.get_listings_parser(), 'bs4')
+
+
+MARKET_LISTINGS_HTML = '''
+<div id="tabContentsMyListings">
+<div id="myListings">
+  <div class="my_listing_section market_home_listing_table">
+    <h3 class="my_market_header">
+      <span class="my_market_header_active">My sell listings</span> <span class="my_market_header_count">(<span id="my_market_selllistings_number">2</span>)</span>
+    </h3>
+    <div class="market_listing_table_header"><span class="market_listing_right_cell">PRICE</span></div>
+    <div class="market_listing_row market_recent_listing_row listing_3185447744373414153" id="mylisting_3185447744373414153">
+      <img id="mylisting_3185447744373414153_image" src="https://example.com/a.png" alt="">
+      <div class="market_listing_right_cell market_listing_edit_buttons placeholder"></div>
+      <div class="market_listing_right_cell market_listing_my_price">
+        <span class="market_table_value">
+          <span class="market_listing_price">
+            <span style="display: inline-block">
+              <span title="This is the price the buyer pays.">$0.05</span>
+              <br>
+              <span title="This is how much you will receive." style="color: #AFAFAF">($0.04)</span>
+            </span>
+          </span>
+        </span>
+      </div>
+      <div class="market_listing_right_cell market_listing_listed_date can_combine">
+        14 Oct
+      </div>
+      <div class="market_listing_item_name_block">
+        <span id="mylisting_3185447744373414153_name" class="market_listing_item_name">Sticker | Tricky &amp; Sticky</span>
+        <!-- <span title="commented out">x</span> -->
+      </div>
+    </div>
+    <div class="market_listing_row market_recent_listing_row" id="mylisting_3185447744373414154">
+      <div class="market_listing_right_cell market_listing_my_price">
+        <span class="market_listing_price"><span><span title="This is the price the buyer pays.">1,20&#8364;</span><br><span title="This is how much you will receive.">(1,05&#8364;)</span></span></span>
+      </div>
+      <div class="market_listing_right_cell market_listing_listed_date">3 Sep</div>
+    </div>
+  </div>
+  <div class="my_listing_section market_content_block market_home_listing_table">
+    <h3 class="my_market_header"><span class="my_market_header_active">My listings awaiting confirmation</span></h3>
+    <div class="market_listing_row market_recent_listing_row" id="mylisting_3185447744373414999">
+      <span class="market_listing_price"><span title="This is the price the buyer pays.">$10.00</span><span title="This is how much you will receive.">($8.70)</span></span>
+      <div class="market_listing_listed_date">1 Oct</div>
+    </div>
+  </div>
+  <div class="my_listing_section market_content_block market_home_listing_table">
+    <h3 class="my_market_header"><span class="my_market_header_active">My buy orders</span></h3>
+    <div class="market_listing_row market_recent_listing_row" id="mybuyorder_5107925021">
+      <div class="market_listing_right_cell market_listing_my_price market_listing_buyorder_qty">
+        <span class="market_listing_inline_buyorder_qty">
+          2
+        </span>
+      </div>
+      <div class="market_listing_right_cell market_listing_my_price">
+        <span class="market_listing_price">
+          2 @
+          $1.03
+        </span>
+      </div>
+      <div class="market_listing_item_name_block">
+        <span class="market_listing_item_name"><a class="market_listing_item_name_link" href="https://example.com/730/Chroma">Chroma 2 Case &amp; Key</a></span>
+      </div>
+    </div>
+  </div>
+</div>
+</div>
+'''